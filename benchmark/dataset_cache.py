@@ -0,0 +1,95 @@
+'''
+  @file dataset_cache.py
+  @author Marcus Edel
+
+  Prewarm and purge the dataset cache.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from parser import *
+from misc import *
+from cache import *
+
+import argparse
+
+'''
+Collect all dataset files referred in the configuration file.
+
+@param configfile - The configuration file.
+@return List of dataset files.
+'''
+def ConfigDatasets(configfile):
+  config = Parser(configfile, verbose=False)
+  streamData = config.StreamMerge()
+
+  datasets = []
+  for method, sets in streamData.items():
+    if method == "general":
+      continue
+
+    for options, libraries in sets.items():
+      for library in libraries:
+        for dataset in library[1]:
+          if isinstance(dataset, str):
+            dataset = [dataset]
+
+          for data in dataset:
+            if data not in datasets:
+              datasets.append(data)
+
+  return datasets
+
+'''
+Parse all datasets and store them in the cache.
+
+@param datasets - List of dataset files.
+'''
+def Prewarm(datasets):
+  for dataset in datasets:
+    if not os.path.isfile(dataset):
+      Log.Warn("Dataset not available: " + dataset)
+      continue
+
+    try:
+      LoadDataset(dataset)
+      Log.Info("Cached: " + dataset)
+    except Exception as e:
+      Log.Warn("Could not cache " + dataset + ": " + str(e))
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Prewarm and purge the
+      dataset cache.""")
+  parser.add_argument('-c','--config', help='Configuration file name.',
+      required=True)
+  parser.add_argument('-w','--prewarm', help="""Parse all datasets of the
+      configuration file and store them in the cache.""", action='store_true')
+  parser.add_argument('-p','--purge', help="""Remove the cached datasets that
+      don't belong to a dataset of the configuration file.""",
+      action='store_true')
+  parser.add_argument('-a','--all', help="""Remove all cached datasets.""",
+      action='store_true')
+
+  args = parser.parse_args()
+
+  if args:
+    datasets = ConfigDatasets(args.config)
+
+    if args.all:
+      Log.Info("Removed " + str(DatasetCache.Purge()) + " cached files.")
+    elif args.purge:
+      Log.Info("Removed " + str(DatasetCache.Purge(datasets)) +
+          " cached files.")
+
+    if args.prewarm:
+      Prewarm(datasets)
@@ -47,7 +47,8 @@ def GetDataset(dataset, format):
         # Convert the dataset into the new format.
         convert = Convert(data, format[0])
         datasetList.append(convert.modifiedDataset)
-        modifiedList.append(convert.modifiedDataset)
+        if not convert.cached:
+          modifiedList.append(convert.modifiedDataset)
   else:
     datasetList = ""
     modifiedList = ""
@@ -61,7 +62,8 @@ def GetDataset(dataset, format):
       # Convert the dataset into the new format.
       convert = Convert(dataset, format[0])
       datasetList = convert.modifiedDataset
-      modifiedList = convert.modifiedDataset
+      if not convert.cached:
+        modifiedList = convert.modifiedDataset
 
   return (datasetList, modifiedList)
 
@@ -158,7 +160,14 @@ def Main(configfile, blocks, log, methodBlocks, update):
                 # Logging: Create a new dataset record fot this dataset.
                 if log:
                   datasetId = db.GetDataset(datasetName)
-                  datasetId = datasetId[0][0] if datasetId else db.NewDataset(*DatasetInfo(dataset))
+                  if datasetId:
+                    # Databases created before the catalog have no hash.
+                    if not datasetId[0][1]:
+                      db.UpdateDatasetHash(datasetId[0][0],
+                          DatasetInfo(dataset)[5])
+                    datasetId = datasetId[0][0]
+                  else:
+                    datasetId = db.NewDataset(*DatasetInfo(dataset))
 
                 Log.Info("Dataset: " + datasetName)
                 modifiedDataset = GetDataset(dataset, format)
@@ -0,0 +1,72 @@
+'''
+  @file metrics_benchmark.py
+  @author Marcus Edel
+
+  Measure the runtime of the classification metrics on large confusion
+  matrices.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+# Import the metrics definitions path.
+metrics_folder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0],
+  '../methods/metrics')))
+if metrics_folder not in sys.path:
+  sys.path.insert(0, metrics_folder)
+
+from log import *
+from timer import *
+from definitions import *
+
+import argparse
+import numpy as np
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Measure the runtime of
+      Metrics.AllMetrics and of the single multi-class metrics on random
+      confusion matrices.""")
+  parser.add_argument('-c','--classes', help="""The number of classes of the
+      confusion matrices.""", nargs='+', type=int, default=[10, 100, 1000])
+  parser.add_argument('-r','--repetitions', help="""The number of
+      repetitions, the minimum runtime is reported.""", type=int, default=5)
+
+  args = parser.parse_args()
+
+  if args:
+    table = [["classes", "AllMetrics [s]", "single metrics [s]"]]
+
+    for classes in args.classes:
+      CM = np.random.RandomState(42).randint(1, 100, (classes, classes))
+      CM += np.diag(np.full(classes, 10000))
+
+      allTimes, singleTimes = [], []
+      for i in range(max(1, args.repetitions)):
+        allTimer = Timer()
+        with allTimer:
+          Metrics.AllMetrics(CM)
+        allTimes.append(allTimer.ElapsedTime())
+
+        singleTimer = Timer()
+        with singleTimer:
+          Metrics.AverageAccuracy(CM)
+          Metrics.AvgPrecision(CM)
+          Metrics.AvgRecall(CM)
+          Metrics.AvgFMeasure(CM)
+          Metrics.LiftMultiClass(CM)
+          Metrics.MCCMultiClass(CM)
+        singleTimes.append(singleTimer.ElapsedTime())
+
+      table.append([str(classes), "{0:.6f}".format(min(allTimes)),
+          "{0:.6f}".format(min(singleTimes))])
+
+    Log.PrintTable(table)
@@ -0,0 +1,67 @@
+'''
+  @file parse_benchmark.py
+  @author Marcus Edel
+
+  Compare the chunked dataset parser with numpy.genfromtxt.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from misc import *
+from timer import *
+
+import argparse
+import numpy as np
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Compare the runtime of the
+      chunked dataset parser with numpy.genfromtxt and check that both return
+      the same array.""")
+  parser.add_argument('-f','--files', help='Dataset files to parse.',
+      nargs='+', required=True)
+  parser.add_argument('-d','--delimiter', help="""The delimiter of the
+      dataset files. Default determine the delimiter from the first line.""",
+      required=False)
+  parser.add_argument('-p','--processes', help="""The number of worker
+      processes. Default all available cpus.""", type=int, required=False)
+
+  args = parser.parse_args()
+
+  if args:
+    table = [["dataset", "size [MB]", "genfromtxt [s]", "parser [s]",
+        "speedup", "equal"]]
+
+    for dataset in args.files:
+      delimiter = args.delimiter
+      if delimiter is None:
+        with open(dataset) as fid:
+          line = fid.readline()
+        delimiter = "," if line.count(",") >= line.count(" ") else " "
+
+      genfromtxtTimer = Timer()
+      with genfromtxtTimer:
+        expected = np.genfromtxt(dataset, delimiter=delimiter)
+
+      parserTimer = Timer()
+      with parserTimer:
+        data = ParseDataset(dataset, delimiter, processes=args.processes)
+
+      table.append([NormalizeDatasetName(dataset),
+          "{0:.1f}".format(os.path.getsize(dataset) / float(1 << 20)),
+          "{0:.3f}".format(genfromtxtTimer.ElapsedTime()),
+          "{0:.3f}".format(parserTimer.ElapsedTime()),
+          "{0:.2f}".format(genfromtxtTimer.ElapsedTime() /
+              max(parserTimer.ElapsedTime(), 1e-9)),
+          str(np.array_equal(expected, data, equal_nan=True))])
+
+    Log.PrintTable(table)
@@ -21,6 +21,16 @@ from parser import *
 from convert import *
 from misc import *
 from database import *
+from scheduler import *
+from stats import *
+from regression import *
+from predictor import *
+from planner import *
+from sandbox import *
+from staging import *
+from pool import *
+
+import timer
 
 try:
   from irc_bot import *
@@ -28,6 +38,7 @@ try:
 except ImportError:
   irc_available = False
 
+import time
 import random
 import argparse
 import datetime
@@ -53,9 +64,14 @@ Return a list with modified datasets.
 
 @param dataset - Datasets to be modified.
 @param format - List of file formats to be converted to.
-@return List of modified datasets.
+@param pin - Pin the converted datasets in the conversion cache, so that they
+aren't evicted until the pins are removed with Convert.Unpin().
+@return List of modified datasets, list of the datasets which have to be
+removed and list of the pins of the conversion cache.
 '''
-def GetDataset(dataset, format):
+def GetDataset(dataset, format, pin=False):
+  pins = []
+
   # Check if the given dataset is a list or a single dataset.
   if not isinstance(dataset, str):
     datasetList = []
@@ -69,9 +85,12 @@ def GetDataset(dataset, format):
         datasetList.append(mdata)
       else:
         # Convert the dataset in the given format.
-        convert = Convert(data, format[0])
+        convert = Convert(data, format[0], pin)
         datasetList.append(convert.modifiedDataset)
-        modifiedList.append(convert.modifiedDataset)
+        if not convert.cached:
+          modifiedList.append(convert.modifiedDataset)
+        if convert.pin:
+          pins.append(convert.pin)
   else:
     datasetList = ""
     modifiedList = ""
@@ -84,13 +103,16 @@ def GetDataset(dataset, format):
         datasetList = mdataset
       else:
         # Convert the dataset in the given format.
-        convert = Convert(dataset, format[0])
+        convert = Convert(dataset, format[0], pin)
         datasetList = convert.modifiedDataset
-        modifiedList = convert.modifiedDataset
+        if not convert.cached:
+          modifiedList = convert.modifiedDataset
+        if convert.pin:
+          pins.append(convert.pin)
     else:
       datasetList = dataset
 
-  return (datasetList, modifiedList)
+  return (datasetList, modifiedList, pins)
 
 '''
 Count all datasets to determine the dataset number of datasets.
@@ -108,6 +130,468 @@ def CountLibrariesDatasets(libraries):
 
   return len(datasetList)
 
+'''
+Check if the method is affected by one of the modified files.
+
+@param method - The name of the method.
+@param files - Files of the method which should be watched.
+@param watchFiles - List of modified files.
+@return True if one of the files is modified otherwise False.
+'''
+def WatchCheck(method, files, watchFiles):
+  checkFiles = [method, method.lower()] + files
+
+  for checkFile in checkFiles:
+    for watchFile in watchFiles:
+      if checkFile in watchFile:
+        return True
+
+  return False
+
+'''
+Check if the benchmark script runs the method in a forked process using the
+timeout function. These scripts load the datasets in every trial.
+
+@param instance - The instance of the benchmark script.
+@return True if the script uses the timeout function otherwise False.
+'''
+def UsesTimeout(instance):
+  runMetrics = getattr(type(instance), "RunMetrics", None)
+  return getattr(runMetrics, "__globals__", {}).get("timeout") is timer.timeout
+
+'''
+Get the trial settings of the given iteration value. The iteration value is
+either the number of trials or a dictionary with the settings of the adaptive
+mode:
+
+  min - The minimum number of trials (default 3).
+  max - The maximum number of trials (default 30).
+  precision - Stop if the 95% confidence interval half-width of the runtime
+      relative to the mean drops below this value (default 0.05).
+  budget - Stop if the trials took longer than this number of seconds.
+
+@param trials - The iteration value of the method.
+@return The minimum number of trials, maximum number of trials, precision and
+time budget.
+'''
+def TrialSettings(trials):
+  if isinstance(trials, dict):
+    minTrials = max(1, int(trials.get("min", 3)))
+    maxTrials = max(minTrials, int(trials.get("max", 30)))
+    return (minTrials, maxTrials, float(trials.get("precision", 0.05)),
+        trials.get("budget", None))
+
+  return (int(trials), int(trials), None, None)
+
+# The minimum number of trials of the jobs in the watch mode. With less samples
+# the Mann-Whitney U test can't detect a regression at the 5% level.
+watchTrials = 5
+
+'''
+Get the trial settings of the given library block, the jobs in the watch mode
+run at least watchTrials trials.
+
+@param trials - The iteration value of the method.
+@param tasks - The tasks of the method.
+@return The iteration value of the method.
+'''
+def LibraryTrials(trials, tasks):
+  if 'watch' not in tasks:
+    return trials
+  elif isinstance(trials, dict):
+    return dict(trials, min=max(TrialSettings(trials)[0], watchTrials),
+        max=max(TrialSettings(trials)[1], watchTrials))
+  return max(int(trials), watchTrials)
+
+# The names of the average accuracy metric of the classification scripts.
+accuracyMetrics = ['ACC', 'Avg Accuracy']
+
+'''
+Check if the benchmark script is a classifier, that is the script keeps the
+predictions of the test set and the dataset contains the true labels.
+
+@param instance - The instance of the benchmark script.
+@return True if the script is a classifier otherwise False.
+'''
+def IsClassifier(instance):
+  dataset = getattr(instance, "dataset", None)
+  return (hasattr(instance, "predictions") and isinstance(dataset, list) and
+      len(dataset) >= 3)
+
+'''
+Get the number of bootstrap resamples of a job. Only the methods with the
+'bootstrap' task are bootstrapped.
+
+@param instance - The instance of the benchmark script.
+@param tasks - The tasks of the method.
+@param bootstrapCount - The number of bootstrap resamples.
+@return The number of bootstrap resamples, 0 disables the bootstrap.
+'''
+def BootstrapResamples(instance, tasks, bootstrapCount):
+  if 'bootstrap' in tasks:
+    return bootstrapCount
+  return 0
+
+'''
+Calculate the bootstrap confidence intervals of the runtime, by resampling the
+runtimes of the trials, and of the average accuracy, by resampling the
+predictions of the instances. The intervals are stored under the metric names
+of the script.
+
+@param instance - The instance of the benchmark script.
+@param samples - Dictionary with the measurements of every trial.
+@param resamples - The number of bootstrap resamples.
+@return Dictionary with the estimate and the lower and upper bound of the 95%
+confidence interval of every metric.
+'''
+def BootstrapMetrics(instance, samples, resamples):
+  bootstrap = {}
+
+  runtimes = [v for v, status in samples.get('Runtime', []) if status == "ok"]
+  if len(runtimes) > 1:
+    bootstrap['Runtime'] = BootstrapMean(runtimes, resamples)
+
+  # The classification scripts keep the predictions of the last trial, the
+  # third dataset file contains the true labels.
+  predictions = getattr(instance, "predictions", None)
+  keys = [key for key in accuracyMetrics if key in samples]
+  if predictions is not None and keys and IsClassifier(instance):
+    try:
+      truelabels = LoadDataset(instance.dataset[2])
+      if truelabels.size == len(predictions):
+        interval = BootstrapAccuracy(truelabels, predictions, resamples)
+        for key in keys:
+          bootstrap[key] = interval
+    except Exception as e:
+      Log.Warn("Could not bootstrap the predictions: " + str(e))
+
+  return bootstrap
+
+'''
+Run the method for the specified number of trials and aggregate the metrics of
+all trials. In the adaptive mode the trials are repeated until the confidence
+interval of the runtime is narrow enough or the maximum number of trials or the
+time budget is reached.
+
+@param instance - The instance of the benchmark script.
+@param options - Extra options for the method.
+@param trials - The number of trials or the settings of the adaptive mode.
+@param timeout - The time until the timeout.
+@param warmup - The number of discarded trials before the measurement.
+@param aggregate - The aggregator for all metrics or a dictionary with the
+aggregator of every metric.
+@param bootstrap - The number of bootstrap resamples, 0 disables the bootstrap.
+@param sandbox - Run the trials in a temporary working directory, True uses
+the temporary directory of the system, a path uses the given directory (e.g. a
+tmpfs).
+@param cache - Evict the datasets from the page cache ('cold') or read the
+datasets into the page cache ('warm') before every trial.
+@param workers - Run the trials of the scripts that use the timeout function in
+the persistent worker pool and replace the worker after this number of trials,
+None forks a new process for every trial.
+@param script - The path of the benchmark script, the worker pool loads the
+script from this path.
+@return Dictionary with the aggregated metrics, dictionary with the
+measurements (value, status) of every trial, the status is 'warmup', 'rejected'
+or 'ok' and dictionary with the bootstrap confidence intervals.
+'''
+def RunTrials(instance, options, trials, timeout, warmup=0, aggregate="mean",
+    bootstrap=0, sandbox=None, cache=None, workers=None, script=None):
+  if sandbox:
+    with Sandbox(None if sandbox is True else sandbox):
+      return RunTrials(instance, options, trials, timeout, warmup, aggregate,
+          bootstrap, None, cache, workers, script)
+
+  metrics = []
+  warmupMetrics = []
+  runtimes = []
+  minTrials, maxTrials, precision, budget = TrialSettings(trials)
+
+  # The worker of the pool keeps the parsed datasets itself.
+  pool = None
+  if workers and script and UsesTimeout(instance):
+    pool = WorkerPool.Get(workers)
+
+  # Parse the datasets once, so that the forked process of every trial starts
+  # with the warm datasets. In the cold mode every trial reads the datasets.
+  if not pool and UsesTimeout(instance) and cache != "cold":
+    try:
+      WarmDataset(instance.dataset)
+    except Exception as e:
+      Log.Warn("Could not load the dataset: " + str(e))
+
+  start = time.time()
+  for trail in range(warmup + maxTrials):
+    try:
+      if cache:
+        PreparePageCache(instance.dataset, cache)
+
+      # Measure the wall time and the resource usage of the trial, the values
+      # of the script have priority. The worker of the pool measures the trial
+      # itself.
+      if pool:
+        currentMetric, measurements, predictions = pool.Run(instance, script,
+            options, cache != "cold")
+        if predictions is not None:
+          instance.predictions = predictions
+      else:
+        trialTimer = timer.Timer()
+        with trialTimer:
+          currentMetric = instance.RunMetrics(options)
+        measurements = trialTimer.Measurements()
+
+      if type(currentMetric) is dict:
+        for key, value in measurements.items():
+          currentMetric.setdefault(key, value)
+
+      if type(currentMetric) is not dict and currentMetric == -2:
+        # Timout failure.
+        metrics = [{ 'Runtime' :  ">" + str(timeout)}]
+        break
+      elif type(currentMetric) is not dict and currentMetric < 0:
+        # Runtime exception.
+        metrics = [{ 'Runtime' :  "failure"}]
+        break
+      elif trail < warmup:
+        # Discard the warm-up trials.
+        warmupMetrics.append(currentMetric)
+        continue
+      else:
+        # Append new data.
+        metrics.append(currentMetric)
+
+        if 'Runtime' in currentMetric and isFloat(currentMetric['Runtime']):
+          runtimes.append(float(currentMetric['Runtime']))
+    except Exception as e:
+      Log.Fatal("Exception: " + str(e))
+
+    if precision is not None and len(metrics) >= minTrials:
+      if RelativeHalfWidth(runtimes) <= precision:
+        break
+      if budget is not None and time.time() - start >= budget:
+        Log.Warn("Trial budget exhausted after " + str(len(metrics)) +
+            " trials.")
+        break
+
+  ClearDatasetCache()
+
+  finalMetrics = dict(metrics[0]) if metrics else {}
+  samples = {}
+  for metricKey, values in CollectSamples(metrics).items():
+    value, rejected = Aggregate(values, Aggregator(aggregate, metricKey))
+
+    # Convert to int if possible.
+    finalMetrics[metricKey] = int(value) if value == int(value) else value
+
+    samples[metricKey] = [(v, "rejected" if r else "ok") for v, r in
+        zip(values, rejected)]
+
+  # Keep the warm-up measurements in front of the measurements of the trials.
+  for metricKey, values in CollectSamples(warmupMetrics).items():
+    samples[metricKey] = [(v, "warmup") for v in values] + samples.get(
+        metricKey, [])
+
+  intervals = {}
+  if bootstrap and metrics and 'Runtime' in samples:
+    intervals = BootstrapMetrics(instance, samples, bootstrap)
+
+  return finalMetrics, samples, intervals
+
+'''
+Collect the jobs of the benchmark, one job for every method, options, library
+and dataset combination.
+
+@param streamData - The merged config.
+@param blocks - Run only the specified blocks.
+@param methodBlocks - Run only the specified methods.
+@param log - If True the results are saved in the database.
+@param watchFiles - Run only blocks for the specified files, the jobs affected
+by one of the files are marked as changed.
+@return List of dictionaries with the job key, the library name, the benchmark
+script, the number of trials, the history key and the changed flag of every
+job.
+'''
+def CollectJobs(streamData, blocks, methodBlocks, log, watchFiles):
+  jobs = []
+
+  for method, sets in streamData.items():
+    if method == "general":
+      continue
+    if methodBlocks and method not in methodBlocks:
+      continue
+
+    for options, libraries in sets.items():
+      options = options.strip(' \t\n\r')
+
+      for library in libraries:
+        name = library[0]
+        tasks = library[5]
+
+        if blocks and name not in blocks:
+          continue
+        if 'metric' not in tasks:
+          continue
+        if 'watch' in tasks and log and not WatchCheck(method, library[7],
+            watchFiles):
+          continue
+
+        # The adaptive mode runs at least the minimum number of trials.
+        trials = TrialSettings(LibraryTrials(library[2], tasks))[0]
+        trials += library[8]
+
+        changed = bool(watchFiles) and WatchCheck(method, library[7] +
+            [library[3]], watchFiles)
+
+        for dataset in library[1]:
+          jobs.append({ "key" : (method, options, name, str(dataset)),
+                        "library" : name,
+                        "script" : library[3],
+                        "trials" : trials,
+                        "history" : (name, method, options,
+                            NormalizeDatasetName(dataset)),
+                        "changed" : changed })
+
+  return jobs
+
+'''
+Split the benchmark into independent jobs, one job for every method, options,
+library and dataset combination and submit the jobs to the scheduler. The jobs
+are submitted as descriptors, the datasets are converted and staged when a
+worker of the scheduler is free (see PrepareJob()) and the benchmark script is
+instantiated in the worker (see RunScheduledJob()).
+
+@param streamData - The merged config.
+@param blocks - Run only the specified blocks.
+@param methodBlocks - Run only the specified methods.
+@param log - If True the results are saved in the database.
+@param watchFiles - Run only blocks for the specified files.
+@param timeout - The time until the timeout.
+@param scheduler - The scheduler to submit the jobs to.
+@param bootstrapCount - The number of bootstrap resamples.
+@param selectedJobs - Run only the specified job keys in the given order.
+@param sandbox - Run every job in a temporary working directory.
+@param workers - Replace the worker of the worker pool after this number of
+trials, None disables the worker pool.
+@return Dictionary with the job key as key and the job descriptor as value.
+'''
+def PlanJobs(streamData, blocks, methodBlocks, log, watchFiles, timeout,
+    scheduler, bootstrapCount=0, selectedJobs=None, sandbox=None,
+    workers=None):
+  scheduled = {}
+
+  for method, sets in streamData.items():
+    if method == "general":
+      continue
+    if methodBlocks and method not in methodBlocks:
+      continue
+
+    for options, libraries in sets.items():
+      options = options.strip(' \t\n\r')
+
+      for library in libraries:
+        name = library[0]
+        tasks = library[5]
+
+        if blocks and name not in blocks:
+          continue
+        if 'metric' not in tasks:
+          continue
+        if 'watch' in tasks and log and not WatchCheck(method, library[7],
+            watchFiles):
+          continue
+
+        try:
+          module = Loader.ImportModuleFromPath(library[3])
+          getattr(module, method)
+        except Exception as e:
+          # The main loop reports the error.
+          continue
+
+        for dataset in library[1]:
+          jobKey = (method, options, name, str(dataset))
+          if selectedJobs is not None and jobKey not in selectedJobs:
+            continue
+
+          scheduled[jobKey] = { "method" : method,
+                                "options" : options,
+                                "script" : library[3],
+                                "dataset" : dataset,
+                                "format" : library[4],
+                                "trials" : LibraryTrials(library[2], tasks),
+                                "tasks" : tasks,
+                                "warmup" : library[8],
+                                "aggregate" : library[9],
+                                "cache" : library[10] }
+
+  # Submit the selected jobs in the given order, e.g. the budget plan.
+  jobKeys = list(scheduled.keys())
+  if selectedJobs is not None:
+    jobKeys.sort(key=lambda jobKey: selectedJobs.index(jobKey))
+
+  for jobKey in jobKeys:
+    scheduler.Submit(jobKey, RunScheduledJob, scheduled[jobKey], timeout,
+        bootstrapCount, sandbox, workers)
+
+  return scheduled
+
+'''
+Prepare the job before it's sent to a worker of the scheduler. The datasets of
+the job are converted and staged, the converted datasets are pinned in the
+conversion cache until the job is released.
+
+@param job - The job descriptor, see PlanJobs().
+@param stage - The staging area of the dataset files.
+'''
+def PrepareJob(job, stage=None):
+  job["modified"] = GetDataset(job["dataset"], job["format"], pin=True)
+  job["staged"] = (stage.Stage(job["modified"][0]) if stage else
+      job["modified"][0])
+
+'''
+Release the job after it has finished, so that the staged and the converted
+datasets of the job can be evicted. The datasets which are converted next to
+the original datasets are shared by the jobs, so they are removed at the end of
+the benchmark.
+
+@param job - The job descriptor, see PlanJobs().
+@param stage - The staging area of the dataset files.
+'''
+def ReleaseJob(job, stage=None):
+  if stage:
+    stage.Release(job["staged"])
+  for pin in job["modified"][2]:
+    Convert.Unpin(pin)
+
+'''
+Run a job of the scheduler in the worker process. The datasets of the job were
+prepared by PrepareJob().
+
+@param job - The job descriptor, see PlanJobs().
+@param timeout - The time until the timeout.
+@param bootstrapCount - The number of bootstrap resamples.
+@param sandbox - Run the job in a temporary working directory.
+@param workers - Replace the worker of the worker pool after this number of
+trials, None disables the worker pool.
+@return The results of the trials (see RunTrials()) and the description of the
+benchmark script, the results are None if the script can't be instantiated.
+'''
+def RunScheduledJob(job, timeout, bootstrapCount=0, sandbox=None,
+    workers=None):
+  module = Loader.ImportModuleFromPath(job["script"])
+  try:
+    instance = getattr(module, job["method"])(job["staged"], timeout=timeout,
+        verbose=False)
+  except Exception as e:
+    Log.Fatal("Could not call the constructor: " + job["script"])
+    Log.Fatal("Exception: " + str(e))
+    return (None, None)
+
+  trialResults = RunTrials(instance, job["options"], job["trials"], timeout,
+      job["warmup"], job["aggregate"], BootstrapResamples(instance,
+      job["tasks"], bootstrapCount), sandbox, job["cache"], workers,
+      job["script"])
+  return (trialResults, getattr(instance, "description", None))
+
 '''
 Start the main benchmark routine. The method shows some DEBUG information and
 prints a runtime information table.
@@ -117,9 +601,17 @@ prints a runtime information table.
 @param log - If True save the reports otherwise use stdout and print the reports.
 @param methodBlocks - Run only the specified methods.
 @param update - Update the records in the database.
+@param watchFiles - Run only blocks for the specified files.
+@param new - Copy the database before performing the benchmark.
+@param databaseUser - Database username.
+@param databasePassword - Database password.
+@param jobs - The number of jobs that run at the same time.
+@param budget - Run only the jobs that fit into the time budget in seconds.
+@param resume - Continue the builds of the interrupted run and skip the
+completed jobs.
 '''
 def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
-    databaseUser, databasePassword):
+    databaseUser, databasePassword, jobs=1, budget=None, resume=False):
   # Benchmark settings.
   timeout = 23000
   database = "reports/benchmark.db"
@@ -134,19 +626,31 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
   # Create the folder structure.
   CreateDirectoryStructure(["reports/img", "reports/etc"])
 
-  #Create the bootstrapped method dictionary which will contain the
-  #normalized values of all metrics for all methods
-  bootstrapped_method_dict = {}
-
   # Read the config.
   config = Parser(configfile, verbose=False)
   streamData = config.StreamMerge()
   ircData = None
 
-  # Summary parameter.
-  summaryBenchmarks = 0
-  summaryDifference = 0
-  differenceThreshold = 10
+  # The comparison of the current and the previous build in the watch mode.
+  watchResults = []
+
+  # Skip the datasets which will run into the timeout.
+  timeoutPrediction = True
+  skipped = []
+
+  # Run every job in its own temporary working directory.
+  sandbox = False
+
+  # Copy the datasets into a RAM-backed directory before the timed runs.
+  staging = None
+  stagingMemory = "1G"
+
+  # Count the hardware events of the methods with perf stat.
+  perf = None
+
+  # Run the trials of the python scripts in a persistent worker pool, the
+  # worker is replaced after this number of trials.
+  workerPool = False
 
   # Read the general block and set the attributes.
   if "general" in streamData:
@@ -167,26 +671,136 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
         databaseUser = value
       if key == "databasePassword":
         databasePassword = value
+      if key == "timeoutPrediction":
+        timeoutPrediction = value
+      if key == "sandbox":
+        sandbox = value
+      if key == "staging":
+        staging = value
+      if key == "stagingMemory":
+        stagingMemory = value
+      if key == "perf":
+        perf = value
+      if key == "workerPool":
+        workerPool = value
       if key == "port":
         databasePort = value
 
+  # The jobs inherit the perf stat settings, so perf stat is enabled before
+  # the workers of the scheduler are started. The profiler module needs the
+  # valgrind environment variables, so it's only imported if perf stat is used.
+  if perf:
+    from profiler import Profiler
+    Profiler.EnablePerfStat(None if perf is True else perf)
+
+  # The forkserver of the worker pool imports the scripts of the benchmark.
+  workers = None
+  if workerPool:
+    workers = 100 if workerPool is True else int(workerPool)
+    WorkerPool.Preload([library[3] for method, sets in streamData.items() if
+        method != "general" for libraries in sets.values() for library in
+        libraries])
+
+  stage = None
+  if staging:
+    stage = DatasetStage("/dev/shm" if staging is True else staging,
+        ParseSize(stagingMemory))
+
+  # The workers of the scheduler are forked before the write-behind thread of
+  # the database is started. The datasets of a job are converted and staged
+  # when a worker is free, so only the datasets of the running jobs are held.
+  scheduler = None
+  if jobs > 1:
+    scheduler = Scheduler(jobs,
+        prepare=lambda key, args: PrepareJob(args[0], stage),
+        release=lambda key, args: ReleaseJob(args[0], stage))
+
   # Create database connection if the user asked for to save the reports.
   if log:
     db = Database(driver=driver, database=database, host=databaseHost,
-        user=databaseUser, password=databasePassword, port=databasePort)
+        user=databaseUser, password=databasePassword, port=databasePort,
+        writeBehind=True)
     db.CreateTables()
 
   if irc_available and ircData:
     ircBOT = IRCBot(ircData[0], ircData[1], ircData[2])
-    watchMessages = []
 
   # Transform the blocks string to a list.
   if blocks:
     blocks = blocks.split(",")
 
+  # Continue the builds of the interrupted run, the completed jobs of the
+  # builds are skipped. Only the builds created by the run are continued, the
+  # libraries the run didn't reach get a new build.
+  selectedJobs = None
+  resumeBuilds = {}
+  runId = None
+  if budget is not None or resume:
+    benchmarkJobs = CollectJobs(streamData, blocks, methodBlocks, log,
+        watchFiles)
+
+  if resume and not log:
+    Log.Warn("Resume needs the database, run the benchmark with LOG=True.")
+  elif resume:
+    runId = db.GetUnfinishedRun()
+    if runId is None:
+      Log.Warn("No interrupted run to resume, all jobs run in new builds.")
+    else:
+      libraries = set(job["library"] for job in benchmarkJobs)
+      for name, buildId in db.GetRunBuilds(runId):
+        if name in libraries:
+          resumeBuilds[name] = buildId
+
+    completed = set(db.GetCheckpoints(list(resumeBuilds.values())))
+    benchmarkJobs = [job for job in benchmarkJobs if job["history"] not in
+        completed]
+    selectedJobs = [job["key"] for job in benchmarkJobs]
+    Log.Info("Resume: " + str(len(completed)) + " completed jobs, " +
+        str(len(benchmarkJobs)) + " remaining jobs.")
+
+  # Record the run, the run is marked as finished at the end. The update mode
+  # doesn't create builds, so there is nothing to resume.
+  if log and not update and runId is None:
+    runId = db.NewRun()
+
+  # Choose the jobs that fit into the time budget, the runtime of the jobs is
+  # estimated with the results of the previous builds.
+  if budget is not None:
+    history = {}
+    if log:
+      historyDb = db
+    elif driver == "mysql" or os.path.isfile(database):
+      historyDb = Database(driver=driver, database=database, host=databaseHost,
+          user=databaseUser, password=databasePassword, port=databasePort)
+    else:
+      historyDb = None
+      Log.Warn("No results to estimate the runtime of the jobs.")
+
+    if historyDb:
+      for library, method, options, dataset, runtime, built in (
+          historyDb.GetLatestResults()):
+        history[(library, method, options, dataset)] = (runtime, built)
+      if not log:
+        historyDb.Close()
+
+    selected, notSelected = PlanBudget(benchmarkJobs, history, budget, timeout)
+    PrintSchedule(selected, notSelected, budget)
+
+    selectedJobs = [entry["job"]["key"] for entry in selected]
+
+  if selectedJobs is not None:
+    selectedLibraries = set(key[:3] for key in selectedJobs)
+
   # Temporary datastructures for the current build.
   build = {}
 
+  # Run the jobs in parallel if the user asked for it, the results are
+  # collected in the main loop.
+  scheduled = {}
+  if scheduler:
+    scheduled = PlanJobs(streamData, blocks, methodBlocks, log, watchFiles,
+        timeout, scheduler, bootstrapCount, selectedJobs, sandbox, workers)
+
   # Iterate through all libraries.
   for method, sets in streamData.items():
     if method == "general":
@@ -222,6 +836,10 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
         dataMatrixPrevious = [['-' for x in range(len(libraries) + 1)] for x in
             range(datasetCount)]
 
+        # The runtime samples of the previous and the current build for every
+        # field of the matrix.
+        watchSamples = {}
+
         #Dictionary which will contain key as the library name and value as
         #a dictionary of metrics for the current method
         method_dict = {}
@@ -231,22 +849,30 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
         for library in libraries:
           name = library[0]
           datasets = library[1]
-          trials = library[2]
+          trials = LibraryTrials(library[2], library[5])
           script = library[3]
           format = library[4]
           tasks = library[5]
           alias = library[6]
           files = library[7]
+          warmup = library[8]
+          aggregate = library[9]
+          cache = library[10]
 
           if log:
             db.UpdateMethod(methodId, alias)
 
           header.append(name)
 
-          if not blocks or name in blocks:
+          if (not blocks or name in blocks) and (selectedJobs is None or
+              (method, options, name) in selectedLibraries):
             run += 1
             Log.Info("Library: " + name)
 
+            # Predict the runtime of the larger datasets with the runtime of
+            # the smaller datasets of this library.
+            predictor = RuntimePredictor()
+
             # Logging: create a new build and library record for this library.
             if log and name not in build:
               libraryId = db.GetLibrary(name)
@@ -275,6 +901,12 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
                 else:
                   Log.Warn("Nothing to update.")
                   continue
+              elif name in resumeBuilds:
+                buildId = resumeBuilds[name]
+                buildIdPrevious = [b for b in db.GetLatestBuildFromLibary(
+                    libraryId) if b[0] != buildId] or [(1,)]
+
+                build[name] = (buildId, libraryId)
               else:
                 if db.GetLatestBuildFromLibary(libraryId)[0][0] <= 0:
                   buildIdPrevious = [(1,)]
@@ -282,6 +914,7 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
                   buildIdPrevious = db.GetLatestBuildFromLibary(libraryId)
 
                 build[name] = (db.NewBuild(libraryId), libraryId)
+                db.NewRunBuild(runId, build[name][0])
 
             # Load the script.
             try:
@@ -299,25 +932,43 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
                 # Logging: Create a new dataset record fot this dataset.
                 if log:
                   datasetId = db.GetDataset(datasetName)
-                  datasetId = datasetId[0][0] if datasetId else db.NewDataset(*DatasetInfo(dataset))
+                  if datasetId:
+                    # Databases created before the catalog have no hash.
+                    if not datasetId[0][1]:
+                      db.UpdateDatasetHash(datasetId[0][0],
+                          DatasetInfo(dataset)[5])
+                    datasetId = datasetId[0][0]
+                  else:
+                    datasetId = db.NewDataset(*DatasetInfo(dataset))
 
                 dataMatrix[row][0] = datasetName
                 dataMatrixPrevious[row][0] = datasetName
 
-                Log.Info("Dataset: " + dataMatrix[row][0])
+                jobKey = (method, options, name, str(dataset))
+                if selectedJobs is not None and jobKey not in selectedJobs:
+                  continue
 
-                modifiedDataset = GetDataset(dataset, format)
+                Log.Info("Dataset: " + dataMatrix[row][0])
+                if jobKey in scheduled:
+                  # The scheduled job instantiates the script in the worker.
+                  instance = None
+                else:
+                  modifiedDataset = GetDataset(dataset, format)
+                  stagedDataset = (stage.Stage(modifiedDataset[0]) if stage
+                      else modifiedDataset[0])
 
-                try:
-                  instance = methodCall(modifiedDataset[0], timeout=timeout,
-                    verbose=False)
-                except Exception as e:
-                  Log.Fatal("Could not call the constructor: " + script)
-                  Log.Fatal("Exception: " + str(e))
-                  continue
+                  try:
+                    instance = methodCall(stagedDataset, timeout=timeout,
+                      verbose=False)
+                  except Exception as e:
+                    Log.Fatal("Could not call the constructor: " + script)
+                    Log.Fatal("Exception: " + str(e))
+                    if stage:
+                      stage.Release(stagedDataset)
+                    continue
 
                 # Logging: Add method information record.
-                if log:
+                if log and instance is not None:
                   try:
                     # Some script define a method description, if
                     # the description is set, save this in the database.
@@ -331,57 +982,66 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
                       db.NewMethodInfo(methodId, methodDescription)
 
                 if 'watch' in tasks and log:
-                  watchCheck = False
-                  checkFiles = [method, method.lower()] + files
-
-                  for checkFile in checkFiles:
-                    for watchFile in watchFiles:
-                      if checkFile in watchFile:
-                        watchCheck = True
-                        break;
-
-                  if not watchCheck:
+                  if not WatchCheck(method, files, watchFiles):
                     continue
 
                 if 'metric' in tasks:
-                  metrics = []
-
-                  for trail in range(trials):
-                    try:
-                      currentMetric = instance.RunMetrics(options)
-
-                      if type(currentMetric) is not dict and currentMetric == -2:
-                        # Timout failure.
-                        metrics = [{ 'Runtime' :  ">" + str(timeout)}]
-                        break
-                      elif type(currentMetric) is not dict and currentMetric < 0:
-                        # Runtime exception.
-                        metrics = [{ 'Runtime' :  "failure"}]
-                        break
-                      else:
-                        # Append new data.
-                        metrics.append(currentMetric)
-                    except Exception as e:
-                      Log.Fatal("Exception: " + str(e))
-
-                  finalMetrics = {}
-                  if len(metrics) > 0:
-                    finalMetrics = metrics[0]
-                    for m in range(1, len(metrics)):
-                      for metricKey in metrics[m]:
-                        value = metrics[m][metricKey]
-
-                        if isFloat(value) or isInt(value):
-                          finalMetrics[metricKey] += value
-
-                  for metricKey in finalMetrics:
-                    value = finalMetrics[metricKey]
-                    if isFloat(value) or isInt(value):
-                      finalMetrics[metricKey] /= len(metrics)
-
-                      # Convert to int if possible.
-                      if (finalMetrics[metricKey] == int(finalMetrics[metricKey])):
-                        finalMetrics[metricKey] = int(finalMetrics[metricKey])
+                  prediction = None
+                  if timeoutPrediction:
+                    info = DatasetInfo(dataset)
+                    datasetSize = info[2] * info[3]
+                    prediction = predictor.Skip(datasetSize, timeout)
+
+                    # Jobs which are already running are not skipped.
+                    if (prediction and jobKey in scheduled and
+                        not scheduler.Cancel(jobKey)):
+                      prediction = None
+
+                  if prediction:
+                    Log.Warn("Skipped " + datasetName + ": predicted runtime "
+                        + "{0:.1f}s (lower bound {1:.1f}s) exceeds the timeout."
+                        .format(prediction[0], prediction[1]))
+                    skipped.append((method, options, name, datasetName,
+                        prediction[0], prediction[1]))
+                    trialResults = ({ 'Runtime' : ">" + str(timeout)}, {}, {})
+                  elif jobKey in scheduled:
+                    jobResults = scheduler.Result(jobKey)
+                    if jobResults and jobResults[0] is None:
+                      # The script couldn't be instantiated.
+                      continue
+
+                    trialResults = jobResults[0] if jobResults else None
+                    if (log and jobResults and jobResults[1] and
+                        not db.GetMethodInfo(methodId)):
+                      db.NewMethodInfo(methodId, jobResults[1])
+                  else:
+                    trialResults = RunTrials(instance, options, trials,
+                        timeout, warmup, aggregate,
+                        BootstrapResamples(instance, tasks, bootstrapCount),
+                        sandbox, cache, workers, script)
+
+                  if trialResults is None:
+                    finalMetrics, samples, intervals = { 'Runtime' :
+                        "failure"}, {}, {}
+                  else:
+                    finalMetrics, samples, intervals = trialResults
+
+                  if timeoutPrediction and not prediction and (
+                      'Runtime' in finalMetrics):
+                    if isFloat(finalMetrics['Runtime']):
+                      predictor.Add(datasetSize, float(finalMetrics['Runtime']))
+                    elif ">" in str(finalMetrics['Runtime']):
+                      # The runtime is at least the timeout.
+                      predictor.Add(datasetSize, float(timeout))
+
+                  # Summarize the measurements without the warm-up trials.
+                  statistics = {}
+                  for metricKey, values in samples.items():
+                    values = [v for v, status in values if status != "warmup"]
+                    if values:
+                      statistics[metricKey] = SampleStatistics(values)
+                  variance = statistics['Runtime']['var'] if (
+                      'Runtime' in statistics) else 0
 
                   # Update the Runtime matrix view.
                   if 'Runtime' in finalMetrics:
@@ -409,17 +1069,45 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
 
                         # Update runtime data.
                         db.UpdateResult(buildID, libraryID,
-                            dataMatrix[row][col], 0, datasetId, methodId)
+                            dataMatrix[row][col], variance, datasetId, methodId)
+
+                        # Update the measurements of the trials.
+                        db.UpdateSamples(buildID, libraryID, datasetId,
+                            methodId, samples, statistics, cache)
+
+                        # Update the bootstrap confidence intervals.
+                        if intervals:
+                          db.UpdateBootstrapResult(buildID, libraryID,
+                              simplejson.dumps(intervals), datasetId, methodId)
                       except Exception:
                         pass
                     else:
+                      # Remove the results which were partially written before
+                      # the run was interrupted.
+                      if name in resumeBuilds:
+                        db.DeleteIncompleteResults(buildID, libraryID,
+                            datasetId, methodId)
+
                       # Add new metric results.
                       db.NewMetricResult(buildID, libraryID,
                           simplejson.dumps(finalMetrics), datasetId, methodId)
 
                       # Add new runtime results.
                       db.NewResult(buildID, libraryID, dataMatrix[row][col],
-                          0, datasetId, methodId)
+                          variance, datasetId, methodId)
+
+                      # Add the measurements of the trials.
+                      db.NewSamples(buildID, libraryID, datasetId, methodId,
+                          samples, statistics, cache)
+
+                      # Add the bootstrap confidence intervals.
+                      if intervals:
+                        db.NewBootstrapResult(buildID, libraryID,
+                            simplejson.dumps(intervals), datasetId, methodId)
+
+                    # Mark the job as completed, the checkpoint is written
+                    # after the results.
+                    db.NewCheckpoint(buildID, libraryID, datasetId, methodId)
 
                   if 'watch' in tasks and log:
                     for prevbuildID in buildIdPrevious:
@@ -431,8 +1119,27 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
                     if resultsPrevious:
                       dataMatrixPrevious[row][col] = str(resultsPrevious[0][3])
 
-                # Remove temporary datasets.
-                RemoveDataset(modifiedDataset[1])
+                      # Builds without samples have a single runtime, negative
+                      # values are timeouts and failures.
+                      samplesPrevious = db.GetSamples(prevbuildID[0],
+                          libraryID, datasetId, methodId)
+                      if (not samplesPrevious and isFloat(resultsPrevious[0][3])
+                          and float(resultsPrevious[0][3]) >= 0):
+                        samplesPrevious = [float(resultsPrevious[0][3])]
+
+                      samplesCurrent = [v for v, status in samples.get(
+                          'Runtime', []) if status != "warmup"]
+                      watchSamples[(row, col)] = (name, samplesPrevious,
+                          samplesCurrent)
+
+                # Remove temporary datasets. The scheduler releases the
+                # datasets of the scheduled jobs.
+                if jobKey not in scheduled:
+                  RemoveDataset(modifiedDataset[1])
+
+                  # The staged datasets of the finished job can be evicted.
+                  if stage:
+                    stage.Release(stagedDataset)
           col += 1
         # Show the results.
         if not log and run > 0:
@@ -445,67 +1152,55 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new,
           Log.Notice("\n\n")
           Log.PrintTable(AddMatrixToTable(dataMatrix, table))
 
-          resultsMessage = method
-          if options:
-            resultsMessage += " (" + options + ")"
-
-          resultsMessage += " | "
-          for result in zip(dataMatrixPrevious, dataMatrix):
-            if result[0][1] != '-' and result[1][1] != '-':
-
-              # Increase the number of benchmark results for the summary.
-              summaryBenchmarks += 1
-
-              # Truncate to specified precision.
-              if isFloat(result[0][1]):
-                timeOld = "{0:.2f}".format(float(result[0][1]))
-              else:
-                timeOld = result[0][1]
-
-              if isFloat(result[1][1]):
-                timeCurrent = "{0:.2f}".format(float(result[1][1]))
-              else:
-                timeCurrent = result[1][1]
-
-              if isFloat(result[0][1]) and isFloat(result[1][1]):
-                new = float(result[1][1])
-                old = float(result[0][1])
+          for (r, c), (libraryName, previous, current) in sorted(
+              watchSamples.items()):
+            if previous and current:
+              comparison = CompareSamples(previous, current)
+              comparison["method"] = method
+              comparison["options"] = options
+              comparison["library"] = libraryName
+              comparison["dataset"] = dataMatrix[r][0]
+              watchResults.append(comparison)
 
-                timeDiffValue = new - old
-                timeDiff = "{0:.2f}".format(timeDiffValue)
+          Log.Notice("\n\n")
 
-                if (new - old) > 0:
-                  offset = (differenceThreshold * old) / 100
-                  if timeDiffValue > 0 and timeDiffValue > offset:
-                    summaryDifference += 1
+      # Make sure the results of the method block are written to the database.
+      if log:
+        db.Flush()
 
-              else:
-                timeDiff = "-"
-
-              # Add dataset name.
-              resultsMessage += result[0][0] + " "
-              # Add old runtime.
-              resultsMessage += timeOld + " (old) => "
-              # Add current runtime.
-              resultsMessage += timeCurrent + " (new) => "
-              # Add runtime difference.
-              resultsMessage += timeDiff + " (diff) | "
-
-          if "=>" in resultsMessage:
-            if irc_available and ircData:
-              watchMessages.append(resultsMessage)
-            else:
-              Log.Info(resultsMessage)
+  # Stop the workers and remove the temporary datasets of the scheduled jobs.
+  if scheduler:
+    scheduler.Close()
+  for job in scheduled.values():
+    if "modified" in job:
+      RemoveDataset(job["modified"][1])
 
-          Log.Notice("\n\n")
+  if stage:
+    stage.Close()
 
-  if irc_available and ircData and len(watchMessages) > 0:
-    # Add summary message ("Benchmarks x of y passed").
-    summaryMessage = "Benchmarks " + str(summaryBenchmarks - summaryDifference)
-    summaryMessage += " of " + str(summaryBenchmarks) + " passed."
-    watchMessages.append(summaryMessage)
-
-    ircBOT.send_messages(watchMessages)
+  if log:
+    if runId is not None:
+      db.FinishRun(runId)
+    db.Close()
+
+  # Report the datasets which were skipped because of the runtime prediction.
+  for method, options, name, datasetName, runtime, lower in skipped:
+    Log.Info("Skipped " + method + (" (" + options + ")" if options else "") +
+        " | " + name + " | " + datasetName + " | predicted runtime " +
+        "{0:.1f}s (lower bound {1:.1f}s)".format(runtime, lower))
+
+  if len(watchResults) > 0:
+    # Save the machine-readable summary of the watch mode.
+    summary = RegressionSummary(watchResults)
+    with open("reports/etc/regressions.json", "w") as fid:
+      simplejson.dump(summary, fid, indent=2)
+
+    watchMessages = RegressionMessages(summary)
+    if irc_available and ircData:
+      ircBOT.send_messages(watchMessages)
+    else:
+      for message in watchMessages:
+        Log.Info(message)
 
 
 if __name__ == '__main__':
@@ -529,6 +1224,13 @@ if __name__ == '__main__':
       required=False)
   parser.add_argument('-p','--password', help="""Database password.""",
       required=False)
+  parser.add_argument('-j','--jobs', help="""Run the specified number of
+      jobs in parallel, every job is pinned to its own set of cpus.""",
+      required=False)
+  parser.add_argument('--resume', help="""Continue the builds of the
+      interrupted run and skip the completed jobs.""", required=False)
+  parser.add_argument('--budget', help="""Run only the jobs that fit into
+      the time budget, e.g. '8h', '30m' or seconds.""", required=False)
 
   args = parser.parse_args()
 
@@ -538,6 +1240,9 @@ if __name__ == '__main__':
     update = True if args.update == "True" else False
     args.files = "" if args.files == None else args.files
     new = True if args.new == "True" else False
+    jobs = int(args.jobs) if args.jobs else 1
+    budget = ParseDuration(args.budget) if args.budget else None
+    resume = True if args.resume == "True" else False
 
     Main(args.config, args.blocks, log, args.methodBlocks, update, args.files,
-        new, args.user, args.password)
+        new, args.user, args.password, jobs, budget, resume)
@@ -65,6 +65,9 @@ class ALLKNN(object):
       cmd = shlex.split(self.path + "allknn -r " + self.dataset +
           " -v " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -79,6 +82,7 @@ class ALLKNN(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -21,8 +21,17 @@ class Metrics(object):
   '''
   @staticmethod
   def ConfusionMatrix(labels, prediction):
-    from sklearn.metrics import confusion_matrix
-    return confusion_matrix(labels, prediction)
+    labels = np.ravel(labels)
+    prediction = np.ravel(prediction)
+
+    #The classes are the sorted union of the true and the predicted labels.
+    classes, index = np.unique(np.concatenate((labels, prediction)),
+        return_inverse=True)
+    l = len(classes)
+    index = np.ravel(index)
+    CM = np.bincount(index[:len(labels)] * l + index[len(labels):],
+        minlength=l * l)
+    return CM.reshape(l, l)
 
   '''
   @param CM - The confusion matrix
@@ -41,6 +50,76 @@ class Metrics(object):
     pl.xlabel('Predicted Label')
     pl.show()
 
+  '''
+  @param CM - The confusion matrix
+  Derive the number of true positives, false positives, false negatives and
+  true negatives for every class from the confusion matrix (One vs All
+  approach). The counts are returned as vectors with one entry per class.
+  '''
+  @staticmethod
+  def ClassCounts(CM):
+    CM = np.asarray(CM, dtype=np.float64)
+    truePositives = np.diagonal(CM)
+    falsePositives = CM.sum(axis=0) - truePositives
+    falseNegatives = CM.sum(axis=1) - truePositives
+    trueNegatives = CM.sum() - truePositives - falsePositives - falseNegatives
+    return truePositives, falsePositives, falseNegatives, trueNegatives
+
+  '''
+  @param CM - The confusion matrix
+  Compute the per-class metrics (precision, recall, fmeasure, lift and mcc) for
+  all classes at once. Every metric is returned as a vector with one entry per
+  class.
+  '''
+  @staticmethod
+  def ClassMetrics(CM):
+    TP, FP, FN, TN = Metrics.ClassCounts(CM)
+    total = TP[0] + FP[0] + FN[0] + TN[0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+      #The class is not relevant (no predictions in this class)
+      #All instances predicted as negative, no spurious cases
+      predicted = TP + FP
+      precision = np.where(predicted != 0, TP / np.where(predicted != 0,
+          predicted, 1), 1.0)
+
+      recall = TP / (TP + FN)
+
+      fSum = precision + recall
+      fMeasure = np.where(fSum != 0, 2 * precision * recall / fSum, 0.0)
+
+      #The lift uses the first column as threshold for all classes.
+      lift = recall / ((TP[0] + FP[0]) / total)
+
+      #Class is not relevant (no predictions in this class)
+      #The limiting case.
+      denominator = np.sqrt((TP + FP) * (TP + FN) * (TN + FP) * (TN + FN))
+      mcc = np.where(denominator != 0, (TP * TN - FP * FN) / np.where(
+          denominator != 0, denominator, 1), 0.0)
+
+    return { 'Precision' : precision,
+             'Recall' : recall,
+             'FMeasure' : fMeasure,
+             'Lift' : lift,
+             'MCC' : mcc }
+
+  '''
+  @param CM - The confusion matrix
+  Compute all multi-class metrics derived from the confusion matrix in a single
+  call. The returned dictionary contains the average accuracy ('ACC'), the
+  average precision ('Precision'), recall ('Recall'), fmeasure ('FMeasure'),
+  lift ('Lift') and MCC ('MCC') over all classes.
+  '''
+  @staticmethod
+  def AllMetrics(CM):
+    metrics = {}
+    for key, value in Metrics.ClassMetrics(CM).items():
+      metrics[key] = np.mean(value)
+
+    #The average accuracy is the same as the average recall.
+    metrics['ACC'] = metrics['Recall']
+    return metrics
+
   '''
   @param CM - The confusion matrix
   Average accuracy measure. The average accuracy is defined as the average/mean
@@ -49,16 +128,7 @@ class Metrics(object):
   '''
   @staticmethod
   def AverageAccuracy(CM):
-    acc=0
-    Sum=0
-    l=len(CM)
-    for i in range(l):
-        for j in range(l):
-            Sum+=CM[i][j]
-        acc = acc + (CM[i][i]/Sum)*100
-        Sum=0
-    acc = acc/l
-    return acc/100
+    return np.mean(Metrics.ClassMetrics(CM)['Recall'])
 
 
   '''
@@ -70,20 +140,12 @@ class Metrics(object):
   '''
   @staticmethod
   def PrecisionForAClass(class_i,CM):
-    l=len(CM)
-    truePositives = CM[class_i][class_i]
-    falsePositives = 0
-    for j in range(l):
-        falsePositives+=CM[j][class_i]
-    falsePositives-=truePositives
-    totalPositives = truePositives + falsePositives
-    if totalPositives != 0:
-      precision = truePositives/totalPositives
-    else:
-      #The class is not relevant (no predictions in this class)
-      #All instances predicted as negative, no spurious cases
-      precision = 1
-    return precision
+    CM = np.asarray(CM, dtype=np.float64)
+    predicted = CM[:, class_i].sum()
+    #The class is not relevant (no predictions in this class)
+    if predicted == 0:
+      return 1.0
+    return CM[class_i, class_i] / predicted
 
   '''
   @param class_i - Index of the class in the confusion matrix
@@ -94,15 +156,9 @@ class Metrics(object):
   '''
   @staticmethod
   def RecallForAClass(class_i,CM):
-     l=len(CM)
-     truePositives = CM[class_i][class_i]
-     falseNegatives = 0
-     for j in range(l):
-         falseNegatives+=CM[class_i][j]
-     falseNegatives-=truePositives
-     total = truePositives + falseNegatives
-     recall = truePositives/total
-     return recall
+    CM = np.asarray(CM, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+      return CM[class_i, class_i] / CM[class_i, :].sum()
 
   '''
   @param CM - The confusion matrix
@@ -114,21 +170,11 @@ class Metrics(object):
   '''
   @staticmethod
   def AvgPrecision(CM):
-    l=len(CM)
-    avgPrecision = 0
-    for i in range(l):
-        avgPrecision+=Metrics.PrecisionForAClass(i,CM)
-    avgPrecision = avgPrecision/l
-    return avgPrecision
+    return np.mean(Metrics.ClassMetrics(CM)['Precision'])
 
   @staticmethod
   def AvgRecall(CM):
-    l=len(CM)
-    avgRecall = 0
-    for i in range(l):
-        avgRecall+=Metrics.RecallForAClass(i,CM)
-    avgRecall = avgRecall/l
-    return avgRecall
+    return np.mean(Metrics.ClassMetrics(CM)['Recall'])
 
   '''
   @param class_i - Index of the class in the confusion matrix
@@ -137,30 +183,11 @@ class Metrics(object):
   '''
   @staticmethod
   def FMeasureClass(class_i,CM):
-    precClass = Metrics.PrecisionForAClass(class_i,CM)
-    recClass = Metrics.RecallForAClass(class_i,CM)
-    if (precClass + recClass) != 0:
-      fMeasure = 2*precClass*recClass/(precClass+recClass)
-    else:
-      #Took care of the edge case here!
-      truePositives = CM[class_i][class_i]
-      falsePositives = 0
-      for j in range(l):
-        falsePositives+=CM[j][class_i]
-      falsePositives-=truePositives
-      falseNegatives=0
-      for j in range(l):
-        falseNegatives+=CM[class_i][j]
-      falseNegatives-=truePositives
-      trueNegatives=0
-      #calculate trueNegatives
-      for i in range(l):
-        if i!=class_i:
-          for j in range(l):
-            trueNegatives+=CM[i][j]
-          trueNegatives-=CM[i][class_i]
-      fMeasure = 2*truePositives / (2*truePositives + falsePositives + falseNegatives)
-    return fMeasure
+    precision = Metrics.PrecisionForAClass(class_i, CM)
+    recall = Metrics.RecallForAClass(class_i, CM)
+    if precision + recall == 0:
+      return 0.0
+    return 2 * precision * recall / (precision + recall)
 
 
   '''
@@ -170,12 +197,7 @@ class Metrics(object):
   '''
   @staticmethod
   def AvgFMeasure(CM):
-    l=len(CM)
-    avgF=0
-    for i in range(l):
-        avgF+=Metrics.FMeasureClass(i,CM)
-    avgF = avgF/l
-    return avgF
+    return np.mean(Metrics.ClassMetrics(CM)['FMeasure'])
 
   '''
   @param class_i - Index of the class in the confusion matrix
@@ -185,23 +207,10 @@ class Metrics(object):
   '''
   @staticmethod
   def LiftForAClass(class_i,CM):
-    l=len(CM)
-    #pgt - positives greater than threshold
-    pgt = 0
-    #tgt - total greater than threshold
-    tgt = 0
-    total = 0
-    for i in range(l):
-      pgt = pgt + CM[class_i][i]
-    pgt = (1/pgt) * CM[class_i][class_i]
-    for j in range(l):
-      tgt = tgt + CM[j][0]
-    for i in range(l):
-      for j in range(l):
-        total = total + CM[i][j]
-    tgt = tgt/total
-    lift = pgt/tgt
-    return lift
+    CM = np.asarray(CM, dtype=np.float64)
+    #The lift uses the first column as threshold for all classes.
+    with np.errstate(divide='ignore', invalid='ignore'):
+      return Metrics.RecallForAClass(class_i, CM) / (CM[:, 0].sum() / CM.sum())
 
 
   '''
@@ -214,12 +223,7 @@ class Metrics(object):
   '''
   @staticmethod
   def LiftMultiClass(CM):
-    AvgLift=0
-    l=len(CM)
-    for i in range(l):
-      AvgLift+=Metrics.LiftForAClass(i,CM)
-    AvgLift/=l
-    return AvgLift
+    return np.mean(Metrics.ClassMetrics(CM)['Lift'])
 
 
   '''
@@ -232,35 +236,18 @@ class Metrics(object):
   '''
   @staticmethod
   def MatthewsCorrelationCoefficientClass(class_i, CM):
-    l=len(CM)
-    truePositives = CM[class_i][class_i]
-    falsePositives = 0
-    for j in range(l):
-      falsePositives+=CM[j][class_i]
-    falsePositives-=truePositives
-    falseNegatives=0
-    for j in range(l):
-      falseNegatives+=CM[class_i][j]
-    falseNegatives-=truePositives
-    trueNegatives=0
-    #calculate trueNegatives
-    for i in range(l):
-      if i!=class_i:
-        for j in range(l):
-          trueNegatives+=CM[i][j]
-        trueNegatives-=CM[i][class_i]
-    Numerator = (truePositives*trueNegatives) - (falsePositives*falseNegatives)
-    Denominator=math.sqrt((truePositives + falsePositives)*
-							(truePositives + falseNegatives)*
-							(trueNegatives + falsePositives)*
-							(trueNegatives + falseNegatives))
-    if Denominator != 0:
-      MCC = Numerator/Denominator
-    else:
-      #Class is not relevant (no predictions in this class)
-      #The limiting case.
-      MCC = 0
-    return MCC
+    CM = np.asarray(CM, dtype=np.float64)
+    TP = CM[class_i, class_i]
+    FP = CM[:, class_i].sum() - TP
+    FN = CM[class_i, :].sum() - TP
+    TN = CM.sum() - TP - FP - FN
+
+    #Class is not relevant (no predictions in this class)
+    #The limiting case.
+    denominator = math.sqrt((TP + FP) * (TP + FN) * (TN + FP) * (TN + FN))
+    if denominator == 0:
+      return 0.0
+    return (TP * TN - FP * FN) / denominator
 
 
   '''
@@ -274,12 +261,7 @@ class Metrics(object):
   '''
   @staticmethod
   def MCCMultiClass(CM):
-    MCC=0
-    l=len(CM)
-    for i in range(l):
-      MCC+=Metrics.MatthewsCorrelationCoefficientClass(i,CM)
-    MCC/=l
-    return MCC
+    return np.mean(Metrics.ClassMetrics(CM)['MCC'])
 
   '''
   @param truelabelFile - Name of the file which contains the true label
@@ -294,42 +276,25 @@ class Metrics(object):
   def MeanSquaredError(truelabelFile, probabilities, CM):
     #l : Number of classes
     l=len(CM)
-    #trueVec : Vector/list with trueVec[index]=1 for the true class, 0 otherwise
+    #trueArray : 2D numpy array with trueArray[index]=1 for the true class, 0
+    #otherwise
     Vec = np.genfromtxt(truelabelFile,delimiter=',')
     instances=len(Vec)
-    trueVec=[]
-    for i in range(instances):
-      vec=[]
-      for j in range(l):
-        vec.append(0)
-      for j in range(l):
-        vec[int(Vec[i])-1]=1
-      trueVec.append(vec)
-    #trueArray : 2D numpy array after converting trueVec
-    trueArray=np.array(trueVec)
-    print("True Vec : ",trueArray)
+    trueArray = np.zeros((instances, l), dtype=int)
+    trueArray[np.arange(instances), Vec.astype(int) - 1] = 1
     #probVec : 2D numpy array with trueVec[index]=probability for the instance
     #to be in that class.
     probVec = np.genfromtxt(probabilities,delimiter=',')
-    print("probVec : ", probVec)
     diffArray = trueArray - probVec
-    print("diffArray : ",diffArray)
-    #Quadratic Loss Function
-    quadraticLoss=[]
-    for i in range(len(diffArray)):
-      squaredloss=0
-      for j in range(len(diffArray[i])):
-        squaredloss+=diffArray[i][j]*diffArray[i][j]
-        quadraticLoss.append(squaredloss)
-    quadraticLoss=np.array(quadraticLoss)
-    print("quad loss : ",quadraticLoss)
+    #Quadratic Loss Function, the loss of an instance is accumulated over the
+    #classes and every partial sum counts, so the squared difference of class j
+    #is weighted with the number of the remaining classes.
+    classes = diffArray.shape[1]
+    weights = classes - np.arange(classes)
+    quadraticLoss = np.sum(diffArray * diffArray * weights)
 	#Divide the total squared loss for each instance by the number of classes
-    quadraticLoss = quadraticLoss/l
-    totalLoss=0
-    for i in range(len(quadraticLoss)):
-      totalLoss+=quadraticLoss[i]
+    totalLoss = quadraticLoss/l
     totalLoss = totalLoss/instances
-    print("tot loss : ",totalLoss)
     return totalLoss
 
 
@@ -346,59 +311,49 @@ class Metrics(object):
   def MeanPredictiveInformationClass(class_i, truelabels, predictedlabels):
     predicted=np.genfromtxt(predictedlabels, delimiter=',')
     actual=np.genfromtxt(truelabels, delimiter=',')
-    instances=len(actual)
-    predictiveSum=0
-    count=0
-    for i in range(instances):
-      if actual[i] == class_i:
-        count+=1
-        '''
-        predictiveSum+=((actual[i] * math.log(predicted[i],2))+
-						  ((1-actual[i]) * math.log(1-predicted[i],2)))
-        We take actual[i] to be 0. Hence, the formula :
-        We take 0.05 instead of absolute 0 and 0.95 instead of absolute 1
-        to guarantee that an absolute 0 value doesn't become an argument
-        to logarithm.
-        '''
-        predicted_val=0.05
-        actual_val=0.05
-        if predicted[i] != actual[i]:
-          predicted_val = 0.95
-
-        predictiveSum+=((actual_val*math.log(predicted_val,2)) + (predicted_val*math.log(1 - predicted_val,2)))
-
-    if count != 0:
-      predictiveSum/=count
-    predictiveSum+=1
-    return predictiveSum
+    return Metrics.MPIArrayClass(class_i, actual, predicted)
+
+  '''
+  @param truelabels - Array with true labels for each instance
+  @param predictedlabels - Array with predicted label for each instance
+  Compute the mean predictive information for all classes at once. The
+  returned dictionary maps every label of the true labels to the mean
+  predictive information of the class.
+  '''
+  @staticmethod
+  def MPIArray(truelabels, predictedlabels):
+    truelabels = np.ravel(truelabels)
+    predictedlabels = np.ravel(predictedlabels)
+    classes, index = np.unique(truelabels, return_inverse=True)
+    index = np.ravel(index)
+
+    #Number of instances and wrong predictions for every class.
+    count = np.bincount(index, minlength=len(classes))
+    wrong = np.bincount(index, weights=(predictedlabels != truelabels),
+        minlength=len(classes))
+
+    '''
+    predictiveSum+=((actual[i] * math.log(predicted[i],2))+
+		  ((1-actual[i]) * math.log(1-predicted[i],2)))
+    We take actual[i] to be 0. Hence, the formula :
+    We take 0.05 instead of absolute 0 and 0.95 instead of absolute 1
+    to guarantee that an absolute 0 value doesn't become an argument
+    to logarithm.
+    '''
+    actual_val=0.05
+    right_val=((actual_val*math.log(0.05,2)) + (0.05*math.log(1 - 0.05,2)))
+    wrong_val=((actual_val*math.log(0.95,2)) + (0.95*math.log(1 - 0.95,2)))
+
+    predictiveSum = (count - wrong) * right_val + wrong * wrong_val
+    predictiveSum = predictiveSum / np.maximum(count, 1) + 1
+    return dict(zip(classes.tolist(), predictiveSum.tolist()))
 
   @staticmethod
   def MPIArrayClass(class_i, truelabels, predictedlabels):
-    instances=len(truelabels)
-    predictiveSum=0
-    count=0
-    for i in range(instances):
-      if truelabels[i] == class_i:
-        count+=1
-        '''
-        predictiveSum+=((actual[i] * math.log(predicted[i],2))+
-						  ((1-actual[i]) * math.log(1-predicted[i],2)))
-        We take actual[i] to be 0. Hence, the formula :
-        We take 0.05 instead of absolute 0 and 0.95 instead of absolute 1
-        to guarantee that an absolute 0 value doesn't become an argument
-        to logarithm.
-        '''
-        predicted_val=0.05
-        actual_val=0.05
-        if predictedlabels[i] != truelabels[i]:
-          predicted_val = 0.95
-
-        predictiveSum+=((actual_val*math.log(predicted_val,2)) + (predicted_val*math.log(1 - predicted_val,2)))
-
-    if count != 0:
-      predictiveSum/=count
-    predictiveSum+=1
-    return predictiveSum
+    truelabels = np.ravel(truelabels)
+    mask = truelabels == class_i
+    return Metrics.MPIArray(truelabels[mask],
+        np.ravel(predictedlabels)[mask]).get(class_i, 1)
 
   '''
   This method extracts all the labels from the truelabels file in a list
@@ -407,12 +362,9 @@ class Metrics(object):
   '''
   @staticmethod
   def GetActualLabels(truelabels):
-    labels=[]
-    labels.append(truelabels[0])
-    for i in range(len(truelabels)):
-      if truelabels[i] not in labels:
-        labels.append(truelabels[i])
-    return labels
+    #The labels are returned in the order of their first appearance.
+    labels, index = np.unique(np.ravel(truelabels), return_index=True)
+    return labels[np.argsort(index)].tolist()
 
 
   '''
@@ -426,12 +378,7 @@ class Metrics(object):
   def AvgMeanPredictiveInformation(CM, truelabels, predictedlabels):
     predicted=np.genfromtxt(predictedlabels, delimiter=',')
     actual=np.genfromtxt(truelabels, delimiter=',')
-    mpi=0
-    all_labels = Metrics.GetActualLabels(actual)
-    for i in range(len(CM)):
-      mpi+=Metrics.MeanPredictiveInformationClass(all_labels[i], truelabels, predictedlabels)
-    mpi/=len(CM)
-    return mpi
+    return Metrics.AvgMPIArray(CM, actual, predicted)
 
   '''
   @param CM - The confusion matrix
@@ -444,8 +391,9 @@ class Metrics(object):
   def AvgMPIArray(CM, truelabels, predictedlabels):
     mpi=0
     all_labels = Metrics.GetActualLabels(truelabels)
+    values = Metrics.MPIArray(truelabels, predictedlabels)
     for i in range(len(CM)):
-      mpi+=Metrics.MPIArrayClass(all_labels[i], truelabels, predictedlabels)
+      mpi+=values[all_labels[i]]
     mpi/=len(CM)
     return mpi
 
@@ -458,10 +406,5 @@ class Metrics(object):
   '''
   @staticmethod
   def SimpleMeanSquaredError(truelabels, predictedlabels):
-    simplemse = 0
-    n = len(truelabels)
-    for i in range(n):
-      difference = truelabels[i] - predictedlabels[i]
-      simplemse += difference * difference
-    simplemse /= n
-    return simplemse
+    difference = np.ravel(truelabels) - np.ravel(predictedlabels)
+    return np.dot(difference, difference) / len(difference)
@@ -127,6 +127,9 @@ class ALLKRANN(object):
       cmd = shlex.split(self.path + "mlpack_allkrann -r " + self.dataset +
           " -v -n neighbors.csv -d distances.csv " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -141,6 +144,7 @@ class ALLKRANN(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data runtime.
     timer = self.parseTimer(s)
@@ -132,6 +132,9 @@ class DecisionStump(object):
     else:
       Log.Fatal("This method requires atleast two datasets.")
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -146,6 +149,7 @@ class DecisionStump(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data (runtime and number of base cases).
     timer = self.parseTimer(s)
@@ -167,12 +171,13 @@ class DecisionStump(object):
       predictedlabels = LoadDataset("output_file")
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvgLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvgLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       #MeanSquaredError = Metrics.MeanSquaredError(labels, probabilities, confusionMatrix)
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, predictedlabels)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
@@ -114,6 +114,9 @@ class HMMGENERATE(object):
     cmd = shlex.split(self.path + "mlpack_hmm_generate -m " + self.dataset +
         " -v  " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -128,6 +131,7 @@ class HMMGENERATE(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -123,6 +123,9 @@ class HMMLOGLIK(object):
       Log.Fatal("This method requires two datasets.")
       return -1
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -137,6 +140,7 @@ class HMMLOGLIK(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
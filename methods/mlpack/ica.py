@@ -116,6 +116,9 @@ class ICA(object):
     cmd = shlex.split(self.path + "mlpack_radical -i " + self.dataset + " -v "
         + options + " -o output_ic.csv -u output_unmixing.csv -v")
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -130,6 +133,7 @@ class ICA(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -125,6 +125,9 @@ class KMEANS(object):
       cmd = shlex.split(self.path + "mlpack_kmeans -i " + self.dataset[0] +
           " -o output.csv -v " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -139,6 +142,7 @@ class KMEANS(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -124,6 +124,9 @@ class LARS(object):
     cmd = shlex.split(self.path + "mlpack_lars -i " + self.dataset[0] + " -r " +
         self.dataset[1] + " -v " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -138,6 +141,7 @@ class LARS(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -133,6 +133,9 @@ class LinearRegression(object):
       cmd = shlex.split(self.path + "mlpack_linear_regression -t " +
           self.dataset[0] + " -v " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -147,6 +150,7 @@ class LinearRegression(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -168,12 +172,13 @@ class LinearRegression(object):
       predictedlabels = LoadDataset("predictions.csv")
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvgLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvgLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, predictedlabels)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
       metrics['Avg Accuracy'] = AvgAcc
@@ -115,6 +115,9 @@ class LocalCoordinateCoding(object):
     cmd = shlex.split(self.path + "mlpack_local_coordinate_coding -t " +
         self.dataset + " -v " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -129,6 +132,7 @@ class LocalCoordinateCoding(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -117,6 +117,9 @@ class LSH(object):
     cmd = shlex.split(self.path + "mlpack_lsh -r " + self.dataset + " -v " +
         options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -131,6 +134,7 @@ class LSH(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -85,6 +85,9 @@ class MLP_FORWARD(object):
     # Split the command using shell-like syntax.
     cmd = shlex.split(self.path + "mlp_forward -v " + options)
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -99,6 +102,7 @@ class MLP_FORWARD(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
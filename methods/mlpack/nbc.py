@@ -132,6 +132,9 @@ class NBC(object):
     cmd = shlex.split(self.path + "mlpack_nbc -t " + self.dataset[0] + " -T "
         + self.dataset[1] + " -v " + options + " -o output.csv")
 
+    # Count the hardware events of the method if perf stat is enabled.
+    cmd = Profiler.PerfStatCommand(cmd)
+
     # Run command with the nessecary arguments and return its output as a byte
     # string. We have untrusted input so we disable all shell based features.
     try:
@@ -146,6 +149,7 @@ class NBC(object):
 
     # Datastructure to store the results.
     metrics = {}
+    metrics.update(Profiler.PerfStatMetrics())
 
     # Parse data: runtime.
     timer = self.parseTimer(s)
@@ -163,10 +167,11 @@ class NBC(object):
       predictedlabels = LoadDataset("output.csv")
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['MCC'] = allMetrics['MCC']
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
 
     return metrics
@@ -39,6 +39,7 @@ class DECISIONTREE(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
     self.stumps = 0
     self.minsize = 1
 
@@ -79,18 +80,19 @@ class DECISIONTREE(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run Decision Tree Classifier on the test dataset.
-          self.model.pred(testData)
+          predictions = self.model.pred(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      q.put((time, SharedArray(predictions)))
 
       return time
 
-    return timeout(RunDCMlpy, self.timeout)
+    result, self.predictions = ReceiveResult(timeout(RunDCMlpy, self.timeout))
+    return result
 
   '''
   Perform the Decision Tree Classifier. If the method has been
@@ -116,21 +118,16 @@ class DECISIONTREE(object):
 
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, labels = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, labels)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = self.model.pred(testData)
+      predictedlabels = self.predictions
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['MCC'] = allMetrics['MCC']
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
 
     return metrics
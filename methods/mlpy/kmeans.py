@@ -18,6 +18,7 @@ if cmd_subfolder not in sys.path:
 
 from log import *
 from timer import *
+from misc import *
 
 import numpy as np
 import mlpy
@@ -52,7 +53,7 @@ class KMEANS(object):
 
       # Load input dataset.
       Log.Info("Loading dataset", self.verbose)
-      data = np.genfromtxt(self.dataset[0], delimiter=',')
+      data = LoadDataset(self.dataset[0])
 
       # Gather all parameters.
       clusters = re.search('-c (\d+)', options)
@@ -47,6 +47,7 @@ class KNC(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
     self.n_neighbors = 5
     self.algorithm = 'kd_tree'
     self.leaf_size = 30
@@ -89,18 +90,19 @@ class KNC(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run k-nearest neighbors Classifier on the test dataset.
-          self.model.pred(testData)
+          predictions = self.model.pred(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      q.put((time, SharedArray(predictions)))
 
       return time
 
-    return timeout(RunKNCMlpy, self.timeout)
+    result, self.predictions = ReceiveResult(timeout(RunKNCMlpy, self.timeout))
+    return result
 
   '''
   Perform the k-nearest neighbors Classifier. If the method has been
@@ -127,21 +129,16 @@ class KNC(object):
 
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, labels = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, labels)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = self.model.pred(testData)
+      predictedlabels = self.predictions
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['MCC'] = allMetrics['MCC']
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
 
     return metrics
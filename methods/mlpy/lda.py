@@ -47,6 +47,7 @@ class LDA(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
 
   '''
   Build the model for the Linear Discriminant Analysis.
@@ -80,18 +81,19 @@ class LDA(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run Linear Discriminant Analysis on the test dataset.
-          self.model.pred(testData)
+          predictions = self.model.pred(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      q.put((time, SharedArray(predictions)))
 
       return time
 
-    return timeout(RunLDAMlpy, self.timeout)
+    result, self.predictions = ReceiveResult(timeout(RunLDAMlpy, self.timeout))
+    return result
 
   '''
   Perform the Linear Discriminant Analysis. If the method has been
@@ -118,20 +120,15 @@ class LDA(object):
 
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, labels = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, labels)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
-      predictedlabels = self.model.pred(testData)
+      predictedlabels = self.predictions
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['MCC'] = allMetrics['MCC']
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
 
     return metrics
@@ -76,7 +76,7 @@ class LinearRegression(object):
       # If the dataset contains two files then the second file is the test file.
       Log.Info("Loading dataset", self.verbose)
       if len(self.dataset) >= 2:
-        test_data = np.genfromtxt(self.dataset[1], delimiter=',')
+        test_data = LoadDataset(self.dataset[1])
 
       # Use the last row of the training set as the responses.
       X, y = SplitTrainData(self.dataset)
@@ -134,12 +134,13 @@ class LinearRegression(object):
       predictedlabels = LoadDataset("mlpy_lr_predictions.csv")
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvfLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvfLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, predictedlabels)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
 
@@ -47,6 +47,7 @@ class PERCEPTRON(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
     self.iterations = 1000
 
   '''
@@ -96,17 +97,22 @@ class PERCEPTRON(object):
 
           if len(self.dataset) >= 2:
             #prediction on the test data.
-            pred = model.pred(testSet)
+            predictions = self.model.pred(testSet)
       except Exception as e:
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      if len(self.dataset) >= 2:
+        q.put((time, SharedArray(predictions)))
+      else:
+        q.put(time)
 
       return time
 
-    return timeout(RunPerceptronMlpy, self.timeout)
+    result, self.predictions = ReceiveResult(
+        timeout(RunPerceptronMlpy, self.timeout))
+    return result
 
   '''
   Perform the Perceptron Classifier. If the method has been successfully
@@ -127,20 +133,15 @@ class PERCEPTRON(object):
 
     if len(self.dataset) >= 2:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, labels = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, labels)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
-      predictedlabels = self.model.pred(testData)
+      predictedlabels = self.predictions
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['MCC'] = allMetrics['MCC']
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
 
     return metrics
@@ -52,8 +52,8 @@ class ANN(object):
 
       # Load input dataset.
       Log.Info("Loading dataset", self.verbose)
-      referenceData = np.genfromtxt(self.dataset[0], delimiter=',')
-      queryData = np.genfromtxt(self.dataset[1], delimiter=',')
+      referenceData = LoadDataset(self.dataset[0])
+      queryData = LoadDataset(self.dataset[1])
       train, label = SplitTrainData(self.dataset)
 
       # Get all the parameters.
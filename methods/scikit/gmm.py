@@ -18,6 +18,7 @@ if cmd_subfolder not in sys.path:
 
 from log import *
 from timer import *
+from misc import *
 
 import numpy as np
 from sklearn import mixture
@@ -51,7 +52,7 @@ class GMM(object):
       totalTimer = Timer()
 
       # Load input dataset.
-      dataPoints = np.genfromtxt(self.dataset, delimiter=',')
+      dataPoints = LoadDataset(self.dataset)
 
       # Get all the parameters.
       g = re.search("-g (\d+)", options)
@@ -18,6 +18,7 @@ if cmd_subfolder not in sys.path:
 
 from log import *
 from timer import *
+from misc import *
 
 import numpy as np
 from sklearn.decomposition import FastICA
@@ -51,7 +52,7 @@ class ICA(object):
       totalTimer = Timer()
 
       # Load input dataset.
-      data = np.genfromtxt(self.dataset, delimiter=',')
+      data = LoadDataset(self.dataset)
 
       s = re.search('-s (\d+)', options)
       s = 0 if not s else int(s.group(1))
@@ -47,6 +47,7 @@ class LinearRegression(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
 
   '''
   Build the model for the Linear Regression.
@@ -88,16 +89,21 @@ class LinearRegression(object):
           b = self.model.coef_
 
           if len(self.dataset) >= 2:
-            self.model.predict(testSet)
+            predictions = self.model.predict(testSet)
       except Exception as e:
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      if len(self.dataset) >= 2:
+        q.put((time, SharedArray(predictions)))
+      else:
+        q.put(time)
       return time
 
-    return timeout(RunLinearRegressionScikit, self.timeout)
+    result, self.predictions = ReceiveResult(
+        timeout(RunLinearRegressionScikit, self.timeout))
+    return result
 
   '''
   Perform Linear Regression. If the method has been successfully completed
@@ -119,23 +125,18 @@ class LinearRegression(object):
 
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, labels = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, labels)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = np.rint(self.model.predict(testData))
+      predictedlabels = np.rint(self.predictions)
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvgLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvgLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, predictedlabels)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
       metric_results = (AvgAcc, AvgPrec, AvgRec, AvgF, AvgLift, AvgMCC, AvgInformation)
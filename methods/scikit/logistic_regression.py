@@ -47,6 +47,7 @@ class LogisticRegression(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
 
   '''
   Build the model for the Logistic Regression.
@@ -91,10 +92,18 @@ class LogisticRegression(object):
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+
+      # The prediction isn't part of the benchmark, but we return the
+      # predictions to compute the metrics without training a second model.
+      if len(self.dataset) >= 3:
+        q.put((time, SharedArray(self.model.predict(testSet))))
+      else:
+        q.put(time)
       return time
 
-    return timeout(RunLogisticRegressionScikit, self.timeout)
+    result, self.predictions = ReceiveResult(
+        timeout(RunLogisticRegressionScikit, self.timeout))
+    return result
 
   '''
   Perform Logistic Regression. If the method has been successfully completed
@@ -116,23 +125,17 @@ class LogisticRegression(object):
 
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, labels = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, labels)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
-      probabilities = self.model.predict_proba(testData)
-      predictedlabels = self.model.predict(testData)
+      predictedlabels = self.predictions
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvgLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvgLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, predictedlabels)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
       metric_results = (AvgAcc, AvgPrec, AvgRec, AvgF, AvgLift, AvgMCC, AvgInformation)
@@ -47,6 +47,7 @@ class PERCEPTRON(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
     self.iterations = 1000
 
   '''
@@ -93,16 +94,21 @@ class PERCEPTRON(object):
           # Perform perceptron classification.
           self.model = self.BuildModel(X, y)
           if len(self.dataset) >= 2:
-            predictedlabels = self.model.predict(testSet)
+            predictions = self.model.predict(testSet)
       except Exception as e:
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      if len(self.dataset) >= 2:
+        q.put((time, SharedArray(predictions)))
+      else:
+        q.put(time)
       return time
 
-    return timeout(RunPerceptronScikit, self.timeout)
+    result, self.predictions = ReceiveResult(
+        timeout(RunPerceptronScikit, self.timeout))
+    return result
 
   '''
   Perform Perceptron Classification. If the method has been successfully completed
@@ -124,22 +130,17 @@ class PERCEPTRON(object):
 
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, labels = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, labels)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
-      predictedlabels = self.model.predict(testData)
+      predictedlabels = self.predictions
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['LFT'] = Metrics.LiftMultiClass(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['LFT'] = allMetrics['Lift']
+      metrics['MCC'] = allMetrics['MCC']
       # metrics['FMeasure'] = Metrics.AvgFMeasure(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
 
     return metrics
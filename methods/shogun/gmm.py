@@ -18,6 +18,7 @@ if cmd_subfolder not in sys.path:
 
 from log import *
 from timer import *
+from misc import *
 
 import numpy as np
 from modshogun import RealFeatures
@@ -54,7 +55,7 @@ class GMM(object):
       try:
         # Load input dataset.
         Log.Info("Loading dataset", self.verbose)
-        dataPoints = np.genfromtxt(self.dataset, delimiter=',')
+        dataPoints = LoadDataset(self.dataset)
         dataFeat = RealFeatures(dataPoints.T)
 
         # Get all the parameters.
@@ -18,6 +18,7 @@ if cmd_subfolder not in sys.path:
 
 from log import *
 from timer import *
+from misc import *
 
 import numpy as np
 from modshogun import RealFeatures, KernelPCA
@@ -54,7 +55,7 @@ class KPCA(object):
       try:
         # Load input dataset.
         Log.Info("Loading dataset", self.verbose)
-        data = np.genfromtxt(self.dataset, delimiter=',')
+        data = LoadDataset(self.dataset)
         dataFeat = RealFeatures(data.T)
 
         with totalTimer:
@@ -66,7 +66,7 @@ class LASSO(object):
       try:
         Log.Info("Loading dataset", self.verbose)
         if len(self.dataset) >= 2:
-          testSet = np.genfromtxt(self.dataset[1], delimiter=',')
+          testSet = LoadDataset(self.dataset[1])
 
           # Get all the parameters.
           lambda1 = re.search("-l (\d+)", options)
@@ -116,12 +116,13 @@ class LASSO(object):
       truelabels = LoadDataset(self.dataset[2])
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, self.predictions)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvgLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvgLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, self.predictions)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, self.predictions)
       metric_results = (AvgAcc, AvgPrec, AvgRec, AvgF, AvgLift, AvgMCC, AvgInformation)
@@ -64,7 +64,7 @@ class LinearRidgeRegression(object):
       # file.
       Log.Info("Loading dataset", self.verbose)
       if len(self.dataset) >= 2:
-        testSet = np.genfromtxt(self.dataset[1], delimiter=',')
+        testSet = LoadDataset(self.dataset[1])
 
       # Use the last row of the training set as the responses.
       X, y = SplitTrainData(self.dataset)
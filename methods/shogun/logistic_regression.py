@@ -48,6 +48,7 @@ class LogisticRegression(object):
     self.timeout = timeout
     self.z = 0;
     self.model = None
+    self.predictions = None
 
   '''
   Build the model for the Logistic Regression.
@@ -92,19 +93,24 @@ class LogisticRegression(object):
           self.model = BuildModel(x, y)
           self.model.train()
 
-          if len(self.dataset) == 2:
+          if len(self.dataset) >= 2:
             pred = classifier.apply(RealFeatures(testSet.T))
-            self.predictions = pred.get_labels()
+            predictions = pred.get_labels()
 
       except Exception as e:
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      if len(self.dataset) >= 2:
+        q.put((time, SharedArray(predictions)))
+      else:
+        q.put(time)
       return time
 
-    return timeout(RunLogisticRegressionShogun, self.timeout)
+    result, self.predictions = ReceiveResult(
+        timeout(RunLogisticRegressionShogun, self.timeout))
+    return result
 
   '''
   Perform Logistic Regression. If the method has been successfully completed
@@ -124,21 +130,16 @@ class LogisticRegression(object):
     metrics = {'Runtime' : results}
 
     if len(self.dataset) >= 3:
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, responses = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, responses)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, self.predictions)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvgLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvgLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, self.predictions)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, self.predictions)
       metric_results = (AvgAcc, AvgPrec, AvgRec, AvgF, AvgLift, AvgMCC, AvgInformation)
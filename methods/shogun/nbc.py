@@ -24,6 +24,7 @@ if metrics_folder not in sys.path:
 
 from log import *
 from timer import *
+from misc import *
 from definitions import *
 
 import numpy as np
@@ -60,8 +61,8 @@ class NBC(object):
       Log.Info("Loading dataset", self.verbose)
       try:
         # Load train and test dataset.
-        trainData = np.genfromtxt(self.dataset[0], delimiter=',')
-        testData = np.genfromtxt(self.dataset[1], delimiter=',')
+        trainData = LoadDataset(self.dataset[0])
+        testData = LoadDataset(self.dataset[1])
 
         # Labels are the last row of the training set.
         labels = MulticlassLabels(trainData[:, (trainData.shape[1] - 1)])
@@ -129,12 +130,13 @@ class NBC(object):
       predictedlabels = LoadDataset("shogun_labels.csv")
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
-      AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
-      AvgPrec = Metrics.AvgPrecision(confusionMatrix)
-      AvgRec = Metrics.AvgRecall(confusionMatrix)
-      AvgF = Metrics.AvgFMeasure(confusionMatrix)
-      AvgLift = Metrics.LiftMultiClass(confusionMatrix)
-      AvgMCC = Metrics.MCCMultiClass(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      AvgAcc = allMetrics['ACC']
+      AvgPrec = allMetrics['Precision']
+      AvgRec = allMetrics['Recall']
+      AvgF = allMetrics['FMeasure']
+      AvgLift = allMetrics['Lift']
+      AvgMCC = allMetrics['MCC']
       AvgInformation = Metrics.AvgMPIArray(confusionMatrix, truelabels, predictedlabels)
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
       metric_results = (AvgAcc, AvgPrec, AvgRec, AvgF, AvgLift, AvgMCC, AvgInformation)
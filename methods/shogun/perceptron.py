@@ -48,6 +48,7 @@ class PERCEPTRON(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.predictions = None
     self.iterations = 1000
 
   '''
@@ -94,18 +95,23 @@ class PERCEPTRON(object):
             # Perform perceptron classification.
             self.model = BuildModel(X, y)
 
-            if len(self.dataset) == 2:
+            if len(self.dataset) >= 2:
               pred = self.model.apply(RealFeatures(testSet.T))
-              self.predictions = pred.get_labels()
+              predictions = pred.get_labels()
       except Exception as e:
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
-      q.put(time)
+      if len(self.dataset) >= 2:
+        q.put((time, SharedArray(predictions)))
+      else:
+        q.put(time)
       return time
 
-    return timeout(RunPerceptronShogun, self.timeout)
+    result, self.predictions = ReceiveResult(
+        timeout(RunPerceptronShogun, self.timeout))
+    return result
 
   '''
   Perform Perceptron classification. If the method has been successfully completed
@@ -126,21 +132,16 @@ class PERCEPTRON(object):
 
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
-        trainData, responses = SplitTrainData(self.dataset)
-        self.model = self.BuildModel(trainData, responses)
-
-      testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, self.predictions)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['LFT'] = Metrics.LiftMultiClass(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
-      metrics['FMeasure'] = Metrics.AvgFMeasure(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['LFT'] = allMetrics['Lift']
+      metrics['MCC'] = allMetrics['MCC']
+      metrics['FMeasure'] = allMetrics['FMeasure']
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
       metrics['Information'] = Metrics.AvgMPIArray(confusionMatrix, truelabels, predictedlabels)
 
@@ -61,11 +61,11 @@ class QDA(object):
       Log.Info("Loading dataset", self.verbose)
       try:
         # Load train and test dataset.
-        trainData = np.genfromtxt(self.dataset[0], delimiter=',')
+        trainData = LoadDataset(self.dataset[0])
         trainFeat = modshogun.RealFeatures(trainData[:,:-1].T)
 
         if len(self.dataset) == 2:
-          testSet = np.genfromtxt(self.dataset[1], delimiter=',')
+          testSet = LoadDataset(self.dataset[1])
           testFeat = modshogun.RealFeatures(testData.T)
 
         # Labels are the last row of the training set.
@@ -114,10 +114,11 @@ class QDA(object):
       predictions = model.apply(modshogun.RealFeatures(testData.T)).get_labels()
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictions)
-      metrics['ACC'] = Metrics.AverageAccuracy(confusionMatrix)
-      metrics['MCC'] = Metrics.MCCMultiClass(confusionMatrix)
-      metrics['Precision'] = Metrics.AvgPrecision(confusionMatrix)
-      metrics['Recall'] = Metrics.AvgRecall(confusionMatrix)
+      allMetrics = Metrics.AllMetrics(confusionMatrix)
+      metrics['ACC'] = allMetrics['ACC']
+      metrics['MCC'] = allMetrics['MCC']
+      metrics['Precision'] = allMetrics['Precision']
+      metrics['Recall'] = allMetrics['Recall']
       metrics['MSE'] = Metrics.SimpleMeanSquaredError(truelabels, predictions)
 
     return metrics
@@ -92,22 +92,8 @@ hmc.datasetSelect = function()
   // Create an empty chart.
   hmc.clear();
 
-  var sqlstr = "SELECT DISTINCT libary_id as id from builds;"
-  var params = dbExec(sqlstr);
-
-  sqlstr = "SELECT DISTINCT methods.name as methodname, methods.parameters, libraries.name as lib, metrics.metric FROM methods, metrics, datasets, libraries, builds WHERE metrics.dataset_id = datasets.id AND metrics.method_id = methods.id AND datasets.name = '" + hmc.dataset_name + "' AND libraries.id = metrics.libary_id AND ("
-
-  var length = dbType === "sqlite" ? params[0].values.length : params.length
-  for(i = 0; i < length; i++)
-  {
-    var idValue = dbType === "sqlite" ? params[0].values[i] : params[i].id;
-    var libsqlstr = "SELECT id FROM builds WHERE libary_id = " + idValue + " ORDER BY id DESC LIMIT 1;"
-    var libid = dbExec(libsqlstr)
-
-    libid = dbType === "sqlite" ? libid[0].values[0] : libid[0].id;
-    sqlstr += " metrics.build_id = "  + libid + " OR "
-  }
-  sqlstr += " metrics.build_id = 0) ORDER BY methods.name;";
+  // Use the latest build of every library.
+  var sqlstr = "SELECT DISTINCT methods.name as methodname, methods.parameters, libraries.name as lib, metrics.metric FROM methods, metrics, datasets, libraries WHERE metrics.dataset_id = datasets.id AND metrics.method_id = methods.id AND datasets.name = '" + hmc.dataset_name + "' AND libraries.id = metrics.libary_id AND metrics.build_id IN (SELECT MAX(id) FROM builds GROUP BY libary_id) ORDER BY methods.name;";
   hmc.results = dbType === "sqlite" ? dbExec(sqlstr)[0].values : dbExec(sqlstr);
 
   // Obtain unique list of metric names.
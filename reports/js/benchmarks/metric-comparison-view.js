@@ -294,7 +294,8 @@ mc.clickRedrawMethods = function()
 
     // Given a method name and parameters, query the SQLite database for all of
     // the runs.
-    sqlstr = sqlstr + "SELECT DISTINCT * FROM (SELECT metrics.metric as metric, libraries.id as lid, libraries.name as lib, datasets.name as dataset, datasets.id as did, methods.name as method, methods.parameters as paremter, metrics.build_id as bid " +
+    sqlstr = sqlstr + "SELECT DISTINCT * FROM (SELECT metrics.metric as metric, libraries.id as lid, libraries.name as lib, datasets.name as dataset, datasets.id as did, methods.name as method, methods.parameters as paremter, metrics.build_id as bid, " +
+        "(SELECT bootstrap.metric FROM bootstrap WHERE bootstrap.build_id = metrics.build_id AND bootstrap.libary_id = metrics.libary_id AND bootstrap.dataset_id = metrics.dataset_id AND bootstrap.method_id = metrics.method_id) as ci " +
         "FROM metrics, datasets, methods, libraries WHERE metrics.dataset_id = datasets.id AND metrics.method_id = methods.id AND datasets.name = '" + mc.dataset_name + "' AND " +
         "methods.name = '" + method_name + "' AND methods.parameters = '" + param_name + "' AND libraries.name = '" + library_name + "' AND libraries.id = metrics.libary_id AND metrics.metric<>'{}' ORDER BY bid DESC ) tmp GROUP BY did, lid";
 
@@ -430,6 +431,7 @@ mc.buildChart = function()
 
         var score = d[0];
         if (score != "") { score = d[0].toFixed(3); }
+        if (d[6] != null) { score += " [" + d[6][1].toFixed(3) + ", " + d[6][2].toFixed(3) + "]"; }
         return "<strong>Score for " + d[3] + " (" + d[5] + "):</strong> <span style='color:yellow'>" + score + "</span>"; });
 
   svg.call(tip);
@@ -446,6 +448,8 @@ mc.buildChart = function()
         {
           var jsonValue = dbType === "sqlite" ? mc.results[i][0] : mc.results[i].metric;
           var json = jQuery.parseJSON(jsonValue);
+          var ciValue = dbType === "sqlite" ? mc.results[i][8] : mc.results[i].ci;
+          var ci = ciValue ? jQuery.parseJSON(ciValue) : {};
 
           console.log("mc.results[i]")
           console.log(mc.results[i])
@@ -457,7 +461,8 @@ mc.buildChart = function()
               k,
               dbType === "sqlite" ? mc.results[i][2] : mc.results[i].lib,
               dbType === "sqlite" ? mc.results[i][5] : mc.results[i].method,
-              dbType === "sqlite" ? mc.results[i][6] : mc.results[i].paremter]); }
+              dbType === "sqlite" ? mc.results[i][6] : mc.results[i].paremter,
+              k in ci ? ci[k] : null]); }
           })
         }
 
@@ -482,6 +487,22 @@ mc.buildChart = function()
     .on('mouseover', tip.show)
     .on('mouseout', tip.hide);
 
+  // Add the bootstrap confidence intervals of the metrics.
+  group.selectAll("line")
+    .data(function(d)
+        {
+        // The data of the bars of this metric.
+        return d3.select(this).selectAll("rect").data().filter(function(r) { return r[6] != null; });
+        })
+  .enter().append("line")
+    .attr("class", "error-bar")
+    .attr("x1", function(d) { return library_scale(d[3] + d[4] + d[5]) + library_scale.rangeBand() / 2; })
+    .attr("x2", function(d) { return library_scale(d[3] + d[4] + d[5]) + library_scale.rangeBand() / 2; })
+    .attr("y1", function(d) { return score_scale(Math.max(0, d[6][1])); })
+    .attr("y2", function(d) { return score_scale(Math.min(max_score, d[6][2])); })
+    .style("stroke", "black")
+    .style("stroke-width", 1);
+
   // Now add a table of runtimes at the bottom.
   var table = d3.select(".svgholder").append("table")
       .attr("class", "runtime-table");
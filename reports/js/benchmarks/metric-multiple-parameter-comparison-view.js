@@ -124,22 +124,18 @@ mmpc.listOptions = function()
 // List the metrics.
 mmpc.listMetrics = function()
 {
-  var sqlstr = "SELECT metrics.metric as metric FROM datasets, metrics, methods " +
+  var sqlstr = "SELECT DISTINCT metric_values.metric_name as metric " +
+               "FROM datasets, metrics, methods, metric_values " +
                "WHERE datasets.id = metrics.dataset_id " +
                  "AND methods.id = metrics.method_id " +
+                 "AND metrics.id = metric_values.result_id " +
                  "AND methods.name = '" + mmpc.method_name + "' " +
-                 "AND datasets.name = '" + mmpc.dataset_name + "';";
+                 "AND datasets.name = '" + mmpc.dataset_name + "' " +
+               "ORDER BY metric_values.metric_name;";
   var results = dbExec(sqlstr);
   results = dbType === "sqlite" ? results[0].values : results;
 
-  addMetric = function(p, c) {
-    var json = jQuery.parseJSON(dbType === "sqlite" ? c : c.metric);
-    for(var k in json)
-      if(p.indexOf(k) < 0)
-        p.push(k);
-    return p;
-  };
-  metrics = results.reduce(addMetric, []);
+  metrics = results.map(function(d) { return dbType === "sqlite" ? d[0] : d.metric; });
 
   var metric_select_box = document.getElementById("metric_select");
   clearSelectBox(metric_select_box);
@@ -189,33 +185,31 @@ mmpc.metricSelect = function()
   var metric_select_box = document.getElementById("metric_select");
   mmpc.metric_name = metric_select_box.options[metric_select_box.selectedIndex].text;
 
-  var sqlstr = "SELECT metrics.metric as metric, methods.parameters as parameter, libraries.name as lib, metrics.build_id " +
-               "FROM datasets, metrics, methods, libraries, builds " +
+  var sqlstr = "SELECT metric_values.value as metric, methods.parameters as parameter, libraries.name as lib, metrics.build_id " +
+               "FROM datasets, metrics, methods, libraries, builds, metric_values " +
                "WHERE datasets.id = metrics.dataset_id " +
                  "AND methods.id = metrics.method_id " +
                  "AND metrics.libary_id = libraries.id " +
                  "AND builds.id = metrics.build_id " +
+                 "AND metrics.id = metric_values.result_id " +
+                 "AND metric_values.metric_name = '" + mmpc.metric_name + "' " +
+                 "AND metric_values.status = 'ok' " +
                  "AND methods.name = '" + mmpc.method_name + "' " +
                  "AND datasets.name = '" + mmpc.dataset_name + "';";
   mmpc.results = dbExec(sqlstr);
   mmpc.results = dbType === "sqlite" ? mmpc.results[0].values : mmpc.results;
 
-  console.log(mmpc.results)
-
   var filterAndSet = function(p, d) {
-    var metrics = jQuery.parseJSON(dbType === "sqlite" ? d[0] : d.metric);
     var value = mmpc.getOptionValue(dbType === "sqlite" ? d[1].toString() : d.parameter, mmpc.option);
-    if(value != "" && mmpc.metric_name in metrics)
+    if(value != "")
     {
       if (dbType === "sqlite")
       {
-        d[0] = metrics[mmpc.metric_name];
         d[1] = mmpc.removeOption(d[1].toString(), mmpc.option);
         d[4] = value;
       }
       else
       {
-        d.metric = metrics[mmpc.metric_name];
         d.parameter = mmpc.removeOption(d.parameter.toString(), mmpc.option);
         d.value = value;
       }
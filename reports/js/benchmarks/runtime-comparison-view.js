@@ -165,8 +165,8 @@ rc.paramSelect = function()
   }
 
   var sqlstr = "SELECT DISTINCT * FROM " +
-      "(SELECT results.time as time, results.var as var, libraries.id, libraries.name as lib, datasets.name as dataset, datasets.id as did, libraries.id as lid, results.build_id as bid, datasets.instances as di, datasets.attributes as da, datasets.size as ds " +
-      "FROM results, datasets, methods, libraries WHERE " +
+      "(SELECT results.time as time, results.var as var, libraries.id, libraries.name as lib, datasets.name as dataset, datasets.id as did, libraries.id as lid, results.build_id as bid, datasets.instances as di, datasets.attributes as da, datasets.size as ds, sample_stats.median as median, sample_stats.min as min, sample_stats.mad as mad " +
+      "FROM results LEFT JOIN sample_stats ON sample_stats.build_id = results.build_id AND sample_stats.libary_id = results.libary_id AND sample_stats.dataset_id = results.dataset_id AND sample_stats.method_id = results.method_id AND sample_stats.metric_name = 'Runtime', datasets, methods, libraries WHERE " +
       "results.dataset_id = datasets.id AND results.method_id = methods.id AND methods.name = '" + rc.method_name + "' AND methods.parameters = '" + rc.param_name + "' AND libraries.id = results.libary_id ORDER BY bid DESC " +
       ") tmp GROUP BY lid, " + rc.groupBy + ", did;";
   rc.results = dbExec(sqlstr);
@@ -214,8 +214,8 @@ rc.orderSelect = function()
   }
 
   var sqlstr = "SELECT DISTINCT * FROM " +
-    "(SELECT results.time as time, results.var as var, libraries.id, libraries.name as lib, datasets.name as dataset, datasets.id as did, libraries.id as lid, results.build_id as bid, datasets.instances as di, datasets.attributes as da, datasets.size as ds " +
-    "FROM results, datasets, methods, libraries WHERE " +
+    "(SELECT results.time as time, results.var as var, libraries.id, libraries.name as lib, datasets.name as dataset, datasets.id as did, libraries.id as lid, results.build_id as bid, datasets.instances as di, datasets.attributes as da, datasets.size as ds, sample_stats.median as median, sample_stats.min as min, sample_stats.mad as mad " +
+    "FROM results LEFT JOIN sample_stats ON sample_stats.build_id = results.build_id AND sample_stats.libary_id = results.libary_id AND sample_stats.dataset_id = results.dataset_id AND sample_stats.method_id = results.method_id AND sample_stats.metric_name = 'Runtime', datasets, methods, libraries WHERE " +
     "results.dataset_id = datasets.id AND results.method_id = methods.id AND methods.name = '" + rc.method_name + "' AND methods.parameters = '" + rc.param_name + "' AND libraries.id = results.libary_id ORDER BY bid DESC " +
     ") tmp GROUP BY lid, " + rc.groupBy + ", did;";
   rc.results = dbExec(sqlstr);
@@ -360,7 +360,12 @@ rc.buildChart = function()
       .html(function(d) {
           var runtime = dbType === "sqlite" ? d[0] : parseFloat(d.time);
           if (runtime != ">9000" && runtime != 0 && runtime != "failure") { runtime = dbType === "sqlite" ? d[0].toFixed(3) : runtime.toFixed(1);  }
-          return "<strong>Runtime for " + (dbType === "sqlite" ? d[3] : d.lib) + ":</strong> <span style='color:yellow'>" + runtime + "s</span>"; }
+          var variance = dbType === "sqlite" ? d[1] : parseFloat(d.var);
+          if (variance > 0) { runtime += " &plusmn; " + Math.sqrt(variance).toFixed(3); }
+          var median = dbType === "sqlite" ? d[11] : d.median;
+          if (median != null) { runtime += "s (median " + parseFloat(median).toFixed(3) + ", min " + parseFloat(dbType === "sqlite" ? d[12] : d.min).toFixed(3) + ", MAD " + parseFloat(dbType === "sqlite" ? d[13] : d.mad).toFixed(3) + ")"; }
+          else { runtime += "s"; }
+          return "<strong>Runtime for " + (dbType === "sqlite" ? d[3] : d.lib) + ":</strong> <span style='color:yellow'>" + runtime + "</span>"; }
       );
 
   svg.call(tip);
@@ -416,6 +421,32 @@ rc.buildChart = function()
         .on('mouseover', tip.show)
         .on('mouseout', tip.hide);
 
+  // Add the error bars (one standard deviation) of the trials.
+  gs.data(function(d)
+        {
+          var ret = [];
+          for(i = 0; i < rc.results.length; i++)
+          {
+            var dataset = dbType === "sqlite" ? rc.results[i][4] : rc.results[i].dataset;
+            var library = dbType === "sqlite" ? rc.results[i][3] : rc.results[i].lib;
+            var runtime = dbType === "sqlite" ? rc.results[i][0] : rc.results[i].time;
+            var variance = dbType === "sqlite" ? rc.results[i][1] : parseFloat(rc.results[i].var);
+            if(dataset == d && rc.active_libraries[library] == true && runtime != "failure" && runtime != ">9000" && variance > 0)
+            {
+              ret.push(rc.results[i]);
+            }
+          }
+          return ret;
+        })
+    .enter().append("line")
+        .attr("class", "error-bar")
+        .attr("x1", function(d) { return library_scale(dbType === "sqlite" ? d[3] : d.lib) + library_scale.rangeBand() / 2; })
+        .attr("x2", function(d) { return library_scale(dbType === "sqlite" ? d[3] : d.lib) + library_scale.rangeBand() / 2; })
+        .attr("y1", function(d) { var runtime = parseFloat(dbType === "sqlite" ? d[0] : d.time); var std = Math.sqrt(dbType === "sqlite" ? d[1] : parseFloat(d.var)); return runtime_scale(Math.max(0, runtime - std)); })
+        .attr("y2", function(d) { var runtime = parseFloat(dbType === "sqlite" ? d[0] : d.time); var std = Math.sqrt(dbType === "sqlite" ? d[1] : parseFloat(d.var)); return runtime_scale(Math.min(max_runtime, runtime + std)); })
+        .style("stroke", "black")
+        .style("stroke-width", 1);
+
   var failureData = gs.data(function(d)
       {
         var ret = [];
@@ -117,3 +117,50 @@ class Metrics_Test(unittest.TestCase):
   def test_AvgMeanPredictiveInformation(self):
     result=Metrics.AvgMeanPredictiveInformation(self.CM, "tests/true_labels.csv", "tests/predicted_labels.csv")
     self.assertTrue(result > -1.7 and result <= -1.6)
+
+  '''
+  Test for the AllMetrics metrics (same values as the single metrics)
+  '''
+  def test_AllMetrics(self):
+    result=Metrics.AllMetrics(self.CM)
+    self.assertAlmostEqual(result['ACC'], Metrics.AverageAccuracy(self.CM))
+    self.assertAlmostEqual(result['MCC'], Metrics.MCCMultiClass(self.CM))
+    self.assertAlmostEqual(result['Precision'], Metrics.AvgPrecision(self.CM))
+    self.assertAlmostEqual(result['Recall'], Metrics.AvgRecall(self.CM))
+    self.assertAlmostEqual(result['FMeasure'], Metrics.AvgFMeasure(self.CM))
+    self.assertAlmostEqual(result['Lift'], Metrics.LiftMultiClass(self.CM))
+
+  '''
+  Test for the AllMetrics metrics on a confusion matrix with 1000 classes
+  (same values as the definitions of the metrics computed for every class)
+  '''
+  def test_AllMetricsLargeConfusionMatrix(self):
+    CM = np.random.RandomState(42).randint(1, 100, (1000, 1000))
+    CM += np.diag(np.full(1000, 10000))
+    result = Metrics.AllMetrics(CM)
+
+    total = float(CM.sum())
+    reference = { 'Precision' : [], 'Recall' : [], 'FMeasure' : [],
+                  'Lift' : [], 'MCC' : [] }
+    for i in range(CM.shape[0]):
+      tp = float(CM[i][i])
+      fp = CM[:, i].sum() - tp
+      fn = CM[i].sum() - tp
+      tn = total - tp - fp - fn
+
+      precision = tp / (tp + fp)
+      recall = tp / (tp + fn)
+      reference['Precision'].append(precision)
+      reference['Recall'].append(recall)
+      reference['FMeasure'].append(2 * precision * recall /
+          (precision + recall))
+      # The lift uses the predictions of the first class as threshold.
+      reference['Lift'].append(recall / (CM[:, 0].sum() / total))
+      reference['MCC'].append((tp * tn - fp * fn) / np.sqrt((tp + fp) *
+          (tp + fn) * (tn + fp) * (tn + fn)))
+
+    for key, values in reference.items():
+      self.assertAlmostEqual(result[key], np.mean(values))
+    self.assertAlmostEqual(result['ACC'], np.mean(reference['Recall']))
+    self.assertAlmostEqual(Metrics.MatthewsCorrelationCoefficientClass(0, CM),
+        reference['MCC'][0])
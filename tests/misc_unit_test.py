@@ -0,0 +1,124 @@
+'''
+  @file misc_unit_test.py
+  @author Marcus Edel
+
+  Test for the dataset parser.
+'''
+
+import unittest
+
+import os, sys, inspect, shutil, tempfile
+
+
+'''
+Import the util path.
+'''
+util_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if util_subfolder not in sys.path:
+  sys.path.insert(0, util_subfolder)
+
+import misc
+import numpy as np
+
+class ParseDataset_Test(unittest.TestCase):
+
+  '''
+  Test Initialization
+  '''
+  def setUp(self):
+    self.path = tempfile.mkdtemp()
+    self.chunkSize = misc.parseChunkSize
+
+  '''
+  Test Cleanup
+  '''
+  def tearDown(self):
+    misc.parseChunkSize = self.chunkSize
+    shutil.rmtree(self.path)
+
+  '''
+  Write the given content into a new dataset file.
+  '''
+  def Dataset(self, name, content):
+    dataset = os.path.join(self.path, name)
+    with open(dataset, "w") as fid:
+      fid.write(content)
+    return dataset
+
+  '''
+  Parse the dataset with the single process and the parallel parser and
+  compare the results with numpy.genfromtxt. The parallel parser must not fall
+  back to genfromtxt.
+  '''
+  def AssertEqualParse(self, dataset, delimiter):
+    genfromtxt = np.genfromtxt
+    expected = genfromtxt(dataset, delimiter=delimiter)
+
+    def Fallback(*args, **kwargs):
+      raise AssertionError("The parallel parser used genfromtxt.")
+
+    for chunkSize in [self.chunkSize, 16]:
+      misc.parseChunkSize = chunkSize
+      if chunkSize < os.path.getsize(dataset):
+        np.genfromtxt = Fallback
+      try:
+        result = misc.ParseDataset(dataset, delimiter=delimiter, processes=3)
+      finally:
+        np.genfromtxt = genfromtxt
+
+      self.assertEqual(result.shape, expected.shape)
+      self.assertEqual(result.dtype, expected.dtype)
+      np.testing.assert_array_equal(result, expected)
+
+  '''
+  Test a comma separated dataset.
+  '''
+  def test_CommaDelimiter(self):
+    dataset = self.Dataset("comma.csv", "".join("%d,%.6f,-%d.5\n" % (i,
+        i / 7.0, i) for i in range(200)))
+    self.AssertEqualParse(dataset, ",")
+
+  '''
+  Test a space separated dataset.
+  '''
+  def test_SpaceDelimiter(self):
+    dataset = self.Dataset("space.txt", "".join("%d %.6f %de-3\n" % (i,
+        i / 3.0, i) for i in range(200)))
+    self.AssertEqualParse(dataset, " ")
+
+  '''
+  Test a dataset with a single row.
+  '''
+  def test_SingleRow(self):
+    dataset = self.Dataset("row.csv", ",".join(str(i) for i in range(50)) +
+        "\n")
+    self.AssertEqualParse(dataset, ",")
+
+  '''
+  Test a dataset with a single column.
+  '''
+  def test_SingleColumn(self):
+    dataset = self.Dataset("column.csv", "".join("%.3f\n" % (i / 9.0) for i
+        in range(200)))
+    self.AssertEqualParse(dataset, ",")
+
+  '''
+  Test a dataset without a newline at the end of the last row.
+  '''
+  def test_NoTrailingNewline(self):
+    dataset = self.Dataset("newline.csv", "\n".join("%d,%d,%d" % (i, i * 2,
+        i * 3) for i in range(200)))
+    self.AssertEqualParse(dataset, ",")
+
+  '''
+  Test a dataset which is split into more chunks than processes.
+  '''
+  def test_LargerThanChunkSize(self):
+    dataset = self.Dataset("large.csv", "".join("%d,%.8f,%d\n" % (i,
+        np.sqrt(i), -i) for i in range(5000)))
+    self.assertTrue(os.path.getsize(dataset) > 16 * 3 * 4)
+    self.AssertEqualParse(dataset, ",")
+
+if __name__ == '__main__':
+  unittest.main()
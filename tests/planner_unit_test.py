@@ -0,0 +1,100 @@
+'''
+  @file planner_unit_test.py
+  @author Marcus Edel
+
+  Test for the time budget planner.
+'''
+
+import unittest
+
+import os, sys, inspect, datetime
+
+
+'''
+Import the util path.
+'''
+util_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if util_subfolder not in sys.path:
+  sys.path.insert(0, util_subfolder)
+
+from planner import *
+
+class PlanBudget_Test(unittest.TestCase):
+
+  '''
+  Create a job of the given library and dataset.
+  '''
+  def Job(self, library, dataset, changed=False):
+    return { "key" : ("KMEANS", "", library, dataset),
+             "library" : library,
+             "script" : library + ".py",
+             "trials" : 2,
+             "history" : (library, "KMEANS", "", dataset),
+             "changed" : changed }
+
+  '''
+  Build timestamp of the given number of days ago.
+  '''
+  def Build(self, days):
+    return datetime.datetime.now() - datetime.timedelta(days=days)
+
+  '''
+  Test the order of new, changed and old jobs.
+  '''
+  def test_Order(self):
+    jobs = [self.Job("mlpack", "old"), self.Job("mlpack", "older"),
+        self.Job("mlpack", "changed", True), self.Job("mlpack", "new")]
+    history = { jobs[0]["history"] : (1.0, self.Build(1)),
+                jobs[1]["history"] : (1.0, self.Build(5)),
+                jobs[2]["history"] : (1.0, self.Build(1)) }
+
+    selected, skipped = PlanBudget(jobs, history, 100, 10)
+    self.assertEqual([e["job"]["key"][3] for e in selected],
+        ["new", "changed", "older", "old"])
+    self.assertEqual([e["reason"] for e in selected],
+        ["new", "changed", "age", "age"])
+    self.assertEqual(skipped, [])
+
+  '''
+  Test the estimated time of the jobs and the projected start times.
+  '''
+  def test_Cost(self):
+    jobs = [self.Job("mlpack", "a"), self.Job("mlpack", "b"),
+        self.Job("mlpack", "timeout"), self.Job("mlpack", "new")]
+    history = { jobs[0]["history"] : (1.0, self.Build(3)),
+                jobs[1]["history"] : (3.0, self.Build(2)),
+                jobs[2]["history"] : (-1, self.Build(1)) }
+
+    selected, skipped = PlanBudget(jobs, history, 100, 10)
+    cost = dict((e["job"]["key"][3], e["cost"]) for e in selected)
+
+    # The runtime is multiplied by the trials, a timeout counts once and the
+    # new job gets the median of the library.
+    self.assertEqual(cost, { "a" : 2.0, "b" : 6.0, "timeout" : 10.0,
+        "new" : 6.0 })
+    self.assertEqual([e["start"] for e in selected], [0.0, 6.0, 8.0, 14.0])
+
+  '''
+  Test that jobs which don't fit are skipped and smaller jobs fill the rest of
+  the budget.
+  '''
+  def test_BudgetFill(self):
+    jobs = [self.Job("mlpack", "large"), self.Job("mlpack", "small")]
+    history = { jobs[0]["history"] : (5.0, self.Build(2)),
+                jobs[1]["history"] : (1.0, self.Build(1)) }
+
+    selected, skipped = PlanBudget(jobs, history, 4, 10)
+    self.assertEqual([e["job"]["key"][3] for e in selected], ["small"])
+    self.assertEqual([e["job"]["key"][3] for e in skipped], ["large"])
+
+  '''
+  Test the parser of the budget.
+  '''
+  def test_ParseDuration(self):
+    self.assertEqual(ParseDuration("8h"), 28800)
+    self.assertEqual(ParseDuration("30m"), 1800)
+    self.assertEqual(ParseDuration("90"), 90)
+
+if __name__ == '__main__':
+  unittest.main()
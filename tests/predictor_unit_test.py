@@ -0,0 +1,68 @@
+'''
+  @file predictor_unit_test.py
+  @author Marcus Edel
+
+  Test for the runtime predictor.
+'''
+
+import unittest
+
+import os, sys, inspect
+
+
+'''
+Import the util path.
+'''
+util_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if util_subfolder not in sys.path:
+  sys.path.insert(0, util_subfolder)
+
+from predictor import *
+
+class RuntimePredictor_Test(unittest.TestCase):
+
+  '''
+  Test Initialization, the runtime grows linearly with the dataset size.
+  '''
+  def setUp(self):
+    self.predictor = RuntimePredictor()
+    for size in [1e3, 1e4, 1e5, 1e6]:
+      self.predictor.Add(size, size * 1e-4 * (1.05 if size == 1e4 else 1))
+
+  '''
+  Test that there is no prediction without enough measurements.
+  '''
+  def test_NotEnoughPoints(self):
+    predictor = RuntimePredictor()
+    predictor.Add(1e3, 1)
+    predictor.Add(1e4, 2)
+    self.assertEqual(predictor.Predict(1e5), None)
+    self.assertEqual(predictor.Skip(1e8, 1), None)
+
+  '''
+  Test that a dataset is skipped if the lower bound exceeds the timeout.
+  '''
+  def test_Skip(self):
+    runtime, lower = self.predictor.Skip(1e8, 100)
+    self.assertTrue(lower > 100)
+    self.assertTrue(runtime > lower)
+
+  '''
+  Test that a dataset is not skipped if the prediction exceeds the timeout but
+  the lower bound doesn't.
+  '''
+  def test_NoSkipUncertain(self):
+    runtime, lower = self.predictor.Predict(1.1e6)
+    self.assertTrue(runtime > 100)
+    self.assertTrue(lower < 100)
+    self.assertEqual(self.predictor.Skip(1.1e6, 100), None)
+
+  '''
+  Test that a small dataset is not skipped.
+  '''
+  def test_NoSkip(self):
+    self.assertEqual(self.predictor.Skip(1e5, 100), None)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,116 @@
+'''
+  @file regression_unit_test.py
+  @author Marcus Edel
+
+  Test for the runtime regression tests.
+'''
+
+import unittest
+
+import os, sys, inspect
+
+
+'''
+Import the util path.
+'''
+util_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if util_subfolder not in sys.path:
+  sys.path.insert(0, util_subfolder)
+
+import regression
+
+class MannWhitneyU_Test(unittest.TestCase):
+
+  '''
+  Test Initialization
+  '''
+  def setUp(self):
+    self.exactPermutations = regression.exactPermutations
+
+  '''
+  Test Cleanup
+  '''
+  def tearDown(self):
+    regression.exactPermutations = self.exactPermutations
+
+  '''
+  Test the exact p-value of two separated samples, 2 of the 20 assignments are
+  as extreme as the observed one.
+  '''
+  def test_ExactSeparated(self):
+    u, p = regression.MannWhitneyU([1, 2, 3], [4, 5, 6])
+    self.assertEqual(u, 9)
+    self.assertAlmostEqual(p, 0.1)
+
+  '''
+  Test the exact p-value of two samples with ties.
+  '''
+  def test_ExactTies(self):
+    u, p = regression.MannWhitneyU([1, 2, 2], [2, 3, 4])
+    self.assertEqual(u, 8)
+    self.assertAlmostEqual(p, 0.3)
+
+  '''
+  Test that the normal approximation is close to the exact p-value.
+  '''
+  def test_NormalApproximation(self):
+    x = [1, 2, 3, 4, 5, 6, 7, 8]
+    y = [3.5, 5.5, 6.5, 7.5, 9, 10, 11, 12]
+
+    u, exact = regression.MannWhitneyU(x, y)
+    regression.exactPermutations = 0
+    approximationU, approximation = regression.MannWhitneyU(x, y)
+
+    self.assertEqual(u, approximationU)
+    self.assertAlmostEqual(exact, 0.0281274, 6)
+    self.assertAlmostEqual(approximation, exact, 2)
+
+class CompareSamples_Test(unittest.TestCase):
+
+  '''
+  Test the threshold fallback of samples which are too small for the test.
+  '''
+  def test_ThresholdFallback(self):
+    previous = [1.0, 1.01, 0.99]
+
+    result = regression.CompareSamples(previous, [1.5, 1.52, 1.49])
+    self.assertEqual(result["test"], "threshold")
+    self.assertEqual(result["status"], "regression")
+
+    result = regression.CompareSamples(previous, [1.05, 1.06, 1.04])
+    self.assertEqual(result["test"], "threshold")
+    self.assertEqual(result["status"], "unchanged")
+
+    result = regression.CompareSamples([1.5, 1.52, 1.49], previous)
+    self.assertEqual(result["test"], "threshold")
+    self.assertEqual(result["status"], "improvement")
+
+  '''
+  Test a single runtime of the previous build.
+  '''
+  def test_SingleSample(self):
+    result = regression.CompareSamples([1.0], [2.0, 2.1, 1.9])
+    self.assertEqual(result["test"], "threshold")
+    self.assertEqual(result["status"], "regression")
+    self.assertEqual(result["ci"], None)
+
+  '''
+  Test samples which are large enough for the Mann-Whitney U test.
+  '''
+  def test_MannWhitney(self):
+    result = regression.CompareSamples([1.0, 1.01, 0.99, 1.02, 0.98, 1.0],
+        [1.5, 1.52, 1.49, 1.51, 1.48, 1.5])
+    self.assertEqual(result["test"], "mann-whitney")
+    self.assertEqual(result["status"], "regression")
+    self.assertAlmostEqual(result["ratio"], 1.5)
+
+  '''
+  Test a build without samples.
+  '''
+  def test_Unknown(self):
+    result = regression.CompareSamples([], [1.0])
+    self.assertEqual(result["status"], "unknown")
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,90 @@
+'''
+  @file sandbox_unit_test.py
+  @author Marcus Edel
+
+  Test for the job sandbox.
+'''
+
+import unittest
+
+import os, sys, inspect, shutil, tempfile
+
+
+'''
+Import the util path.
+'''
+util_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if util_subfolder not in sys.path:
+  sys.path.insert(0, util_subfolder)
+
+from sandbox import *
+
+class Sandbox_Test(unittest.TestCase):
+
+  '''
+  Test Initialization, the working directory contains a directory and a file.
+  '''
+  def setUp(self):
+    self.cwd = os.getcwd()
+    self.path = os.path.realpath(tempfile.mkdtemp())
+    os.makedirs(os.path.join(self.path, "datasets"))
+    with open(os.path.join(self.path, "datasets", "iris.csv"), "w") as fid:
+      fid.write("1,2,3\n")
+    with open(os.path.join(self.path, "helper.txt"), "w") as fid:
+      fid.write("helper\n")
+    os.chdir(self.path)
+
+  '''
+  Test Cleanup
+  '''
+  def tearDown(self):
+    os.chdir(self.cwd)
+    shutil.rmtree(self.path)
+
+  '''
+  Test that the directories and files are available in the sandbox.
+  '''
+  def test_Links(self):
+    with Sandbox() as sandbox:
+      self.assertEqual(os.path.realpath(os.getcwd()),
+          os.path.realpath(sandbox.path))
+      with open(os.path.join("datasets", "iris.csv")) as fid:
+        self.assertEqual(fid.read(), "1,2,3\n")
+      with open("helper.txt") as fid:
+        self.assertEqual(fid.read(), "helper\n")
+
+  '''
+  Test that the output files are removed and the working directory and the
+  linked files are restored.
+  '''
+  def test_Cleanup(self):
+    with Sandbox(verbose=True) as sandbox:
+      with open("output.csv", "w") as fid:
+        fid.write("output\n")
+
+    self.assertEqual(os.getcwd(), self.path)
+    self.assertFalse(os.path.exists(sandbox.path))
+    self.assertFalse(os.path.exists(os.path.join(self.path, "output.csv")))
+    self.assertEqual(sandbox.outputs, ["output.csv"])
+    self.assertTrue(os.path.isfile(os.path.join(self.path, "helper.txt")))
+    self.assertTrue(os.path.isfile(os.path.join(self.path, "datasets",
+        "iris.csv")))
+
+  '''
+  Test that the sandbox is removed if the job raises an exception.
+  '''
+  def test_CleanupException(self):
+    sandbox = Sandbox()
+    try:
+      with sandbox:
+        open("output.csv", "w").close()
+        raise ValueError("job failed")
+    except ValueError:
+      pass
+
+    self.assertEqual(os.getcwd(), self.path)
+    self.assertFalse(os.path.exists(sandbox.path))
+
+if __name__ == '__main__':
+  unittest.main()
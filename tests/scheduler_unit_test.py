@@ -0,0 +1,53 @@
+'''
+  @file scheduler_unit_test.py
+  @author Marcus Edel
+
+  Test for the job scheduler.
+'''
+
+import unittest
+
+import os, sys, inspect
+
+
+'''
+Import the util path.
+'''
+util_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if util_subfolder not in sys.path:
+  sys.path.insert(0, util_subfolder)
+
+from scheduler import *
+
+class PartitionCPUs_Test(unittest.TestCase):
+
+  '''
+  Test disjoint cpu sets of equal size.
+  '''
+  def test_Disjoint(self):
+    self.assertEqual(PartitionCPUs([0, 1, 2, 3, 4, 5, 6, 7], 2),
+        [set([0, 1, 2, 3]), set([4, 5, 6, 7])])
+
+  '''
+  Test that the remaining cpus aren't used if the cpus can't be split evenly.
+  '''
+  def test_Remainder(self):
+    self.assertEqual(PartitionCPUs([0, 2, 4, 6, 8], 2),
+        [set([0, 2]), set([4, 6])])
+
+  '''
+  Test that the cpus are shared round-robin if there are more workers than
+  cpus.
+  '''
+  def test_MoreWorkersThanCPUs(self):
+    self.assertEqual(PartitionCPUs([0, 1], 3), [set([0]), set([1]), set([0])])
+
+  '''
+  Test unknown cpus.
+  '''
+  def test_Unknown(self):
+    self.assertEqual(PartitionCPUs(None, 2), [None, None])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,117 @@
+'''
+  @file staging_unit_test.py
+  @author Marcus Edel
+
+  Test for the dataset staging area.
+'''
+
+import unittest
+
+import os, sys, inspect, shutil, tempfile
+
+
+'''
+Import the util path.
+'''
+util_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if util_subfolder not in sys.path:
+  sys.path.insert(0, util_subfolder)
+
+import staging
+
+class DatasetStage_Test(unittest.TestCase):
+
+  '''
+  Test Initialization, the staging area holds two of the datasets. The files
+  are copied, since a hardlink doesn't use the memory of the staging area.
+  '''
+  def setUp(self):
+    self.path = tempfile.mkdtemp()
+    self.datasets = []
+    for name in ["a", "b", "c"]:
+      dataset = os.path.join(self.path, name + ".csv")
+      with open(dataset, "w") as fid:
+        fid.write("1,2,3\n" * 10)
+      self.datasets.append(dataset)
+
+    self.link = os.link
+    os.link = self.NoLink
+    self.stage = staging.DatasetStage(None, 2 * 60)
+
+  '''
+  Test Cleanup
+  '''
+  def tearDown(self):
+    os.link = self.link
+    self.stage.Close()
+    shutil.rmtree(self.path)
+
+  '''
+  Replacement of os.link for a staging area on another filesystem.
+  '''
+  def NoLink(self, source, destination):
+    raise OSError("Invalid cross-device link")
+
+  '''
+  Test that the staged file keeps the content, the modification time and the
+  original location.
+  '''
+  def test_Stage(self):
+    staged = self.stage.Stage(self.datasets[0])
+    self.assertNotEqual(staged, self.datasets[0])
+    with open(staged) as fid:
+      self.assertEqual(fid.read(), "1,2,3\n" * 10)
+    self.assertEqual(os.stat(staged).st_mtime_ns,
+        os.stat(self.datasets[0]).st_mtime_ns)
+    self.assertEqual(staging.SourcePath(staged), self.datasets[0])
+    self.assertEqual(staging.SourcePath(self.datasets[0]), self.datasets[0])
+
+  '''
+  Test that a dataset is staged at the same location again after it was
+  evicted.
+  '''
+  def test_StableLocation(self):
+    staged = self.stage.Stage(self.datasets[0])
+    self.stage.Release(staged)
+    self.stage.Evict(os.path.realpath(self.datasets[0]))
+    self.assertFalse(os.path.exists(staged))
+    self.assertEqual(self.stage.Stage(self.datasets[0]), staged)
+
+  '''
+  Test that the least recently used released dataset is evicted.
+  '''
+  def test_Eviction(self):
+    a, b = self.stage.Stage(self.datasets[:2])
+    self.stage.Release([a, b])
+
+    # Use a again, so b is the least recently used dataset.
+    self.assertEqual(self.stage.Stage(self.datasets[0]), a)
+    self.stage.Release(a)
+
+    c = self.stage.Stage(self.datasets[2])
+    self.assertNotEqual(c, self.datasets[2])
+    self.assertTrue(os.path.isfile(a))
+    self.assertFalse(os.path.exists(b))
+    self.assertEqual(self.stage.size, 2 * 60)
+
+  '''
+  Test that pinned datasets aren't evicted, the dataset that doesn't fit keeps
+  the original location.
+  '''
+  def test_Pinning(self):
+    a, b = self.stage.Stage(self.datasets[:2])
+
+    self.assertEqual(self.stage.Stage(self.datasets[2]), self.datasets[2])
+    self.assertTrue(os.path.isfile(a))
+    self.assertTrue(os.path.isfile(b))
+
+    # A dataset that is used by two jobs stays pinned until both released it.
+    self.assertEqual(self.stage.Stage(self.datasets[0]), a)
+    self.stage.Release([a, b])
+    self.stage.Stage(self.datasets[2])
+    self.assertTrue(os.path.isfile(a))
+    self.assertFalse(os.path.exists(b))
+
+if __name__ == '__main__':
+  unittest.main()
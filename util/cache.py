@@ -0,0 +1,161 @@
+'''
+  @file cache.py
+  @author Marcus Edel
+
+  Implementation of the dataset cache.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from staging import *
+
+import time
+import hashlib
+import tempfile
+
+'''
+This class implements a cache that stores the parsed datasets in the binary
+numpy format. The cached files are memory-mapped, so loading a dataset costs
+almost nothing. Every cached file is identified by the path, the size and the
+modification time of the dataset, so a modified dataset is parsed again. Staged
+dataset files (see staging.DatasetStage) are identified by the original file.
+'''
+class DatasetCache(object):
+
+  # The location of the cached datasets, an empty string disables the cache.
+  # The location is resolved at import time, so the cache stays in place if a
+  # job changes the working directory (e.g. the sandbox).
+  directory = os.environ.get("BENCHMARK_CACHE_DIR", ".cache/datasets")
+  directory = os.path.abspath(directory) if directory else directory
+
+  # Temporary files younger than this number of seconds are kept by Purge(),
+  # since they may be written by a running job.
+  tempGracePeriod = 3600
+
+  '''
+  Get the name prefix of the cached files of the given dataset. The prefix is
+  the same for every delimiter.
+
+  @param dataset - The location of the datasetfile.
+  @return The name prefix of the cached files.
+  '''
+  @staticmethod
+  def Prefix(dataset):
+    dataset = SourcePath(dataset)
+    stat = os.stat(dataset)
+    key = "%s:%d:%d" % (os.path.realpath(dataset), stat.st_size,
+        stat.st_mtime_ns)
+
+    name = os.path.splitext(os.path.basename(dataset))[0]
+    digest = hashlib.sha1(key.encode("UTF-8")).hexdigest()[:16]
+    return name + "_" + digest + "_"
+
+  '''
+  Get the location of the cached file for the given dataset.
+
+  @param dataset - The location of the datasetfile.
+  @param delimiter - The delimiter of the datasetfile.
+  @return The location of the cached file.
+  '''
+  @staticmethod
+  def Path(dataset, delimiter=','):
+    return os.path.join(DatasetCache.directory, DatasetCache.Prefix(dataset) +
+        delimiter.encode("UTF-8").hex() + ".npy")
+
+  '''
+  Load the given dataset from the cache. If the dataset isn't cached, parse
+  the dataset and store the result in the cache.
+
+  @param dataset - The location of the datasetfile.
+  @param delimiter - The delimiter of the datasetfile.
+  @param parse - Function to parse the dataset (dataset, delimiter).
+  @return The memory-mapped dataset.
+  '''
+  @staticmethod
+  def Load(dataset, delimiter, parse):
+    import numpy as np
+
+    if not DatasetCache.directory:
+      return parse(dataset, delimiter)
+
+    path = DatasetCache.Path(dataset, delimiter)
+    if not os.path.isfile(path):
+      data = parse(dataset, delimiter)
+      try:
+        DatasetCache.Save(data, path)
+      except (IOError, OSError) as e:
+        Log.Warn("Could not cache the dataset: " + str(e))
+        return data
+
+    # Use copy-on-write, so the scripts can modify the data without touching
+    # the cached file.
+    return np.load(path, mmap_mode="c")
+
+  '''
+  Store the given data in the cache. The data is written to a temporary file
+  first, so that concurrent jobs never see a partially written file.
+
+  @param data - The data to store.
+  @param path - The location of the cached file.
+  '''
+  @staticmethod
+  def Save(data, path):
+    import numpy as np
+
+    if not os.path.exists(DatasetCache.directory):
+      os.makedirs(DatasetCache.directory)
+
+    fd, temp = tempfile.mkstemp(dir=DatasetCache.directory, suffix=".tmp")
+    try:
+      with os.fdopen(fd, "wb") as fid:
+        np.save(fid, data)
+      os.replace(temp, path)
+    except Exception:
+      os.remove(temp)
+      raise
+
+  '''
+  Remove the cached files. If a list of datasets is given only the cached files
+  that don't belong to one of the datasets are removed, the cached files of
+  every delimiter are kept. Temporary files are only removed if they are older
+  than the grace period.
+
+  @param datasets - List of datasets to keep.
+  @return The number of removed files.
+  '''
+  @staticmethod
+  def Purge(datasets=None):
+    if not DatasetCache.directory or not os.path.isdir(DatasetCache.directory):
+      return 0
+
+    keep = tuple(DatasetCache.Prefix(dataset) for dataset in datasets or []
+        if os.path.isfile(dataset))
+
+    removed = 0
+    for f in os.listdir(DatasetCache.directory):
+      path = os.path.join(DatasetCache.directory, f)
+      try:
+        if f.endswith(".tmp"):
+          age = time.time() - os.path.getmtime(path)
+          if age < DatasetCache.tempGracePeriod:
+            continue
+        elif keep and f.startswith(keep):
+          continue
+
+        os.remove(path)
+      except OSError:
+        # The file was renamed or removed by another process.
+        continue
+      removed += 1
+
+    return removed
@@ -0,0 +1,166 @@
+'''
+  @file catalog.py
+  @author Marcus Edel
+
+  Implementation of the dataset catalog.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from staging import *
+
+import re
+import json
+import hashlib
+import tempfile
+
+'''
+This class implements a catalog that stores the informations of the datasets
+(instances, attributes, size, sparsity, type and content hash). The
+informations are collected in a single pass over the dataset and stored in a
+sidecar file. Every entry is identified by the path, the size and the
+modification time of the dataset, so a modified dataset is scanned again.
+Staged dataset files (see staging.DatasetStage) are identified by the original
+file.
+'''
+class DatasetCatalog(object):
+
+  # The location of the catalog file, resolved at import time, so the catalog
+  # stays in place if a job changes the working directory (e.g. the sandbox).
+  path = os.environ.get("BENCHMARK_CATALOG", ".cache/catalog.json")
+  path = os.path.abspath(path) if path else path
+
+  # The catalog entries, loaded on first use.
+  entries = None
+
+  # Zero values: '0', '0.0', '-0', '.0', '0e5', ... between the delimiters.
+  zeroPattern = re.compile(br"(?<![^,\s])[-+]?(?:0+\.?0*|\.0+)(?:[eE][-+]?\d+)?(?![^,\s])")
+
+  # Characters that only occur in real values.
+  realPattern = re.compile(br"[.eEnN]")
+
+  '''
+  Get the informations of the given dataset file. If there is no valid entry in
+  the catalog, the dataset is scanned and the catalog is updated.
+
+  @param dataset - The location of the datasetfile.
+  @return Dictionary with the instances, attributes, size (in bytes),
+  sparsity, type and hash of the dataset.
+  '''
+  @staticmethod
+  def Info(dataset):
+    if DatasetCatalog.entries is None:
+      DatasetCatalog.entries = DatasetCatalog.Load()
+
+    dataset = SourcePath(dataset)
+    stat = os.stat(dataset)
+    key = os.path.realpath(dataset)
+
+    entry = DatasetCatalog.entries.get(key)
+    if (not entry or entry["size"] != stat.st_size or
+        entry["mtime"] != stat.st_mtime_ns):
+      entry = DatasetCatalog.Scan(dataset)
+      entry["mtime"] = stat.st_mtime_ns
+      DatasetCatalog.entries[key] = entry
+
+      try:
+        DatasetCatalog.Save()
+      except (IOError, OSError) as e:
+        Log.Warn("Could not save the dataset catalog: " + str(e))
+
+    return entry
+
+  '''
+  Scan the given dataset file and collect the informations in a single pass.
+
+  @param dataset - The location of the datasetfile.
+  @param blockSize - The size of the blocks to read.
+  @return Dictionary with the instances, attributes, size (in bytes),
+  sparsity, type and hash of the dataset.
+  '''
+  @staticmethod
+  def Scan(dataset, blockSize=1 << 24):
+    sha = hashlib.sha1()
+    instances = 0
+    attributes = 0
+    zeros = 0
+    real = False
+    size = 0
+    rest = b""
+
+    with open(dataset, "rb") as fid:
+      while True:
+        block = fid.read(blockSize)
+        if not block:
+          # The last line has no newline.
+          lines = rest
+        else:
+          sha.update(block)
+          size += len(block)
+
+          # Analyze only complete lines, the rest is added to the next block.
+          block = rest + block
+          end = block.rfind(b"\n") + 1
+          lines, rest = block[:end], block[end:]
+
+        if lines:
+          if not attributes:
+            # We can handle files with ' ' and ',' as seperator.
+            head = lines.split(b"\n", 1)[0].strip()
+            attributes = max(head.count(b","), head.count(b" ")) + 1
+
+          instances += lines.count(b"\n")
+          if not lines.endswith(b"\n"):
+            instances += 1
+
+          zeros += len(DatasetCatalog.zeroPattern.findall(lines))
+          real = real or DatasetCatalog.realPattern.search(lines) is not None
+
+        if not block:
+          break
+
+    values = instances * attributes
+    return { "instances" : instances,
+             "attributes" : attributes,
+             "size" : size,
+             "sparsity" : float(zeros) / values if values else 0.0,
+             "type" : "real" if real else "integer",
+             "hash" : sha.hexdigest() }
+
+  '''
+  Load the catalog file.
+
+  @return Dictionary with the catalog entries.
+  '''
+  @staticmethod
+  def Load():
+    try:
+      with open(DatasetCatalog.path, "r") as fid:
+        return json.load(fid)
+    except (IOError, OSError, ValueError):
+      return {}
+
+  '''
+  Save the catalog entries. The entries are written to a temporary file first,
+  so that the catalog is never partially written.
+  '''
+  @staticmethod
+  def Save():
+    directory = os.path.dirname(DatasetCatalog.path) or "."
+    if not os.path.exists(directory):
+      os.makedirs(directory)
+
+    fd, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as fid:
+      json.dump(DatasetCatalog.entries, fid, indent=1, sort_keys=True)
+    os.replace(temp, DatasetCatalog.path)
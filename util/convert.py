@@ -15,25 +15,56 @@ if cmd_subfolder not in sys.path:
   sys.path.insert(0, cmd_subfolder)
 
 from log import *
+from catalog import *
 
 import os.path
+import shutil
+import tempfile
 
 '''
-This class implements functions to convert files.
+This class implements functions to convert files. The converted files are
+stored in a content-addressed cache, keyed by the hash of the source dataset
+and the target format, so a dataset is converted only once.
 '''
 class Convert(object):
 
+  # The location of the converted files, an empty string disables the cache.
+  # The location is resolved at import time, so the cache stays in place if a
+  # job changes the working directory (e.g. the sandbox).
+  directory = os.environ.get("BENCHMARK_CONVERT_DIR", ".cache/convert")
+  directory = os.path.abspath(directory) if directory else directory
+
+  # The maximum size of the cache in MB, the least recently used files are
+  # removed first.
+  maxSize = int(os.environ.get("BENCHMARK_CONVERT_SIZE", "4096"))
+
+  # The buffer size used to copy the data.
+  bufferSize = 1 << 24
+
+  # The number of pins created by the current process, see Pin().
+  pins = 0
+
   '''
   Convert the dataset to a file with the given extension.
 
   @param dataset - Convert the specified dataset.
   @param extension - Convert the dataset to a new file with the specified
   extension.
+  @param pin - Pin the cache entry of the converted dataset, so that the entry
+  isn't evicted until the pin is removed with Unpin().
   '''
-  def __init__(self, dataset, extension):
+  def __init__(self, dataset, extension, pin=False):
     self.extension = extension
     self.modifiedDataset = ""
 
+    # True if the modified dataset is stored in the cache and therefore
+    # shouldn't be removed.
+    self.cached = False
+
+    # The pin of the cache entry or None if the entry isn't pinned.
+    self.pin = None
+    self.pinned = pin
+
     self.ModifyDataset(dataset, extension)
 
   '''
@@ -51,11 +82,140 @@ class Convert(object):
     # csv -> arff
     # txt -> arff
     if extension == "arff" and (dataExtension == "csv" or dataExtension == "txt"):
-      self.AddArffHeader(dataset, newDataset)
+      if Convert.directory:
+        self.CachedConvert(dataset, newDataset, self.AddArffHeader)
+      else:
+        self.AddArffHeader(dataset, newDataset)
     else:
       Log.Fatal("No conversion possible.")
       pass
 
+  '''
+  Get the converted dataset from the cache. If the dataset isn't cached, the
+  dataset is converted into the cache.
+
+  @param data - The dataset to convert.
+  @param newData - The name of the converted dataset.
+  @param convert - Function to convert the dataset (data, newData).
+  '''
+  def CachedConvert(self, data, newData, convert):
+    key = DatasetCatalog.Info(data)["hash"] + "." + self.extension
+    entry = os.path.join(Convert.directory, key)
+    path = os.path.join(entry, os.path.basename(newData))
+
+    if not os.path.exists(entry):
+      os.makedirs(entry)
+
+    # Pin the entry before it's used, so that the eviction of other jobs
+    # doesn't remove it.
+    if self.pinned:
+      self.pin = Convert.Pin(entry)
+
+    if os.path.isfile(path):
+      # Mark the entry as recently used.
+      os.utime(entry, None)
+    else:
+      # Convert into a temporary file first, so that concurrent jobs never see
+      # a partially written file.
+      fd, temp = tempfile.mkstemp(dir=entry, suffix=".tmp")
+      os.close(fd)
+      try:
+        convert(data, temp)
+        os.replace(temp, path)
+      except Exception:
+        os.remove(temp)
+        raise
+
+      Convert.Evict(entry)
+
+    self.modifiedDataset = path
+    self.cached = True
+
+  '''
+  Pin the given cache entry. The pin is a file in the entry named by the
+  process id, so the pins of processes that exited are ignored.
+
+  @param entry - The cache entry.
+  @return The location of the pin.
+  '''
+  @staticmethod
+  def Pin(entry):
+    Convert.pins += 1
+    pin = os.path.join(entry, "%d-%d.pin" % (os.getpid(), Convert.pins))
+    open(pin, "w").close()
+    return pin
+
+  '''
+  Remove the given pin.
+
+  @param pin - The location of the pin, see Pin().
+  '''
+  @staticmethod
+  def Unpin(pin):
+    try:
+      os.remove(pin)
+    except OSError:
+      pass
+
+  '''
+  Check if the given cache entry is pinned by a running process.
+
+  @param entry - The cache entry.
+  @return True if the entry is pinned otherwise False.
+  '''
+  @staticmethod
+  def Pinned(entry):
+    try:
+      names = os.listdir(entry)
+    except OSError:
+      return False
+
+    for name in names:
+      if not name.endswith(".pin"):
+        continue
+
+      try:
+        os.kill(int(name.split("-")[0]), 0)
+        return True
+      except ValueError:
+        continue
+      except PermissionError:
+        # The process exists but belongs to another user.
+        return True
+      except OSError:
+        # The process exited without removing the pin.
+        Convert.Unpin(os.path.join(entry, name))
+    return False
+
+  '''
+  Remove the least recently used entries until the cache fits into the maximum
+  size. Pinned entries aren't removed.
+
+  @param keep - The entry which shouldn't be removed.
+  '''
+  @staticmethod
+  def Evict(keep=None):
+    entries = []
+    total = 0
+    for name in os.listdir(Convert.directory):
+      entry = os.path.join(Convert.directory, name)
+      try:
+        size = sum(os.path.getsize(os.path.join(entry, f)) for f in
+            os.listdir(entry))
+        entries.append((os.path.getmtime(entry), size, entry))
+      except OSError:
+        # The entry was removed by another process.
+        continue
+      total += size
+
+    for mtime, size, entry in sorted(entries):
+      if total <= Convert.maxSize * (1 << 20):
+        break
+
+      if entry != keep and not Convert.Pinned(entry):
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
   '''
   Add the arff header to the dataset file.
 
@@ -74,24 +234,17 @@ class Convert(object):
     # We can convert files with ' ' and ',' as seperator.
     count = max(head[0].count(","), head[0].count(" ")) + 1
 
-    # Write the arff header to the new file.
-    nfid = open(newData, "a")
-    nfid.write("@relation " + relationName + "\n\n")
-    for i in range(count):
-      nfid.write("@attribute " + data + "_dim" + str(i) + " NUMERIC\n")
-    nfid.write("\n@data\n")
-
-    # Append the data for the given file to the new arff file.
-    fid = open(data, "r")
-    while True:
-      line = fid.read(65536)
-      if line:
-        nfid.write(line)
-      else:
-        break
-
-    fid.close()
-    nfid.close()
+    # Write the arff header to the new file and stream the data of the given
+    # file to the new arff file.
+    with open(newData, "ab") as nfid:
+      nfid.write(("@relation " + relationName + "\n\n").encode())
+      for i in range(count):
+        nfid.write(("@attribute " + data + "_dim" + str(i) +
+            " NUMERIC\n").encode())
+      nfid.write("\n@data\n".encode())
+
+      with open(data, "rb") as fid:
+        shutil.copyfileobj(fid, nfid, Convert.bufferSize)
 
     # Add the modified datasetname to the list.
     self.modifiedDataset = newData
@@ -17,8 +17,164 @@ try:
 except ImportError:
   pass
 
+from log import *
+
+import json
 import datetime
+import threading
+
+try:
+  import queue
+except ImportError:
+  import Queue as queue
+
+
+'''
+This class implements a background thread that writes the queued records to the
+database. The records are written in batches, every batch is a single
+transaction. If a batch fails, the connection is reopened and the batch is
+written again, if it fails again the records are written one by one and the
+records that can't be written are logged and skipped.
+'''
+class DatabaseWriter(threading.Thread):
+
+  '''
+  Create the writer thread.
+
+  @param db - The database instance used to open the connection.
+  @param batchSize - The maximum number of records of a batch.
+  '''
+  def __init__(self, db, batchSize=1000):
+    threading.Thread.__init__(self)
+    self.daemon = True
+    self.db = db
+    self.batchSize = batchSize
+    self.queue = queue.Queue()
+    self.error = None
+    self.failed = 0
+
+  '''
+  Write the queued records until a None record is received.
+  '''
+  def run(self):
+    # The connection has to be created in the thread that uses the connection.
+    self.con, self.cur = self.db.Connect()
+
+    running = True
+    while running:
+      batch = [self.queue.get()]
+      while len(batch) < self.batchSize:
+        try:
+          batch.append(self.queue.get_nowait())
+        except queue.Empty:
+          break
+
+      if batch[-1] is None:
+        running = False
+        batch.pop()
+
+      if batch:
+        self.WriteBatch(batch)
+
+      for i in range(len(batch) + (0 if running else 1)):
+        self.queue.task_done()
+
+    self.con.close()
+
+  '''
+  Write the given records in a single transaction.
+
+  @param batch - List of (command, values) records.
+  '''
+  def Execute(self, batch):
+    # Group consecutive records with the same command, so that the order of the
+    # records is preserved.
+    with self.con:
+      start = 0
+      for i in range(1, len(batch) + 1):
+        if i == len(batch) or batch[i][0] != batch[start][0]:
+          self.cur.executemany(batch[start][0], [r[1] for r in
+              batch[start:i]])
+          start = i
+
+  '''
+  Write the given records, retry the batch with a new connection and replay
+  the records one by one if the batch still fails.
+
+  @param batch - List of (command, values) records.
+  '''
+  def WriteBatch(self, batch):
+    try:
+      self.Execute(batch)
+      return
+    except Exception as e:
+      Log.Warn("Could not write " + str(len(batch)) + " records, retry: " +
+          str(e))
+
+    # The connection may be lost (e.g. the mysql server closed an idle
+    # connection), so we reconnect before we try again.
+    try:
+      self.con.close()
+    except Exception:
+      pass
 
+    try:
+      self.con, self.cur = self.db.Connect()
+    except Exception as e:
+      # Nothing can be written without a connection.
+      Log.Fatal("Could not reconnect to the database: " + str(e))
+      self.failed += len(batch)
+      self.error = e
+      return
+
+    try:
+      self.Execute(batch)
+      return
+    except Exception:
+      pass
+
+    for record in batch:
+      try:
+        self.Execute([record])
+      except Exception as e:
+        self.failed += 1
+        Log.Fatal("Could not write the record " + record[0] + " " +
+            str(record[1]) + ": " + str(e))
+
+'''
+Split the given metric result into the single metric values.
+
+@param metric - The metric result as json string.
+@return A list with the metric name, value and status ('ok', 'timeout',
+'failure' or 'invalid') of every metric. The value of a timeout is the timeout
+limit.
+'''
+def MetricValues(metric):
+  try:
+    metrics = json.loads(metric)
+  except (TypeError, ValueError):
+    return []
+
+  if not isinstance(metrics, dict):
+    return []
+
+  values = []
+  for name, value in metrics.items():
+    if isinstance(value, bool):
+      values.append((name, None, "invalid"))
+    elif isinstance(value, (int, float)):
+      values.append((name, float(value), "ok"))
+    elif str(value) == "failure":
+      values.append((name, None, "failure"))
+    elif str(value).startswith(">"):
+      try:
+        values.append((name, float(str(value)[1:].strip()), "timeout"))
+      except ValueError:
+        values.append((name, None, "timeout"))
+    else:
+      values.append((name, None, "invalid"))
+
+  return values
 
 '''
 This class implements functions to handle the database.
@@ -33,9 +189,12 @@ class Database:
   @param host - The hostname used for the mysql connection.
   @param user - The username used for the mysql connection.
   @param password - The password used for the mysql connection.
+  @param writeBehind - Queue the result records and write them in batches on a
+  background thread. Call Flush() to wait until the records are written.
   '''
   def __init__(self, driver="sqlite", database="benchmark.db",
-      host="localhost", user=None, password=None, port=3306):
+      host="localhost", user=None, password=None, port=3306,
+      writeBehind=False):
     self.con = None
     self.cur = None
     self.driver = driver
@@ -46,17 +205,102 @@ class Database:
     self.database = database
     self.password = password
     self.driver = driver
-    self.error = 0
 
-    if driver == "mysql":
-      self.con = mdb.connect(host=host, port=port, user=user, db=database, passwd=password)
-      self.cur = self.con.cursor()
-      self.cur.execute('SET FOREIGN_KEY_CHECKS = 0')
+    # Cache for the ids of the libraries, methods and datasets.
+    self.ids = {}
+
+    self.con, self.cur = self.Connect()
 
-    elif driver == "sqlite":
-      self.con = sqlite3.connect(database)
-      self.con.execute('pragma foreign_keys = on')
-      self.cur = self.con.cursor()
+    self.writer = None
+
+    # The number of records that could not be written and were already
+    # reported by Flush().
+    self.reported = 0
+    if writeBehind:
+      if driver == "sqlite":
+        # WAL journaling allows to read the database while the writer thread
+        # writes the records.
+        self.con.execute('pragma journal_mode = WAL')
+
+      self.writer = DatabaseWriter(self)
+      self.writer.start()
+
+  '''
+  Open a new database connection.
+
+  @return The connection and the cursor.
+  '''
+  def Connect(self):
+    if self.driver == "mysql":
+      con = mdb.connect(host=self.host, port=self.port, user=self.user,
+          db=self.database, passwd=self.password)
+      cur = con.cursor()
+      cur.execute('SET FOREIGN_KEY_CHECKS = 0')
+
+    elif self.driver == "sqlite":
+      con = sqlite3.connect(self.database, timeout=60)
+      con.execute('pragma foreign_keys = on')
+      cur = con.cursor()
+
+    return (con, cur)
+
+  '''
+  Write a record. In write-behind mode the record is queued and written by the
+  writer thread.
+
+  @param command - The insert or update command with %s placeholders.
+  @param values - The values of the record.
+  '''
+  def Write(self, command, values):
+    if self.driver == "sqlite":
+      command = command % tuple('?' for v in values)
+
+    if self.writer:
+      self.writer.queue.put((command, values))
+    else:
+      try:
+        with self.con:
+          self.cur.execute(command, values)
+      except Exception:
+        # The connection may be lost (e.g. the mysql server closed an idle
+        # connection), so we reconnect and try again.
+        self.con, self.cur = self.Connect()
+        with self.con:
+          self.cur.execute(command, values)
+
+  '''
+  Wait until all queued records are written to the database. Records that
+  could not be written are reported but don't stop the benchmark, the error is
+  raised by Close().
+  '''
+  def Flush(self):
+    if self.writer:
+      self.writer.queue.join()
+
+      if self.writer.failed > self.reported:
+        Log.Fatal(str(self.writer.failed - self.reported) +
+            " records could not be written.")
+        self.reported = self.writer.failed
+
+  '''
+  Write the queued records and stop the writer thread.
+  '''
+  def Close(self):
+    if self.writer:
+      self.writer.queue.put(None)
+      self.writer.join()
+
+      if self.writer.failed:
+        Log.Warn(str(self.writer.failed) + " records could not be written.")
+
+      error, self.writer = self.writer.error, None
+      if self.driver == "sqlite":
+        # Switch back to the rollback journal, so that the database can be
+        # read without the WAL file (e.g. by sql.js).
+        self.con.execute('pragma journal_mode = DELETE')
+
+      if error:
+        raise error
 
   '''
   Create a new build table.
@@ -104,7 +348,8 @@ class Database:
           size INTEGER NOT NULL,
           attributes INTEGER NOT NULL,
           instances INTEGER NOT NULL,
-          type TEXT NOT NULL
+          type TEXT NOT NULL,
+          hash TEXT
         );
         """
 
@@ -113,6 +358,14 @@ class Database:
     elif self.driver == "sqlite":
       self.con.executescript(comand % "AUTOINCREMENT")
 
+    # Update datasets table schema.
+    try:
+      self.cur.execute("SELECT hash FROM datasets")
+      self.cur.fetchall()
+    except Exception as e:
+      self.cur.execute("ALTER TABLE datasets ADD COLUMN hash TEXT");
+      self.cur.fetchall()
+
   '''
   Create a new methods table.
   '''
@@ -189,6 +442,158 @@ class Database:
     elif self.driver == "sqlite":
       self.con.executescript(comand % "AUTOINCREMENT")
 
+  '''
+  Create a new samples table. Every record holds the measurement of a single
+  trial and the status of the measurement ('warmup', 'rejected' or 'ok').
+  '''
+  def CreateSamplesTable(self):
+    comand = """
+        CREATE TABLE IF NOT EXISTS samples (
+          id INTEGER PRIMARY KEY %s,
+          build_id INTEGER NOT NULL,
+          libary_id INTEGER NOT NULL,
+          dataset_id INTEGER NOT NULL,
+          method_id INTEGER NOT NULL,
+          metric_name VARCHAR(64) NOT NULL,
+          trial INTEGER NOT NULL,
+          value REAL NOT NULL,
+          status VARCHAR(10) NOT NULL DEFAULT 'ok',
+
+          FOREIGN KEY(build_id) REFERENCES builds(id) ON DELETE CASCADE,
+          FOREIGN KEY(libary_id) REFERENCES libraries(id) ON DELETE CASCADE,
+          FOREIGN KEY(dataset_id) REFERENCES datasets(id) ON DELETE CASCADE,
+          FOREIGN KEY(method_id) REFERENCES methods(id) ON DELETE CASCADE
+        );
+        """
+
+    if self.driver == "mysql":
+      self.cur.execute(comand % "AUTO_INCREMENT")
+    elif self.driver == "sqlite":
+      self.con.executescript(comand % "AUTOINCREMENT")
+
+    # Update samples table schema.
+    try:
+      self.cur.execute("SELECT status FROM samples")
+      self.cur.fetchall()
+    except Exception as e:
+      self.cur.execute("ALTER TABLE samples ADD COLUMN status VARCHAR(10) "
+          + "NOT NULL DEFAULT 'ok'");
+      self.cur.fetchall()
+
+  '''
+  Create a new sample statistics table, with the summary of the samples of
+  every metric.
+  '''
+  def CreateSampleStatsTable(self):
+    comand = """
+        CREATE TABLE IF NOT EXISTS sample_stats (
+          id INTEGER PRIMARY KEY %s,
+          build_id INTEGER NOT NULL,
+          libary_id INTEGER NOT NULL,
+          dataset_id INTEGER NOT NULL,
+          method_id INTEGER NOT NULL,
+          metric_name VARCHAR(64) NOT NULL,
+          trials INTEGER NOT NULL,
+          mean REAL NOT NULL,
+          median REAL NOT NULL,
+          std REAL NOT NULL,
+          min REAL NOT NULL,
+          mad REAL NOT NULL,
+          cache VARCHAR(10),
+
+          FOREIGN KEY(build_id) REFERENCES builds(id) ON DELETE CASCADE,
+          FOREIGN KEY(libary_id) REFERENCES libraries(id) ON DELETE CASCADE,
+          FOREIGN KEY(dataset_id) REFERENCES datasets(id) ON DELETE CASCADE,
+          FOREIGN KEY(method_id) REFERENCES methods(id) ON DELETE CASCADE
+        );
+        """
+
+    if self.driver == "mysql":
+      self.cur.execute(comand % "AUTO_INCREMENT")
+    elif self.driver == "sqlite":
+      self.con.executescript(comand % "AUTOINCREMENT")
+
+    # Update sample_stats table schema.
+    try:
+      self.cur.execute("SELECT cache FROM sample_stats")
+      self.cur.fetchall()
+    except Exception as e:
+      self.cur.execute("ALTER TABLE sample_stats ADD COLUMN cache VARCHAR(10)")
+      self.cur.fetchall()
+
+  '''
+  Create a new checkpoints table, with a record for every completed job of a
+  build. The record is written after the results of the job, so a job with a
+  checkpoint has all results in the database.
+  '''
+  def CreateCheckpointsTable(self):
+    comand = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+          id INTEGER PRIMARY KEY %s,
+          build_id INTEGER NOT NULL,
+          libary_id INTEGER NOT NULL,
+          dataset_id INTEGER NOT NULL,
+          method_id INTEGER NOT NULL,
+
+          FOREIGN KEY(build_id) REFERENCES builds(id) ON DELETE CASCADE,
+          FOREIGN KEY(libary_id) REFERENCES libraries(id) ON DELETE CASCADE,
+          FOREIGN KEY(dataset_id) REFERENCES datasets(id) ON DELETE CASCADE,
+          FOREIGN KEY(method_id) REFERENCES methods(id) ON DELETE CASCADE
+        );
+        """
+
+    if self.driver == "mysql":
+      self.cur.execute(comand % "AUTO_INCREMENT")
+    elif self.driver == "sqlite":
+      self.con.executescript(comand % "AUTOINCREMENT")
+
+  '''
+  Create a new metric values table. Every record holds a single value of a
+  metric result, so the values can be filtered and aggregated in SQL.
+
+  @return True if the table was created otherwise False.
+  '''
+  def CreateMetricValuesTable(self):
+    try:
+      self.cur.execute("SELECT id FROM metric_values LIMIT 1")
+      self.cur.fetchall()
+      return False
+    except Exception as e:
+      pass
+
+    comand = """
+        CREATE TABLE IF NOT EXISTS metric_values (
+          id INTEGER PRIMARY KEY %s,
+          result_id INTEGER NOT NULL,
+          metric_name VARCHAR(64) NOT NULL,
+          value REAL,
+          status VARCHAR(10) NOT NULL,
+
+          FOREIGN KEY(result_id) REFERENCES metrics(id) ON DELETE CASCADE
+        );
+        """
+
+    if self.driver == "mysql":
+      self.cur.execute(comand % "AUTO_INCREMENT")
+    elif self.driver == "sqlite":
+      self.con.executescript(comand % "AUTOINCREMENT")
+    return True
+
+  '''
+  Add the metric values of the metric results which were stored before the
+  metric values table existed. This runs once, when the table is created.
+  '''
+  def BackfillMetricValues(self):
+    with self.con:
+      self.cur.execute("SELECT id, metric FROM metrics WHERE metric<>'{}'")
+      records = self.cur.fetchall()
+
+    for resultId, metric in records:
+      for name, value, status in MetricValues(metric):
+        self.Write("INSERT INTO metric_values VALUES (NULL,%s,%s,%s,%s)",
+            (resultId, name, value, status))
+    self.Flush()
+
   '''
   Create a new metric results table
   '''
@@ -258,6 +663,76 @@ class Database:
     elif self.driver == "sqlite":
       self.con.executescript(comand % "AUTOINCREMENT")
 
+  '''
+  Create a new runs table, with a record for every run of the benchmark. The
+  finished timestamp is written at the end of the run, so a run without the
+  timestamp was interrupted.
+  '''
+  def CreateRunsTable(self):
+    comand = """
+        CREATE TABLE IF NOT EXISTS runs (
+          id INTEGER PRIMARY KEY %s,
+          started TIMESTAMP NOT NULL,
+          finished TIMESTAMP NULL
+        );
+        """
+
+    if self.driver == "mysql":
+      self.cur.execute(comand % "AUTO_INCREMENT")
+    elif self.driver == "sqlite":
+      self.con.executescript(comand % "AUTOINCREMENT")
+
+  '''
+  Create a new run_builds table, with a record for every build created by a
+  run.
+  '''
+  def CreateRunBuildsTable(self):
+    comand = """
+        CREATE TABLE IF NOT EXISTS run_builds (
+          id INTEGER PRIMARY KEY %s,
+          run_id INTEGER NOT NULL,
+          build_id INTEGER NOT NULL,
+
+          FOREIGN KEY(run_id) REFERENCES runs(id) ON DELETE CASCADE,
+          FOREIGN KEY(build_id) REFERENCES builds(id) ON DELETE CASCADE
+        );
+        """
+
+    if self.driver == "mysql":
+      self.cur.execute(comand % "AUTO_INCREMENT")
+    elif self.driver == "sqlite":
+      self.con.executescript(comand % "AUTOINCREMENT")
+
+  '''
+  Create the indexes for the lookups of the builds and the results.
+  '''
+  def CreateIndexes(self):
+    indexes = [("builds_libary_build", "builds", "libary_id, build"),
+        ("metric_values_result", "metric_values", "result_id"),
+        ("metric_values_name", "metric_values", "metric_name, status"),
+        ("run_builds_run", "run_builds", "run_id")]
+    for table in ["results", "metrics", "bootstrap", "memory", "samples",
+        "sample_stats", "checkpoints"]:
+      indexes.append((table + "_build_method_dataset", table,
+          "build_id, method_id, dataset_id"))
+
+    # The report views select the results by method and library.
+    for table in ["results", "metrics", "bootstrap"]:
+      indexes.append((table + "_method_library", table,
+          "method_id, libary_id"))
+
+    for name, table, columns in indexes:
+      if self.driver == "mysql":
+        # MySQL has no CREATE INDEX IF NOT EXISTS.
+        try:
+          self.cur.execute("CREATE INDEX " + name + " ON " + table + " ("
+              + columns + ")")
+        except Exception:
+          pass
+      elif self.driver == "sqlite":
+        self.con.execute("CREATE INDEX IF NOT EXISTS " + name + " ON " + table
+            + " (" + columns + ")")
+
   '''
   Create a new build, libraries, datasets and results table.
   '''
@@ -271,6 +746,16 @@ class Database:
     self.CreateMemoryTable()
     self.CreateMethodInfoTable()
     self.CreateMetricBootstrapTable()
+    createdMetricValues = self.CreateMetricValuesTable()
+    self.CreateSamplesTable()
+    self.CreateSampleStatsTable()
+    self.CreateCheckpointsTable()
+    self.CreateRunsTable()
+    self.CreateRunBuildsTable()
+    self.CreateIndexes()
+
+    if createdMetricValues:
+      self.BackfillMetricValues()
 
   '''
   Add a new build record to the builds table.
@@ -303,27 +788,27 @@ class Database:
   @param methodId - The id of the method.
   '''
   def NewMetricResult(self, buildId, libaryId, metric, datasetId, methodId):
-    try:
-      with self.con:
-        command = "INSERT INTO metrics VALUES (NULL,%s,%s,%s,%s,%s)"
+    self.Write("INSERT INTO metrics VALUES (NULL,%s,%s,%s,%s,%s)",
+        (buildId, libaryId, str(metric), datasetId, methodId))
+    self.NewMetricValues(buildId, libaryId, metric, datasetId, methodId)
 
-        if self.driver == "mysql":
-          self.cur.execute(command,
-              (buildId, libaryId, str(metric), datasetId, methodId))
-
-        elif self.driver == "sqlite":
-          self.cur.execute(command % ('?', '?', '?', '?', '?'),
-              (buildId, libaryId, str(metric), datasetId, methodId))
-
-        self.error = 0
-    except Exception:
-      if self.error == 0:
-        self.error = 1
-        self.con = mdb.connect(host=self.host, port=self.port, user=self.user, db=self.database, passwd=self.password)
-        self.cur = self.con.cursor()
-        self.cur.execute('SET FOREIGN_KEY_CHECKS = 0')
+  '''
+  Add the values of the given metric result to the metric values table. The
+  values refer to the latest metric result of the build, library, dataset and
+  method, so they can be queued together with the metric result.
 
-        self.NewMetricResult(buildId, libaryId, metric, datasetId, methodId)
+  @param buildId - The id of the build.
+  @param libaryId - The if ot the library.
+  @param metric - The metric result as json string.
+  @param datasetId - The id of the dataset.
+  @param methodId - The id of the method.
+  '''
+  def NewMetricValues(self, buildId, libaryId, metric, datasetId, methodId):
+    for name, value, status in MetricValues(metric):
+      self.Write("INSERT INTO metric_values VALUES (NULL,(SELECT MAX(id) FROM"
+          + " metrics WHERE build_id=%s AND libary_id=%s AND dataset_id=%s"
+          + " AND method_id=%s),%s,%s,%s)", (buildId, libaryId, datasetId,
+          methodId, name, value, status))
 
   '''
   Add a new metric result record to the bootstrap table.
@@ -334,28 +819,27 @@ class Database:
   @param methodId - The id of the method.
   '''
   def NewBootstrapResult(self, buildId, libaryId, metric, datasetId, methodId):
-    with self.con:
-      command = "INSERT INTO bootstrap VALUES (NULL,%s,%s,%s,%s,%s)"
-
-      if self.driver == "mysql":
-        self.cur.execute(command,
-            (buildId, libaryId, str(metric), datasetId, methodId))
-
-      elif self.driver == "sqlite":
-        self.cur.execute(command % ('?', '?', '?', '?', '?'),
-            (buildId, libaryId, str(metric), datasetId, methodId))
+    self.Write("INSERT INTO bootstrap VALUES (NULL,%s,%s,%s,%s,%s)",
+        (buildId, libaryId, str(metric), datasetId, methodId))
 
   def UpdateMetricResult(self, buildId, libaryId, metric, datasetId, methodId):
+    self.Flush()
     with self.con:
       if self.GetMetricResult(buildId, libaryId, datasetId, methodId):
         self.cur.execute("UPDATE metrics SET metric='" + str(metric) + "'"
             + " WHERE build_id=" + str(buildId) + " AND libary_id="
             + str(libaryId) + " AND dataset_id=" + str(datasetId)
             + " AND method_id=" + str(methodId))
+        self.cur.execute("DELETE FROM metric_values WHERE result_id IN"
+            + " (SELECT id FROM metrics WHERE build_id=" + str(buildId)
+            + " AND libary_id=" + str(libaryId) + " AND dataset_id="
+            + str(datasetId) + " AND method_id=" + str(methodId) + ")")
+        self.NewMetricValues(buildId, libaryId, metric, datasetId, methodId)
       else:
         self.NewMetricResult(buildId, libaryId, metric, datasetId, methodId)
 
   def UpdateBootstrapResult(self, buildId, libaryId, metric, datasetId, methodId):
+    self.Flush()
     with self.con:
       if self.GetBootstrapResult(buildId, libaryId, datasetId, methodId):
         self.cur.execute("UPDATE bootstrap SET metric='" + str(metric) + "'"
@@ -366,6 +850,7 @@ class Database:
         self.NewBootstrapResult(buildId, libaryId, metric, datasetId, methodId)
 
   def GetMetricResult(self, buildId, libaryId, datasetId, methodId):
+    self.Flush()
     try:
       with self.con:
         self.cur.execute("SELECT * FROM metrics WHERE build_id=" + str(buildId)
@@ -376,6 +861,7 @@ class Database:
       return None
 
   def GetBootstrapResult(self, buildId, libaryId, datasetId, methodId):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM bootstrap WHERE build_id=" + str(buildId)
           + " AND libary_id=" + str(libaryId) + " AND dataset_id="
@@ -390,20 +876,23 @@ class Database:
   @param attributes - Attributes count.
   @param instances - Instances count.
   @param datasetType - Type of the dataset.
+  @param datasetHash - The content hash of the dataset.
   @return The id of the new record in the datasets table.
   '''
-  def NewDataset(self, name, size, attributes, instances, datasetType="real"):
+  def NewDataset(self, name, size, attributes, instances, datasetType="real",
+      datasetHash=None):
     with self.con:
-      command = "INSERT INTO datasets VALUES (NULL,%s,%s,%s,%s,%s)"
+      command = ("INSERT INTO datasets (id, name, size, attributes, instances, "
+          + "type, hash) VALUES (NULL,%s,%s,%s,%s,%s,%s)")
 
       if self.driver == "mysql":
         self.cur.execute(command,
-            (name, size, attributes, instances, datasetType))
+            (name, size, attributes, instances, datasetType, datasetHash))
         self.cur.execute("SELECT LAST_INSERT_ID()")
 
       elif self.driver == "sqlite":
-        self.cur.execute(command % ('?', '?', '?', '?', '?'),
-            (name, size, attributes, instances, datasetType))
+        self.cur.execute(command % ('?', '?', '?', '?', '?', '?'),
+            (name, size, attributes, instances, datasetType, datasetHash))
         self.cur.execute("SELECT last_insert_rowid()")
 
       return self.cur.fetchall()[0][0]
@@ -412,12 +901,36 @@ class Database:
   Get the informations of the given dataset.
 
   @param name - The name of the dataset.
-  @return The records.
+  @return The records (id, hash).
   '''
   def GetDataset(self, name):
+    if ("dataset", name) in self.ids:
+      return self.ids[("dataset", name)]
+
     with self.con:
-      self.cur.execute("SELECT id FROM datasets WHERE name='" + name  + "'")
-      return self.cur.fetchall()
+      self.cur.execute("SELECT id, hash FROM datasets WHERE name='" + name
+          + "'")
+      return self.CacheId(("dataset", name), self.cur.fetchall())
+
+  '''
+  Set the content hash of the given dataset.
+
+  @param datasetId - The id of the dataset.
+  @param datasetHash - The content hash of the dataset.
+  '''
+  def UpdateDatasetHash(self, datasetId, datasetHash):
+    for key, value in list(self.ids.items()):
+      if key[0] == "dataset" and value[0][0] == datasetId:
+        del self.ids[key]
+
+    with self.con:
+      command = "UPDATE datasets SET hash=%s WHERE id=%s"
+
+      if self.driver == "mysql":
+        self.cur.execute(command, (datasetHash, datasetId))
+
+      elif self.driver == "sqlite":
+        self.cur.execute(command % ('?', '?'), (datasetHash, datasetId))
 
   '''
   Get the informations of the given build.
@@ -426,6 +939,7 @@ class Database:
   @return The records.
   '''
   def GetBuild(self, id):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM results WHERE build_id=" + str(id))
       return self.cur.fetchall()
@@ -437,9 +951,25 @@ class Database:
   @return The records.
   '''
   def GetLibrary(self, name):
+    if ("library", name) in self.ids:
+      return self.ids[("library", name)]
+
     with self.con:
       self.cur.execute("SELECT id FROM libraries WHERE name='" + name + "'")
-      return self.cur.fetchall()
+      return self.CacheId(("library", name), self.cur.fetchall())
+
+  '''
+  Store the records of an id lookup in the id cache. Empty records aren't
+  stored, since the record may be created later.
+
+  @param key - The key of the lookup.
+  @param records - The records of the lookup.
+  @return The records.
+  '''
+  def CacheId(self, key, records):
+    if records:
+      self.ids[key] = records
+    return records
 
   '''
   Add a new library record to the libraries table.
@@ -472,19 +1002,254 @@ class Database:
   @param methodId - The id of the method.
   '''
   def NewResult(self, buildId, libaryId, time, var, datasetId, methodId):
+    self.Write("INSERT INTO results VALUES (NULL,%s,%s,%s,%s,%s,%s)",
+        (buildId, libaryId, time, var, datasetId, methodId))
+
+  '''
+  Add the measurements of the trials and the summary of the measurements to
+  the samples and sample statistics table.
+
+  @param buildId - The id of the build.
+  @param libaryId - The if ot the library.
+  @param datasetId - The id of the dataset.
+  @param methodId - The id of the method.
+  @param samples - Dictionary with the list of measurements (value, status)
+  for every metric.
+  @param statistics - Dictionary with the summary of the measurements for every
+  metric.
+  @param cache - The page cache mode of the trials ('cold', 'warm' or None).
+  '''
+  def NewSamples(self, buildId, libaryId, datasetId, methodId, samples,
+      statistics, cache=None):
+    for name, values in samples.items():
+      for trial, (value, status) in enumerate(values):
+        self.Write("INSERT INTO samples (id, build_id, libary_id, dataset_id, "
+            + "method_id, metric_name, trial, value, status) VALUES "
+            + "(NULL,%s,%s,%s,%s,%s,%s,%s,%s)", (buildId, libaryId, datasetId,
+            methodId, name, trial, value, status))
+
+    for name, stats in statistics.items():
+      self.Write("INSERT INTO sample_stats (id, build_id, libary_id, " +
+          "dataset_id, method_id, metric_name, trials, mean, median, std, " +
+          "min, mad, cache) VALUES (NULL,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)",
+          (buildId, libaryId, datasetId, methodId, name, stats["trials"],
+          stats["mean"], stats["median"], stats["std"], stats["min"],
+          stats["mad"], cache))
+
+  '''
+  Replace the measurements of the trials and the summary of the measurements
+  in the samples and sample statistics table.
+
+  @param buildId - The id of the build.
+  @param libaryId - The if ot the library.
+  @param datasetId - The id of the dataset.
+  @param methodId - The id of the method.
+  @param samples - Dictionary with the list of measurements (value, status)
+  for every metric.
+  @param statistics - Dictionary with the summary of the measurements for every
+  metric.
+  @param cache - The page cache mode of the trials ('cold', 'warm' or None).
+  '''
+  def UpdateSamples(self, buildId, libaryId, datasetId, methodId, samples,
+      statistics, cache=None):
+    self.Flush()
+    with self.con:
+      for table in ["samples", "sample_stats"]:
+        self.cur.execute("DELETE FROM " + table + " WHERE build_id="
+            + str(buildId) + " AND libary_id=" + str(libaryId)
+            + " AND dataset_id=" + str(datasetId) + " AND method_id="
+            + str(methodId))
+
+    self.NewSamples(buildId, libaryId, datasetId, methodId, samples, statistics,
+        cache)
+
+  '''
+  Add a new checkpoint record for a completed job. The record is queued after
+  the results of the job.
+
+  @param buildId - The id of the build.
+  @param libaryId - The if ot the library.
+  @param datasetId - The id of the dataset.
+  @param methodId - The id of the method.
+  '''
+  def NewCheckpoint(self, buildId, libaryId, datasetId, methodId):
+    self.Write("INSERT INTO checkpoints VALUES (NULL,%s,%s,%s,%s)",
+        (buildId, libaryId, datasetId, methodId))
+
+  '''
+  Add a new run record to the runs table.
+
+  @return The new run id.
+  '''
+  def NewRun(self):
     with self.con:
-      command = "INSERT INTO results VALUES (NULL,%s,%s,%s,%s,%s,%s)"
+      command = "INSERT INTO runs VALUES (NULL,%s,NULL)"
 
       if self.driver == "mysql":
-        self.cur.execute(command,
-            (buildId, libaryId, time, var, datasetId, methodId))
+        self.cur.execute(command, (datetime.datetime.now(),))
         self.cur.execute("SELECT LAST_INSERT_ID()")
 
       elif self.driver == "sqlite":
-        self.cur.execute(command % ('?', '?', '?', '?', '?', '?'),
-            (buildId, libaryId, time, var, datasetId, methodId))
+        self.cur.execute(command % '?', (datetime.datetime.now(),))
+
         self.cur.execute("SELECT last_insert_rowid()")
 
+      return self.cur.fetchall()[0][0]
+
+  '''
+  Add a build to the specified run. The record is written immediately, so an
+  interrupted run knows all of its builds.
+
+  @param runId - The id of the run.
+  @param buildId - The id of the build.
+  '''
+  def NewRunBuild(self, runId, buildId):
+    with self.con:
+      self.cur.execute("INSERT INTO run_builds VALUES (NULL," + str(runId) +
+          "," + str(buildId) + ")")
+
+  '''
+  Mark the specified run as finished, after all results of the run are
+  written.
+
+  @param runId - The id of the run.
+  '''
+  def FinishRun(self, runId):
+    self.Flush()
+    with self.con:
+      command = "UPDATE runs SET finished=%s WHERE id=" + str(runId)
+
+      if self.driver == "mysql":
+        self.cur.execute(command, (datetime.datetime.now(),))
+      elif self.driver == "sqlite":
+        self.cur.execute(command % '?', (datetime.datetime.now(),))
+
+  '''
+  Get the latest run if it was interrupted.
+
+  @return The id of the latest run or None if there is no run or the latest run
+  is finished.
+  '''
+  def GetUnfinishedRun(self):
+    with self.con:
+      self.cur.execute("SELECT id, finished FROM runs ORDER BY id DESC LIMIT 1")
+      res = self.cur.fetchall()
+      if res and res[0][1] is None:
+        return res[0][0]
+      return None
+
+  '''
+  Get the builds of the specified run with at least one completed job. The
+  builds without a checkpoint are not continued.
+
+  @param runId - The id of the run.
+  @return A list with the library name and the build id of every build.
+  '''
+  def GetRunBuilds(self, runId):
+    self.Flush()
+    with self.con:
+      self.cur.execute("SELECT libraries.name, builds.id FROM run_builds" +
+          " JOIN builds ON run_builds.build_id = builds.id" +
+          " JOIN libraries ON builds.libary_id = libraries.id" +
+          " WHERE run_builds.run_id=" + str(runId) +
+          " AND EXISTS (SELECT 1 FROM checkpoints" +
+          " WHERE checkpoints.build_id = builds.id)")
+      return self.cur.fetchall()
+
+  '''
+  Get the completed jobs of the specified builds.
+
+  @param buildIds - List with the build ids.
+  @return A list with the library name, method name, method parameters and
+  dataset name of every completed job.
+  '''
+  def GetCheckpoints(self, buildIds):
+    if not buildIds:
+      return []
+
+    self.Flush()
+    with self.con:
+      self.cur.execute("SELECT libraries.name, methods.name," +
+          " methods.parameters, datasets.name FROM checkpoints" +
+          " JOIN libraries ON checkpoints.libary_id = libraries.id" +
+          " JOIN methods ON checkpoints.method_id = methods.id" +
+          " JOIN datasets ON checkpoints.dataset_id = datasets.id" +
+          " WHERE checkpoints.build_id IN (" +
+          ",".join(str(b) for b in buildIds) + ")")
+      return self.cur.fetchall()
+
+  '''
+  Delete the results of a job without a checkpoint. The results were partially
+  written by an interrupted run. The results of a build without any checkpoint
+  (e.g. a build of a database created before the checkpoints) are never
+  deleted.
+
+  @param buildId - The id of the build.
+  @param libaryId - The if ot the library.
+  @param datasetId - The id of the dataset.
+  @param methodId - The id of the method.
+  '''
+  def DeleteIncompleteResults(self, buildId, libaryId, datasetId, methodId):
+    self.Flush()
+    with self.con:
+      self.cur.execute("SELECT COUNT(*) FROM checkpoints WHERE build_id=" +
+          str(buildId))
+      if not self.cur.fetchall()[0][0]:
+        return
+
+    condition = (" WHERE build_id=" + str(buildId) + " AND libary_id="
+        + str(libaryId) + " AND dataset_id=" + str(datasetId)
+        + " AND method_id=" + str(methodId))
+
+    with self.con:
+      self.cur.execute("DELETE FROM metric_values WHERE result_id IN" +
+          " (SELECT id FROM metrics" + condition + ")")
+      for table in ["results", "metrics", "bootstrap", "samples",
+          "sample_stats"]:
+        self.cur.execute("DELETE FROM " + table + condition)
+
+  '''
+  Get the measurements of the trials of the specified result without the
+  warm-up trials.
+
+  @param buildId - The id of the build.
+  @param libaryId - The if ot the library.
+  @param datasetId - The id of the dataset.
+  @param methodId - The id of the method.
+  @param metricName - The name of the metric.
+  @return A list with the measurements.
+  '''
+  def GetSamples(self, buildId, libaryId, datasetId, methodId,
+      metricName="Runtime"):
+    self.Flush()
+    with self.con:
+      self.cur.execute("SELECT value FROM samples WHERE build_id="
+          + str(buildId) + " AND libary_id=" + str(libaryId)
+          + " AND dataset_id=" + str(datasetId) + " AND method_id="
+          + str(methodId) + " AND metric_name='" + str(metricName) + "'"
+          + " AND status<>'warmup' ORDER BY trial")
+      return [value for (value,) in self.cur.fetchall()]
+
+  '''
+  Get the summary of the measurements of the specified result.
+
+  @param buildId - The id of the build.
+  @param libaryId - The if ot the library.
+  @param datasetId - The id of the dataset.
+  @param methodId - The id of the method.
+  @return A list with the metric name, number of trials, mean, median,
+  standard deviation, minimum and median absolute deviation of every metric.
+  '''
+  def GetSampleStatistics(self, buildId, libaryId, datasetId, methodId):
+    self.Flush()
+    with self.con:
+      self.cur.execute("SELECT metric_name, trials, mean, median, std, min, mad"
+          + " FROM sample_stats WHERE build_id=" + str(buildId)
+          + " AND libary_id=" + str(libaryId) + " AND dataset_id="
+          + str(datasetId) + " AND method_id=" + str(methodId)
+          + " ORDER BY metric_name")
+      return self.cur.fetchall()
+
   '''
   Get the specified result from the results table.
 
@@ -495,6 +1260,7 @@ class Database:
   @return The specified result record.
   '''
   def GetResult(self, buildId, libaryId, datasetId, methodId):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM results WHERE build_id=" + str(buildId)
           + " AND libary_id=" + str(libaryId) + " AND dataset_id="
@@ -513,6 +1279,7 @@ class Database:
   @param methodId - The id of the method.
   '''
   def UpdateResult(self, buildId, libaryId, time, var, datasetId, methodId):
+    self.Flush()
     with self.con:
       if self.GetResult(buildId, libaryId, datasetId, methodId):
         self.cur.execute("UPDATE results SET time=" + str(time) + ",var="
@@ -530,10 +1297,13 @@ class Database:
   @return The records.
   '''
   def GetMethod(self, name, parameters):
-     with self.con:
+    if ("method", name, parameters) in self.ids:
+      return self.ids[("method", name, parameters)]
+
+    with self.con:
       self.cur.execute("SELECT id FROM methods WHERE name='" + name +
           "' AND parameters='" + parameters + "'")
-      return self.cur.fetchall()
+      return self.CacheId(("method", name, parameters), self.cur.fetchall())
 
   '''
   Add a new method record to the methods table.
@@ -558,8 +1328,12 @@ class Database:
       return self.cur.fetchall()[0][0]
 
   def UpdateMethod(self, methodId, alias):
-    self.cur.execute("UPDATE methods SET alias=\'" + alias + "\' WHERE id="
-        + str(methodId))
+    # Skip the update if the alias is already set.
+    if self.ids.get(("alias", methodId)) == alias:
+      return
+
+    self.Write("UPDATE methods SET alias=%s WHERE id=%s", (alias, methodId))
+    self.ids[("alias", methodId)] = alias
 
   '''
   Get the sum of the time column of all build of the given name.
@@ -568,6 +1342,7 @@ class Database:
   @return The sum of the time column if there are records otherwise None.
   '''
   def GetResultsSum(self, name):
+    self.Flush()
     libaryId = self.GetLibrary(name)
     if libaryId:
       libaryId = libaryId[0][0]
@@ -575,16 +1350,13 @@ class Database:
       return None
 
     with self.con:
-      self.cur.execute("SELECT id FROM builds WHERE libary_id=" + str(libaryId)
-          + " ORDER BY build ASC")
-      timeSummed = []
+      self.cur.execute("SELECT builds.id, SUM(results.time) FROM builds LEFT"
+          + " JOIN results ON results.build_id=builds.id WHERE"
+          + " builds.libary_id=" + str(libaryId) + " GROUP BY builds.id"
+          + " ORDER BY builds.build ASC, builds.id ASC")
       res = self.cur.fetchall()
-      for buildId in res:
-        self.cur.execute("SELECT SUM(time) FROM results WHERE build_id=" +
-           str(buildId[0]))
-        timeSummed.append(self.cur.fetchall()[0][0])
     if res:
-      return (buildId[0], timeSummed)
+      return (res[-1][0], [timeSum for buildId, timeSum in res])
     else:
       return None
 
@@ -615,6 +1387,7 @@ class Database:
         return [(-1,)]
 
   def CopyLatestBuildFromLibary(self, buildId, newBuildId):
+    self.Flush()
     self.cur.execute("SELECT * FROM results WHERE build_id=" + str(buildId))
     results = self.cur.fetchall()
     with self.con:
@@ -635,6 +1408,7 @@ class Database:
   @return A list with all methods.
   '''
   def GetAllMethods(self):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM methods ORDER BY name ASC")
       return self.cur.fetchall()
@@ -647,12 +1421,32 @@ class Database:
   @return A list with the results.
   '''
   def GetMethodResultsForLibary(self, buildId, methodId):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM results JOIN datasets ON" +
           " results.dataset_id = datasets.id WHERE build_id=" + str(buildId) +
           " AND method_id=" + str(methodId) + " ORDER BY datasets.name")
       return self.cur.fetchall()
 
+  '''
+  Get the latest result of every library, method and dataset combination.
+
+  @return A list with the library name, method name, method parameters, dataset
+  name, runtime and build timestamp.
+  '''
+  def GetLatestResults(self):
+    self.Flush()
+    with self.con:
+      self.cur.execute("SELECT libraries.name, methods.name," +
+          " methods.parameters, datasets.name, results.time, builds.build" +
+          " FROM results JOIN builds ON results.build_id = builds.id" +
+          " JOIN libraries ON results.libary_id = libraries.id" +
+          " JOIN methods ON results.method_id = methods.id" +
+          " JOIN datasets ON results.dataset_id = datasets.id" +
+          " WHERE results.id IN (SELECT MAX(id) FROM results" +
+          " GROUP BY libary_id, method_id, dataset_id)")
+      return self.cur.fetchall()
+
   '''
   Get the metrics results for the specified method and build id.
 
@@ -661,12 +1455,37 @@ class Database:
   @return A list with the results.
   '''
   def GetMethodMetricResultsForLibrary(self, buildId, methodId):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM metrics JOIN datasets ON" +
           " metrics.dataset_id = datasets.id WHERE build_id=" + str(buildId) +
           " AND method_id=" + str(methodId) + " ORDER BY datasets.name")
       return self.cur.fetchall()
 
+  '''
+  Get the metric values for the specified method and build id.
+
+  @param buildId - The build id.
+  @param methodId - The method id.
+  @param metricName - Only get the values of this metric.
+  @return A list with the dataset name, metric name, value and status.
+  '''
+  def GetMethodMetricValuesForLibrary(self, buildId, methodId, metricName=None):
+    self.Flush()
+    with self.con:
+      command = ("SELECT datasets.name, metric_values.metric_name," +
+          " metric_values.value, metric_values.status FROM metric_values" +
+          " JOIN metrics ON metric_values.result_id = metrics.id" +
+          " JOIN datasets ON metrics.dataset_id = datasets.id" +
+          " WHERE metrics.build_id=" + str(buildId) +
+          " AND metrics.method_id=" + str(methodId))
+      if metricName:
+        command += " AND metric_values.metric_name='" + str(metricName) + "'"
+
+      self.cur.execute(command + " ORDER BY datasets.name," +
+          " metric_values.metric_name")
+      return self.cur.fetchall()
+
   '''
   Get the bootstrap results for the specified method and build id.
 
@@ -675,6 +1494,7 @@ class Database:
   @return A list with the results.
   '''
   def GetMethodBootstrapResultsForLibrary(self, buildId, methodId):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM bootstrap JOIN datasets ON" +
           " bootstrap.dataset_id = datasets.id WHERE build_id=" + str(buildId) +
@@ -689,18 +1509,17 @@ class Database:
   @return The sum of the time column if there are records otherwise None.
   '''
   def GetResultsMethodSum(self, name, methodId):
+    self.Flush()
     libaryId = self.GetLibrary(name)[0][0]
     with self.con:
-      self.cur.execute("SELECT id FROM builds WHERE libary_id=" + str(libaryId)
-          + " ORDER BY build ASC")
-      timeSummed = []
+      self.cur.execute("SELECT builds.id, SUM(results.time) FROM builds LEFT"
+          + " JOIN results ON results.build_id=builds.id AND"
+          + " results.method_id=" + str(methodId) + " WHERE"
+          + " builds.libary_id=" + str(libaryId) + " GROUP BY builds.id"
+          + " ORDER BY builds.build ASC, builds.id ASC")
       res = self.cur.fetchall()
-      for buildId in res:
-        self.cur.execute("SELECT SUM(time) FROM results WHERE build_id=" +
-           str(buildId[0]) + " AND method_id=" + str(methodId))
-        timeSummed.append(self.cur.fetchall()[0][0])
     if res:
-      return (buildId[0], timeSummed)
+      return (res[-1][0], [timeSum for buildId, timeSum in res])
     else:
       return None
 
@@ -714,16 +1533,8 @@ class Database:
   @param memoryInfo - The text for the memory value.
   '''
   def NewMemory(self, buildId, libaryId, methodId, datasetId, memoryInfo):
-     with self.con:
-      command = "INSERT INTO memory VALUES (NULL,%s,%s,%s,%s,%s)"
-
-      if self.driver == "mysql":
-        self.cur.execute(command,
-            (buildId, libaryId, methodId, datasetId, memoryInfo))
-
-      elif self.driver == "sqlite":
-        self.cur.execute(command % ('?', '?', '?', '?', '?'),
-            (buildId, libaryId, methodId, datasetId, memoryInfo))
+    self.Write("INSERT INTO memory VALUES (NULL,%s,%s,%s,%s,%s)",
+        (buildId, libaryId, methodId, datasetId, memoryInfo))
 
   '''
   Update the given memory record in the memory table if the record is available
@@ -736,7 +1547,8 @@ class Database:
   @param memoryInfo - The text for the memory value.
   '''
   def UpdateMemory(self, buildId, libaryId, methodId, datasetId, memoryInfo):
-     with self.con:
+    self.Flush()
+    with self.con:
 
       if self.GetMemoryResults(buildId, libaryId, methodId):
         self.cur.execute("UPDATE memory SET memory_info=\'" + memoryInfo
@@ -755,6 +1567,7 @@ class Database:
   @return The memory informations of the method.
   '''
   def GetMemoryResults(self, buildId, libaryId, methodId):
+    self.Flush()
     with self.con:
       self.cur.execute("SELECT * FROM memory JOIN datasets ON " +
         "memory.dataset_id = datasets.id WHERE libary_id=" + str(libaryId) +
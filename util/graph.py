@@ -23,7 +23,8 @@ import re, collections, simplejson, datetime
 '''
 Generate a bar chart for the metrics with the specified informations.
 
-@param results - Contains the values to plot.
+@param results - Contains the metric values to plot (dataset name, metric name,
+value, status) for every library.
 @param libraries - A list that contains the names of the libraries.
 @param fileName - The filename of the line chart.
 @param bestlib - The name of the library which should be compared with the other
@@ -47,32 +48,32 @@ def GenerateBarChartMetric(results,libraries, fileName, datasetName, bestlib="ml
 
   # Iterate through the data and plot the bar chart.
   for result in results:
-    for i, data in enumerate(result):
-      if data[7] == datasetName:
-        for key, value in simplejson.loads(data[3]).items():
-
-          # The time value.
+    for name, metric, value, status in result:
+      if name == datasetName:
+        # The time value.
+        if status == "ok":
           time = value
+        elif status == "timeout":
+          time = ">" + str(value)
+        else:
+          time = "failure"
 
-          # The name of the dataset.
-          dataset = key
-
-          # Save the timing data for the timing table.
-          if dataset in timingData:
-            timingData[dataset][l] = time
-          else:
-            timingData[dataset] = ['-' for x in range(len(libraries))]
-            timingData[dataset][l] = time
-
-          # We can only plot scalar values so we jump over the other.
-          if time == "failure":
-            failure += 1
-            continue
-          elif str(time).count(">") > 0:
-            timeouts += 1
-            continue
-
-          totalTime += time
+        # Save the timing data for the timing table.
+        if metric in timingData:
+          timingData[metric][l] = time
+        else:
+          timingData[metric] = ['-' for x in range(len(libraries))]
+          timingData[metric][l] = time
+
+        # We can only plot scalar values so we jump over the other.
+        if status == "timeout":
+          timeouts += 1
+          continue
+        elif status != "ok":
+          failure += 1
+          continue
+
+        totalTime += time
     l += 1
 
   timingData = collections.OrderedDict(sorted(timingData.items()))
@@ -6,6 +6,11 @@
 '''
 
 import os
+import hashlib
+
+from log import *
+from cache import *
+from catalog import *
 
 '''
 This function determinate if the given number is a float.
@@ -110,35 +115,40 @@ def FindRightRow(dataMatrix, datasetName, datasetCount):
       return row
 
 '''
-Collect informations for the given dataset.
-F
-@param path - Path to the dataset.
+Collect informations for the given dataset. The informations are taken from the
+dataset catalog, so every dataset file is scanned only once.
+
+@param path - Path to the dataset or a list of dataset files.
 @return Tuple that contains the informations about the given dataset
-(name, size, attributes, instances, type).
+(name, size, attributes, instances, type, hash).
 '''
 def DatasetInfo(path):
-  if not isinstance(path, str):
-    path = path[0]
+  files = [path] if isinstance(path, str) else path
+  path = files[0]
 
   instances = 0
   attributes = 0
   size = 0
   datasetType = "real"
+  datasetHash = None
   name = NormalizeDatasetName(path)
 
   if "." in path:
-    with open(path, "r") as fid:
-      for line in fid:
-        instances += 1
-
-    with open(path, "r") as fid:
-      for line in fid:
-        attributes = line.count(",") + 1
-        break
-
-    size = os.path.getsize(path) / (1 << 20)
-
-  return (name, size, attributes, instances, datasetType)
+    info = DatasetCatalog.Info(path)
+    instances = info["instances"]
+    attributes = info["attributes"]
+    size = info["size"] / (1 << 20)
+    datasetType = info["type"]
+
+    # The hash of a list of datasets covers all files of the list.
+    hashes = [DatasetCatalog.Info(f)["hash"] for f in files if
+        os.path.isfile(f)]
+    if len(hashes) == 1:
+      datasetHash = hashes[0]
+    else:
+      datasetHash = hashlib.sha1("".join(hashes).encode()).hexdigest()
+
+  return (name, size, attributes, instances, datasetType, datasetHash)
 
 '''
 This function removes a given file or list of files.
@@ -187,15 +197,248 @@ def CreateDirectoryStructure(directories):
     if not os.path.exists(directory):
        os.makedirs(directory)
 
+# Datasets which are kept in memory, see WarmDataset().
+warmDatasets = {}
+
+'''
+Get the key to identify the given dataset file in the dataset caches.
+
+@param dataset - The location of the datasetfile.
+@param delimiter - The delimiter of the datasetfile.
+@return Tuple that contains the path, delimiter, size and modification time.
+'''
+def DatasetKey(dataset, delimiter):
+  dataset = SourcePath(dataset)
+  stat = os.stat(dataset)
+  return (os.path.realpath(dataset), delimiter, stat.st_size, stat.st_mtime)
+
+'''
+Keep the given datasets in memory. Processes forked afterwards (e.g. by the
+timeout function) inherit the parsed datasets instead of parsing the files
+again.
+
+@param dataset - Dataset file or a list of dataset files.
+@param delimiter - The delimiter of the dataset files.
+'''
+def WarmDataset(dataset, delimiter=','):
+  import numpy as np
+  if isinstance(dataset, str):
+    dataset = [dataset]
+
+  for data in dataset:
+    if not os.path.isfile(data):
+      continue
+
+    key = DatasetKey(data, delimiter)
+    if key not in warmDatasets:
+      warmDatasets[key] = DatasetCache.Load(data, delimiter, ParseDataset)
+
+'''
+Remove all datasets kept in memory.
+'''
+def ClearDatasetCache():
+  warmDatasets.clear()
+
+'''
+Prepare the page cache for a trial. The cold mode evicts the given dataset
+files and their parsed copies in the dataset cache from the page cache, the
+warm mode reads the files into the page cache.
+
+@param dataset - Dataset file or a list of dataset files.
+@param mode - The cache mode, 'cold' or 'warm'.
+'''
+def PreparePageCache(dataset, mode):
+  if isinstance(dataset, str):
+    dataset = [dataset]
+
+  files = []
+  for data in dataset:
+    if not os.path.isfile(data):
+      continue
+
+    files.append(data)
+    if DatasetCache.directory and os.path.isfile(DatasetCache.Path(data)):
+      files.append(DatasetCache.Path(data))
+
+  for f in files:
+    if mode == "cold":
+      fd = os.open(f, os.O_RDONLY)
+      try:
+        # Dirty pages can't be evicted, so write them first.
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+      finally:
+        os.close(fd)
+    elif mode == "warm":
+      with open(f, "rb") as fid:
+        while fid.read(1 << 24):
+          pass
+
+# Files smaller than this size are parsed with a single process.
+parseChunkSize = 1 << 25
+
+# Output buffer of the dataset parser, the forked workers inherit the buffer and
+# write the parsed rows directly into it.
+parseOutput = None
+
+'''
+Split the given file into chunks. Every chunk starts at the beginning of a line
+and ends after a newline.
+
+@param dataset - The location of the datasetfile.
+@param chunks - The number of chunks.
+@return List of (start, end) byte offsets.
+'''
+def SplitDatasetChunks(dataset, chunks):
+  size = os.path.getsize(dataset)
+  offsets = [0]
+
+  with open(dataset, "rb") as fid:
+    for i in range(1, chunks):
+      fid.seek(max(offsets[-1], (size * i) // chunks))
+      fid.readline()
+      offset = fid.tell()
+      if offset >= size:
+        break
+      if offset > offsets[-1]:
+        offsets.append(offset)
+
+  offsets.append(size)
+  return list(zip(offsets[:-1], offsets[1:]))
+
+'''
+Count the rows and the columns of the given chunk.
+
+@param args - Tuple that contains the dataset, the start and end offset and
+the delimiter.
+@return Tuple that contains the number of rows and columns.
+'''
+def CountDatasetChunk(args):
+  dataset, start, end, delimiter = args
+  with open(dataset, "rb") as fid:
+    fid.seek(start)
+    chunk = fid.read(end - start)
+
+  rows = chunk.count(b"\n")
+  if chunk and not chunk.endswith(b"\n"):
+    rows += 1
+
+  cols = chunk[:chunk.find(b"\n")].count(delimiter.encode()) + 1
+  return (rows, cols)
+
 '''
-Load a given dataset.
+Parse the given chunk and write the rows into the output buffer.
+
+@param args - Tuple that contains the dataset, the start and end offset, the
+first row in the output buffer, the number of rows and the delimiter.
+'''
+def ParseDatasetChunk(args):
+  import numpy as np
+  dataset, start, end, row, rows, delimiter = args
+  with open(dataset, "rb") as fid:
+    fid.seek(start)
+    chunk = fid.read(end - start)
+
+  data = np.loadtxt(chunk.decode().splitlines(), delimiter=delimiter,
+      dtype=parseOutput.dtype, ndmin=2)
+
+  # Blank lines, comments or missing values are handled by genfromtxt.
+  if data.shape != (rows, parseOutput.shape[1]):
+    raise ValueError("Unexpected chunk shape: " + str(data.shape))
+
+  parseOutput[row:row + rows] = data
+
+'''
+Parse the given dataset file. Large files are split at line boundaries into
+chunks, which are parsed in parallel worker processes directly into a
+preallocated shared array. The result is the same as the result of
+numpy.genfromtxt, if a chunk can't be parsed we fall back to genfromtxt.
+
+@param dataset - The location of the datasetfile.
+@param delimiter - The delimiter of the datasetfile (',' or ' '). If None, the
+delimiter is determined from the first line.
+@param dtype - The data type of the parsed dataset (float64 or float32).
+@param processes - The number of worker processes. Default all available cpus.
+@return The parsed dataset.
+'''
+def ParseDataset(dataset, delimiter=',', dtype=None, processes=None):
+  import numpy as np
+  import mmap, multiprocessing
+  global parseOutput
+
+  dtype = np.dtype(np.float64 if dtype is None else dtype)
+
+  if delimiter is None:
+    # We can parse files with ' ' and ',' as seperator.
+    with open(dataset) as fid:
+      line = fid.readline()
+    delimiter = "," if line.count(",") >= line.count(" ") else " "
+
+  if processes is None:
+    if hasattr(os, "sched_getaffinity"):
+      processes = len(os.sched_getaffinity(0))
+    else:
+      processes = multiprocessing.cpu_count()
+
+  size = os.path.getsize(dataset)
+  if size < parseChunkSize:
+    return np.genfromtxt(dataset, delimiter=delimiter, dtype=dtype)
+
+  # Use more chunks than processes to balance the load.
+  processes = max(1, processes)
+  chunks = SplitDatasetChunks(dataset, min(processes * 4,
+      max(processes, size // parseChunkSize)))
+
+  context = multiprocessing.get_context("fork")
+  try:
+    with context.Pool(processes) as pool:
+      counts = pool.map(CountDatasetChunk, [(dataset, start, end, delimiter)
+          for start, end in chunks])
+
+    rows = sum(count[0] for count in counts)
+    cols = counts[0][1]
+    if any(count[1] != cols for count in counts if count[0] > 0):
+      raise ValueError("Inconsistent number of columns.")
+
+    # Anonymous shared memory, the workers are forked afterwards.
+    buf = mmap.mmap(-1, max(1, rows * cols * dtype.itemsize))
+    parseOutput = np.frombuffer(buf, dtype=dtype,
+        count=rows * cols).reshape(rows, cols)
+
+    tasks = []
+    row = 0
+    for (start, end), count in zip(chunks, counts):
+      tasks.append((dataset, start, end, row, count[0], delimiter))
+      row += count[0]
+
+    with context.Pool(processes) as pool:
+      pool.map(ParseDatasetChunk, tasks)
+
+    data = parseOutput
+  except Exception as e:
+    Log.Warn("Parallel parsing failed, use genfromtxt: " + str(e))
+    return np.genfromtxt(dataset, delimiter=delimiter, dtype=dtype)
+  finally:
+    parseOutput = None
+
+  # genfromtxt removes the dimensions of length one.
+  return np.squeeze(data)
+
+'''
+Load a given dataset. The dataset is parsed only once and afterwards loaded
+from the dataset cache.
 
 @param dataset - The location of the datasetfile.
 @ return The loaded dataset.
 '''
 def LoadDataset(dataset, delimiter=','):
-  import numpy as np
-  return np.genfromtxt(dataset, delimiter=delimiter)
+  if warmDatasets:
+    key = DatasetKey(dataset, delimiter)
+    if key in warmDatasets:
+      # Return a copy, so the scripts can't modify the warm dataset.
+      return warmDatasets[key].copy()
+
+  return DatasetCache.Load(dataset, delimiter, ParseDataset)
 
 '''
 Split the train labels from the given train dataset.
@@ -204,9 +447,8 @@ Split the train labels from the given train dataset.
 @return Trainset and the train labels as vector.
 '''
 def SplitTrainData(dataset):
-  import numpy as np
   if dataset:
-    trainData = np.genfromtxt(dataset[0], delimiter=',')
+    trainData = LoadDataset(dataset[0])
     return (trainData[:,:-1], trainData[:, (trainData.shape[1] - 1)])
   else:
     return None
@@ -44,6 +44,11 @@ class Parser(object):
     self.OPTIONS = ''
     self.ALIAS = 'None'
     self.WATCH = ['None']
+    self.WARMUP = 0
+    self.AGGREGATE = 'mean'
+    self.AGGREGATORS = ['mean', 'median', 'trimmed', 'mad']
+    self.CACHE = None
+    self.CACHES = ['cold', 'warm']
 
     try:
       Log.Info("Load config file: " + config, verbose)
@@ -180,12 +185,43 @@ class Parser(object):
       self.KeyWarnMsg("watch")
       watch = self.WATCH
 
+    # The number of discarded trials before the measurement.
+    warmup = attributes.get("warmup", self.WARMUP)
+    Log.Info("Warmup: " + str(warmup), self.verbose)
+
+    # The aggregator of the trials, either for all metrics or a dictionary with
+    # the aggregator of every metric, e.g. {'Runtime': 'median'}.
+    aggregate = attributes.get("aggregate", self.AGGREGATE)
+    Log.Info("Aggregate: " + str(aggregate), self.verbose)
+    for value in (aggregate.values() if isinstance(aggregate, dict) else
+        [aggregate]):
+      if value not in self.AGGREGATORS:
+        Log.Warn("Unknown aggregator [" + str(value) + "], use default value.",
+            self.verbose)
+        aggregate = self.AGGREGATE
+        break
+
+    # The state of the page cache before every trial, 'cold' evicts the
+    # datasets and 'warm' reads the datasets into the page cache.
+    cache = attributes.get("cache", self.CACHE)
+    Log.Info("Cache: " + str(cache), self.verbose)
+    if cache is not None and cache not in self.CACHES:
+      Log.Warn("Unknown cache mode [" + str(cache) + "], use default value.",
+          self.verbose)
+      cache = self.CACHE
+    elif cache == "cold" and not hasattr(os, "posix_fadvise"):
+      Log.Warn("The cold cache mode isn't supported on this platform, use "
+          + "default value.", self.verbose)
+      cache = self.CACHE
+
     # Generate a namedtuple with named fields (methodName, script, format, ...).
     attr = collections.namedtuple("attributes", ["methodName", "script",
-        "format", "datasets", "run", "iteration", "watch"])
+        "format", "datasets", "run", "iteration", "watch", "warmup",
+        "aggregate", "cache"])
 
     # Store all values in the namedtuple.
-    return attr(methodName, script, format, datasets, run, iteration, watch)
+    return attr(methodName, script, format, datasets, run, iteration, watch,
+        warmup, aggregate, cache)
 
   '''
   Show emtpy value error message.
@@ -403,7 +439,8 @@ class Parser(object):
               # The structure of the second dictionary looks like:
               # {'KPCA': d}
               # d = {'-k linear': [('mlpack', ['datasets/circle_data.csv'], 3,
-              # 'methods/mlpack/kernel_pca.py', ['csv', 'txt'])]}
+              # 'methods/mlpack/kernel_pca.py', ['csv', 'txt'], ['metric'],
+              # 'None', ['None'], 0, 'mean', None)]}
               if methodMapping.methodName in streamData:
                 # The main key/value already contains a dictionary with the
                 # given method name as key (e.g. KPCA). In this case we use the
@@ -420,7 +457,8 @@ class Parser(object):
                   t = (libraryMapping.libraryName, dataset["files"],
                     methodMapping.iteration, methodMapping.script,
                     methodMapping.format, methodMapping.run, dataset["alias"],
-                    methodMapping.watch)
+                    methodMapping.watch, methodMapping.warmup,
+                    methodMapping.aggregate, methodMapping.cache)
                   tempDict[dataset["options"]].append(t)
 
                 # This is are new options for the specified method name. So we
@@ -431,7 +469,8 @@ class Parser(object):
                   t = (libraryMapping.libraryName, dataset["files"],
                     methodMapping.iteration, methodMapping.script,
                     methodMapping.format, methodMapping.run, dataset["alias"],
-                    methodMapping.watch)
+                    methodMapping.watch, methodMapping.warmup,
+                    methodMapping.aggregate, methodMapping.cache)
                   tempDict[dataset["options"]] = [t]
 
               # Create the second dictionary if it doesn't exist.
@@ -441,7 +480,8 @@ class Parser(object):
                 t = (libraryMapping.libraryName, dataset["files"],
                   methodMapping.iteration, methodMapping.script,
                   methodMapping.format, methodMapping.run, dataset["alias"],
-                  methodMapping.watch)
+                  methodMapping.watch, methodMapping.warmup,
+                  methodMapping.aggregate, methodMapping.cache)
 
                 # To access the method options we can use the options key.
                 d[dataset["options"]] = [t]
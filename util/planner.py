@@ -0,0 +1,168 @@
+'''
+  @file planner.py
+  @author Marcus Edel
+
+  Plan the benchmark jobs that fit into a time budget.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from stats import *
+
+import datetime
+
+'''
+Parse the given duration.
+
+@param duration - The duration in seconds or with the unit 's', 'm', 'h' or
+'d', e.g. '8h'.
+@return The duration in seconds.
+'''
+def ParseDuration(duration):
+  units = { "s" : 1, "m" : 60, "h" : 3600, "d" : 86400 }
+
+  duration = str(duration).strip().lower()
+  if duration and duration[-1] in units:
+    return float(duration[:-1]) * units[duration[-1]]
+  return float(duration)
+
+'''
+Convert the build timestamp of the database to a datetime object.
+
+@param build - The build timestamp.
+@return The datetime object or None if the timestamp is unknown.
+'''
+def BuildTime(build):
+  if isinstance(build, datetime.datetime):
+    return build
+
+  for timeFormat in ["%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"]:
+    try:
+      return datetime.datetime.strptime(str(build), timeFormat)
+    except ValueError:
+      pass
+  return None
+
+'''
+Estimate the time of a single job.
+
+@param runtime - The runtime of the last measurement, -1 for a timeout and -2
+for a failure.
+@param trials - The number of trials of the job.
+@param timeout - The time until the timeout.
+@return The estimated time in seconds or None if the runtime isn't a number
+(e.g. '-' for a method that wasn't measured).
+'''
+def JobCost(runtime, trials, timeout):
+  try:
+    runtime = float(runtime)
+  except (TypeError, ValueError):
+    return None
+
+  if runtime == -1:
+    # The trials stop after the first timeout.
+    return float(timeout)
+  elif runtime < 0:
+    return 0.0
+  return runtime * trials
+
+'''
+Choose and order the jobs that fit into the time budget. The jobs are
+prioritized in the following order: jobs that were never measured, jobs that
+are affected by the modified files (see the 'changed' flag of the job) and jobs
+whose last measurement is the oldest. The time of the jobs that were never
+measured is the median time of the other jobs of the same library (or of all
+jobs).
+
+@param jobs - List of dictionaries with the job key, the library name, the
+benchmark script, the number of trials, the history key (library, method,
+options, dataset name) and the changed flag, True if the job is affected by
+one of the modified files.
+@param history - Dictionary with the last runtime and build timestamp for
+every history key.
+@param budget - The time budget in seconds.
+@param timeout - The time until the timeout.
+@return List of dictionaries with the job, the estimated time, the reason and
+the projected start time of every selected job in the planned order and the
+list of the skipped jobs.
+'''
+def PlanBudget(jobs, history, budget, timeout):
+  now = datetime.datetime.now()
+  planned = []
+  for job in jobs:
+    entry = { "job" : job, "cost" : None, "age" : None, "reason" : "new" }
+
+    if job["history"] in history:
+      runtime, build = history[job["history"]]
+      entry["cost"] = JobCost(runtime, job["trials"], timeout)
+
+      built = BuildTime(build)
+      if built:
+        entry["age"] = (now - built).total_seconds()
+
+      entry["reason"] = "changed" if job.get("changed") else "age"
+    planned.append(entry)
+
+  # Estimate the time of the new jobs and the jobs without a runtime with the
+  # known jobs.
+  known = [e["cost"] for e in planned if e["cost"] is not None]
+  for entry in planned:
+    if entry["cost"] is None:
+      library = [e["cost"] for e in planned if e["cost"] is not None and
+          e["job"]["library"] == entry["job"]["library"]]
+      entry["cost"] = Median(library or known) if (library or known) else (
+          float(timeout))
+
+  priority = { "new" : 0, "changed" : 1, "age" : 2 }
+  planned.sort(key=lambda e: (priority[e["reason"]], -(e["age"] or 0)))
+
+  # Fill the budget in the order of the priority, jobs that don't fit are
+  # skipped so that smaller jobs can use the rest of the budget.
+  selected, skipped, total = [], [], 0.0
+  for entry in planned:
+    if total + entry["cost"] <= budget:
+      entry["start"] = total
+      total += entry["cost"]
+      selected.append(entry)
+    else:
+      skipped.append(entry)
+
+  return selected, skipped
+
+'''
+Print the projected schedule.
+
+@param selected - The selected jobs.
+@param skipped - The skipped jobs.
+@param budget - The time budget in seconds.
+'''
+def PrintSchedule(selected, skipped, budget):
+  table = [["#", "method", "options", "library", "dataset", "reason",
+      "estimate", "start"]]
+  for i, entry in enumerate(selected):
+    job = entry["job"]
+    table.append([str(i + 1), job["history"][1], job["history"][2] or "-",
+        job["history"][0], job["history"][3], entry["reason"],
+        "{0:.1f}s".format(entry["cost"]), "{0:.1f}s".format(entry["start"])])
+
+  total = sum(e["cost"] for e in selected)
+  Log.Info("Projected schedule: " + str(len(selected)) + " of " +
+      str(len(selected) + len(skipped)) + " jobs, {0:.1f}s of {1:.1f}s.".format(
+      total, budget))
+  Log.PrintTable(table)
+
+  for entry in skipped:
+    job = entry["job"]
+    Log.Warn("Not scheduled: " + " | ".join([job["history"][1],
+        job["history"][0], job["history"][3]]) + " ({0:.1f}s)".format(
+        entry["cost"]))
@@ -0,0 +1,316 @@
+'''
+  @file pool.py
+  @author Marcus Edel
+
+  Implementation of the persistent worker pool.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from loader import *
+from misc import *
+
+import timer
+import multiprocessing
+import multiprocessing.forkserver
+import multiprocessing.util
+
+# The environment variable with the benchmark scripts the forkserver imports
+# before it forks the workers, separated by os.pathsep.
+preloadVariable = "BENCHMARK_POOL_PRELOAD"
+
+# The imported benchmark scripts of the process, keyed by the real path.
+preloadedModules = {}
+
+'''
+Import the given benchmark scripts. Scripts that can't be imported are skipped,
+the worker reports the error when it runs the script.
+
+@param scripts - List with the paths of the benchmark scripts.
+'''
+def PreloadScripts(scripts):
+  for script in scripts:
+    path = os.path.realpath(script)
+    if not script or path in preloadedModules:
+      continue
+
+    try:
+      preloadedModules[path] = Loader.ImportModuleFromPath(path)
+    except Exception:
+      pass
+
+'''
+Reset the peak resident set size of the current process. Only Linux supports
+the reset (see proc(5), /proc/[pid]/clear_refs).
+
+@return True if the peak resident set size was reset otherwise False.
+'''
+def ResetPeakMemory():
+  try:
+    with open("/proc/self/clear_refs", "w") as fid:
+      fid.write("5")
+    return True
+  except (IOError, OSError):
+    return False
+
+'''
+Get the peak resident set size of the current process since the last reset.
+
+@return The peak resident set size in MB or None if it's unknown.
+'''
+def PeakMemory():
+  try:
+    with open("/proc/self/status", "r") as fid:
+      for line in fid:
+        if line.startswith("VmHWM:"):
+          return int(line.split()[1]) / 1024.0
+  except (IOError, OSError, ValueError):
+    pass
+  return None
+
+'''
+Run the jobs of the worker pool in the worker process until the connection is
+closed. The worker keeps the imported scripts, the instance of the last job
+and its datasets, so the trials of a job start warm. The timeout function runs
+the method in the worker itself, the pool enforces the timeout.
+
+@param conn - The connection to the pool.
+'''
+def RunWorker(conn):
+  timer.inlineTimeout = True
+
+  modules = dict(preloadedModules)
+  instanceKey, instance = None, None
+  while True:
+    try:
+      job = conn.recv()
+    except (EOFError, OSError):
+      break
+
+    if job is None:
+      break
+
+    script, className, dataset, timeout, verbose, options, warm, cwd = job
+    try:
+      os.chdir(cwd)
+
+      key = (script, className, str(dataset), timeout, verbose)
+      if key != instanceKey:
+        ClearDatasetCache()
+        path = os.path.realpath(script)
+        if path not in modules:
+          modules[path] = Loader.ImportModuleFromPath(path)
+
+        instanceKey, instance = None, None
+        instance = getattr(modules[path], className)(dataset,
+            timeout=timeout, verbose=verbose)
+        instanceKey = key
+
+        if warm:
+          WarmDataset(dataset)
+      elif not warm:
+        # In the cold mode every trial reads the datasets.
+        ClearDatasetCache()
+
+      peak = ResetPeakMemory()
+      trialTimer = timer.Timer()
+      with trialTimer:
+        result = instance.RunMetrics(options)
+
+      measurements = trialTimer.Measurements()
+      if peak and PeakMemory() is not None:
+        measurements["MaxRSS"] = PeakMemory()
+
+      response = (result, measurements, getattr(instance, "predictions",
+          None))
+    except Exception as e:
+      Log.Fatal("Exception: " + str(e))
+      instanceKey, instance = None, None
+      response = (-1, {}, None)
+
+    try:
+      conn.send(response)
+    except (EOFError, OSError):
+      break
+
+'''
+This class implements a pool of persistent worker processes for the benchmark
+scripts that use the timeout function. Instead of forking a new process for
+every trial, the trials run in a long-lived worker which keeps the imported
+libraries and the parsed datasets. The workers are forked by a forkserver, a
+fresh process which imports the benchmark scripts once, so the workers don't
+inherit the threads and the database connection of the benchmark process.
+Since the jobs are sent to a running worker the job contains the script path,
+the class name and the options instead of a closure. A worker that runs into
+the timeout is killed, a worker is replaced after the specified number of jobs.
+The trials of a job run one after another, so the pool of every process (e.g.
+every job of the scheduler) has a single worker.
+'''
+class WorkerPool(object):
+
+  # The pool of the current process, see Get().
+  pool = None
+
+  # The benchmark scripts the forkserver imports, see Preload().
+  scripts = []
+
+  '''
+  Create the worker pool instance.
+
+  @param recycle - Replace the worker after this number of jobs.
+  '''
+  def __init__(self, recycle=100):
+    self.recycle = max(1, int(recycle))
+    self.pid = os.getpid()
+
+    self.context = multiprocessing.get_context("forkserver")
+    self.context.set_forkserver_preload(["pool"])
+    self.process = None
+    self.conn = None
+    self.jobs = 0
+
+    # Stop the worker before multiprocessing joins the child processes at
+    # exit.
+    multiprocessing.util.Finalize(self, self.Close, exitpriority=10)
+
+  '''
+  Set the benchmark scripts the forkserver imports before it forks the
+  workers. The scripts have to be set before the first worker is started.
+
+  @param scripts - List with the paths of the benchmark scripts.
+  '''
+  @staticmethod
+  def Preload(scripts):
+    WorkerPool.scripts = sorted(set(os.path.realpath(s) for s in scripts if s))
+
+  '''
+  Get the worker pool of the current process. Processes forked by the
+  scheduler can't use the pool of the parent process, so every process
+  creates its own pool.
+
+  @param recycle - Replace the worker after this number of jobs.
+  @return The worker pool instance.
+  '''
+  @staticmethod
+  def Get(recycle=100):
+    pool = WorkerPool.pool
+    if not pool or pool.pid != os.getpid():
+      pool = WorkerPool(recycle)
+      WorkerPool.pool = pool
+    pool.recycle = max(1, int(recycle))
+    return pool
+
+  '''
+  Start a new worker.
+  '''
+  def Start(self):
+    # The forkserver is started with the first worker. The forkserver imports
+    # this module from the util path and the module imports the scripts.
+    environ = dict((key, os.environ.get(key)) for key in [preloadVariable,
+        "PYTHONPATH"])
+    os.environ[preloadVariable] = os.pathsep.join(WorkerPool.scripts)
+    os.environ["PYTHONPATH"] = os.pathsep.join([cmd_subfolder] +
+        ([environ["PYTHONPATH"]] if environ["PYTHONPATH"] else []))
+    try:
+      multiprocessing.forkserver.ensure_running()
+    finally:
+      for key, value in environ.items():
+        if value is None:
+          os.environ.pop(key, None)
+        else:
+          os.environ[key] = value
+
+    self.conn, workerConn = self.context.Pipe()
+    self.process = self.context.Process(target=RunWorker, args=(workerConn,))
+    self.process.start()
+    workerConn.close()
+    self.jobs = 0
+
+  '''
+  Stop the worker, the worker is killed if it doesn't stop in time.
+
+  @param kill - Terminate the worker instead of asking it to stop.
+  '''
+  def Stop(self, kill=False):
+    if not self.process:
+      return
+
+    if not kill:
+      try:
+        self.conn.send(None)
+      except (EOFError, OSError):
+        pass
+      self.process.join(3)
+
+    if self.process.is_alive():
+      self.process.terminate()
+      self.process.join(3)
+      if self.process.is_alive():
+        self.process.kill()
+        self.process.join()
+
+    self.conn.close()
+    self.process, self.conn = None, None
+
+  '''
+  Run the method of the given benchmark script instance in the worker. If the
+  method doesn't finish in time the worker is killed.
+
+  @param instance - The instance of the benchmark script.
+  @param script - The path of the benchmark script.
+  @param options - Extra options for the method.
+  @param warm - Keep the parsed datasets in the worker.
+  @return The return value of the method, dictionary with the measurements of
+  the worker (see timer.Timer) and the predictions of the instance.
+  '''
+  def Run(self, instance, script, options, warm=True):
+    if self.process and self.jobs >= self.recycle:
+      self.Stop()
+    if not self.process:
+      self.Start()
+
+    self.jobs += 1
+    self.conn.send((os.path.abspath(script), type(instance).__name__,
+        instance.dataset, instance.timeout, getattr(instance, "verbose", False),
+        options, warm, os.getcwd()))
+
+    if not self.conn.poll(instance.timeout):
+      self.Stop(kill=True)
+      Log.Warn("Script timed out after " + str(instance.timeout) + " seconds")
+      return (-2, {}, None)
+
+    try:
+      return self.conn.recv()
+    except (EOFError, OSError):
+      Log.Fatal("The worker exited without result.")
+      self.Stop(kill=True)
+      return (-1, {}, None)
+
+  '''
+  Stop the worker of the pool.
+  '''
+  def Close(self):
+    if self.pid == os.getpid():
+      self.Stop()
+
+# The forkserver of the pool imports this module, see WorkerPool.Start(). The
+# workers don't pass the util path to the processes of the scripts.
+if os.environ.get(preloadVariable):
+  PreloadScripts(os.environ.pop(preloadVariable).split(os.pathsep))
+
+  paths = [path for path in os.environ.get("PYTHONPATH", "").split(os.pathsep)
+      if path and path != cmd_subfolder]
+  if paths:
+    os.environ["PYTHONPATH"] = os.pathsep.join(paths)
+  else:
+    os.environ.pop("PYTHONPATH", None)
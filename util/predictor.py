@@ -0,0 +1,98 @@
+'''
+  @file predictor.py
+  @author Marcus Edel
+
+  Implementation of the runtime predictor.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from stats import *
+
+import math
+
+'''
+This class implements a runtime model of a single library and method. The
+model fits the logarithm of the runtime against the logarithm of the dataset
+size (instances x attributes) with the least squares method, so polynomial
+scaling is a straight line. The prediction interval of the model is used to
+decide if a dataset will run into the timeout.
+'''
+class RuntimePredictor(object):
+
+  '''
+  Create the predictor instance.
+
+  @param minPoints - The minimum number of measurements used for a prediction.
+  '''
+  def __init__(self, minPoints=3):
+    self.minPoints = minPoints
+    self.points = []
+
+  '''
+  Add the runtime of a dataset to the model.
+
+  @param size - The size of the dataset (instances x attributes).
+  @param runtime - The runtime in seconds.
+  '''
+  def Add(self, size, runtime):
+    if size > 0 and runtime > 0:
+      self.points.append((math.log(size), math.log(runtime)))
+
+  '''
+  Predict the runtime of a dataset.
+
+  @param size - The size of the dataset (instances x attributes).
+  @return The predicted runtime and the lower bound of the 95% prediction
+  interval in seconds or None if there are not enough measurements.
+  '''
+  def Predict(self, size):
+    n = len(self.points)
+    if n < self.minPoints or size <= 0:
+      return None
+
+    x = [p[0] for p in self.points]
+    y = [p[1] for p in self.points]
+    meanX, meanY = Mean(x), Mean(y)
+
+    sxx = math.fsum((v - meanX) ** 2 for v in x)
+    if sxx == 0:
+      return None
+
+    slope = math.fsum((a - meanX) * (b - meanY) for a, b in zip(x, y)) / sxx
+    intercept = meanY - slope * meanX
+
+    residuals = math.fsum((b - intercept - slope * a) ** 2 for a, b in
+        zip(x, y))
+    s = math.sqrt(residuals / (n - 2)) if n > 2 else float("inf")
+
+    x0 = math.log(size)
+    prediction = intercept + slope * x0
+    error = s * math.sqrt(1 + 1.0 / n + (x0 - meanX) ** 2 / sxx)
+    lower = prediction - TCriticalValue(max(n - 2, 1)) * error
+
+    return math.exp(prediction), math.exp(lower) if lower > -700 else 0.0
+
+  '''
+  Check if the runtime of a dataset exceeds the timeout with high confidence,
+  that is the lower bound of the prediction interval exceeds the timeout.
+
+  @param size - The size of the dataset (instances x attributes).
+  @param timeout - The timeout in seconds.
+  @return The predicted runtime and the lower bound if the dataset should be
+  skipped otherwise None.
+  '''
+  def Skip(self, size, timeout):
+    prediction = self.Predict(size)
+    if prediction and prediction[1] > timeout:
+      return prediction
+    return None
@@ -101,3 +101,153 @@ class Profiler(object):
       time.sleep(0.01)
 
     return memoryTable
+
+  # The hardware events counted with perf stat, None if perf stat is disabled.
+  perfEvents = None
+  # The perf command line.
+  perfBin = None
+  # The file in the working directory of the job with the perf stat output.
+  perfOutput = "perf-stat.csv"
+  # The events which are counted if no other events are specified.
+  perfDefaultEvents = ["instructions", "cycles", "cache-references",
+      "cache-misses", "branches", "branch-misses", "LLC-loads",
+      "LLC-load-misses"]
+
+  '''
+  Enable perf stat for the methods that run an executable. If perf is missing
+  or not permitted to read the counters (see kernel.perf_event_paranoid) perf
+  stat stays disabled.
+
+  @param events - List of hardware events to count or None for the default
+  events.
+  @param perf - Path to the perf binary.
+  @return True if perf stat is enabled otherwise False.
+  '''
+  @staticmethod
+  def EnablePerfStat(events=None, perf=os.environ.get("PERF_BIN", "perf")):
+    import shlex, subprocess, tempfile
+
+    events = events if events else Profiler.perfDefaultEvents
+    if isinstance(events, str):
+      events = [e.strip() for e in events.split(",") if e.strip()]
+    Profiler.perfEvents = None
+
+    fd, output = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    cmd = shlex.split(perf) + ["stat", "-x,", "-o", output, "-e",
+        ",".join(events), "--", "true"]
+    try:
+      subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=False,
+          timeout=60)
+      with open(output, "r") as fid:
+        counters = Profiler.ParsePerfStat(fid.read())
+    except Exception as e:
+      Log.Warn("Could not run perf stat, hardware events are not counted: " +
+          str(e))
+      return False
+    finally:
+      os.remove(output)
+
+    supported = [e for e in events if Profiler.PerfEventName(e) in counters]
+    if not supported:
+      Log.Warn("The hardware events " + ", ".join(events) + " are not " +
+          "supported, hardware events are not counted.")
+      return False
+    elif len(supported) < len(events):
+      Log.Warn("The hardware events " + ", ".join(e for e in events if e not in
+          supported) + " are not supported.")
+
+    Profiler.perfBin = shlex.split(perf)
+    Profiler.perfEvents = supported
+    return True
+
+  '''
+  Prefix the given command with perf stat, if perf stat is enabled. The counter
+  values are written into the perf stat output file in the working directory.
+
+  @param command - Method command line as a list.
+  @return The command line to run.
+  '''
+  @staticmethod
+  def PerfStatCommand(command):
+    if not Profiler.perfEvents:
+      return command
+
+    if os.path.isfile(Profiler.perfOutput):
+      os.remove(Profiler.perfOutput)
+
+    return Profiler.perfBin + ["stat", "-x,", "-o", Profiler.perfOutput, "-e",
+        ",".join(Profiler.perfEvents), "--"] + command
+
+  '''
+  Normalize the name of a perf event, perf adds the modifier (e.g.
+  'instructions:u') and on hybrid cpus the pmu (e.g. 'cpu_core/cycles/').
+
+  @param event - The event name.
+  @return The normalized event name.
+  '''
+  @staticmethod
+  def PerfEventName(event):
+    event = event.strip()
+    if "/" in event:
+      # The pmu event syntax is 'pmu/event/modifiers'.
+      event = event.split("/")[1]
+    return event.split(":")[0]
+
+  '''
+  Parse the perf stat csv output ('value,unit,event,...'). Events that weren't
+  counted are skipped, the values of the same event on different pmus are
+  summed.
+
+  @param data - The perf stat csv output.
+  @return Dictionary with the value of every counted event.
+  '''
+  @staticmethod
+  def ParsePerfStat(data):
+    counters = {}
+    for line in data.splitlines():
+      fields = line.split(",")
+      if line.startswith("#") or len(fields) < 3:
+        continue
+
+      try:
+        value = float(fields[0])
+      except ValueError:
+        # The event is '<not counted>' or '<not supported>'.
+        continue
+
+      event = Profiler.PerfEventName(fields[2])
+      counters[event] = counters.get(event, 0) + value
+    return counters
+
+  '''
+  Read the perf stat output file of the last command and calculate the
+  instructions per cycle and the miss rates.
+
+  @return Dictionary with the IPC, the miss rates and the number of
+  instructions and cycles, empty if perf stat is disabled or failed.
+  '''
+  @staticmethod
+  def PerfStatMetrics():
+    if not Profiler.perfEvents or not os.path.isfile(Profiler.perfOutput):
+      return {}
+
+    with open(Profiler.perfOutput, "r") as fid:
+      counters = Profiler.ParsePerfStat(fid.read())
+    os.remove(Profiler.perfOutput)
+
+    metrics = {}
+    for name, events in [("Instructions", ["instructions"]),
+        ("Cycles", ["cycles"]),
+        ("IPC", ["instructions", "cycles"]),
+        ("CacheMissRate", ["cache-misses", "cache-references"]),
+        ("BranchMissRate", ["branch-misses", "branches"]),
+        ("LLCMissRate", ["LLC-load-misses", "LLC-loads"])]:
+      if not all(e in counters for e in events):
+        continue
+      elif len(events) == 1:
+        metrics[name] = counters[events[0]]
+      elif counters[events[1]] > 0:
+        metrics[name] = counters[events[0]] / counters[events[1]]
+
+    return metrics
@@ -0,0 +1,261 @@
+'''
+  @file regression.py
+  @author Marcus Edel
+
+  Functions to detect runtime regressions between two builds.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from stats import *
+
+import math
+
+'''
+Rank the given values, tied values get the average of their ranks.
+
+@param values - List of numbers.
+@return List with the rank of every value and list with the size of every
+group of tied values.
+'''
+def Rank(values):
+  order = sorted(range(len(values)), key=lambda i: values[i])
+  ranks = [0.0 for v in values]
+  ties = []
+
+  i = 0
+  while i < len(order):
+    j = i
+    while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+      j += 1
+
+    for k in range(i, j + 1):
+      ranks[order[k]] = (i + j) / 2.0 + 1
+    ties.append(j - i + 1)
+    i = j + 1
+
+  return ranks, ties
+
+# Use the exact permutation distribution of the U statistic if the number of
+# permutations is at most this value, otherwise the normal approximation.
+exactPermutations = 50000
+
+'''
+Calculate the binomial coefficient.
+
+@param n - The number of elements.
+@param k - The number of chosen elements.
+@return The number of ways to choose k of n elements.
+'''
+def Binomial(n, k):
+  result = 1
+  for i in range(1, min(k, n - k) + 1):
+    result = result * (n - k + i) // i
+  return result
+
+'''
+Calculate the smallest two-sided p-value the Mann-Whitney U test can reach with
+the given sample sizes.
+
+@param n1 - The size of the first sample.
+@param n2 - The size of the second sample.
+@return The smallest p-value.
+'''
+def MinimumPValue(n1, n2):
+  if n1 < 1 or n2 < 1:
+    return 1.0
+  return min(1.0, 2.0 / Binomial(n1 + n2, n1))
+
+'''
+Perform the two-sided Mann-Whitney U test. For small samples the p-value is
+calculated with the exact permutation distribution of the ranks (which also
+handles ties), for larger samples with the normal approximation including the
+tie and continuity correction.
+
+@param x - The first sample.
+@param y - The second sample.
+@return The U statistic of the second sample and the p-value.
+'''
+def MannWhitneyU(x, y):
+  import itertools
+
+  n1, n2 = len(x), len(y)
+  ranks, ties = Rank(list(x) + list(y))
+
+  u = sum(ranks[n1:]) - n2 * (n2 + 1) / 2.0
+  mean = n1 * n2 / 2.0
+  n = n1 + n2
+
+  if Binomial(n, n2) <= exactPermutations:
+    # Count the assignments of the ranks to the second sample whose U statistic
+    # is at least as extreme as the observed statistic.
+    observed = abs(u - mean) - 1e-9
+    extreme, total = 0, 0
+    for group in itertools.combinations(ranks, n2):
+      total += 1
+      if abs(sum(group) - n2 * (n2 + 1) / 2.0 - mean) >= observed:
+        extreme += 1
+    return u, extreme / float(total)
+
+  tieCorrection = sum(t ** 3 - t for t in ties) / float(n * (n - 1))
+  var = n1 * n2 / 12.0 * ((n + 1) - tieCorrection)
+  if var <= 0:
+    return u, 1.0
+
+  z = (abs(u - mean) - 0.5) / math.sqrt(var)
+  return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+'''
+Calculate the bootstrap percentile confidence interval of the ratio of the
+means of the two samples. All resamples are drawn in a single array operation.
+
+@param x - The first sample.
+@param y - The second sample.
+@param resamples - The number of bootstrap resamples.
+@param confidence - The confidence level of the interval.
+@param seed - The seed of the random number generator.
+@return The lower and upper bound of the interval of mean(y) / mean(x).
+'''
+def BootstrapRatioCI(x, y, resamples=2000, confidence=0.95, seed=0):
+  import numpy as np
+
+  x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+  rng = np.random.default_rng(seed)
+
+  meanX = x[rng.integers(0, len(x), (resamples, len(x)))].mean(axis=1)
+  meanY = y[rng.integers(0, len(y), (resamples, len(y)))].mean(axis=1)
+
+  with np.errstate(divide="ignore", invalid="ignore"):
+    ratio = meanY / meanX
+  ratio = ratio[np.isfinite(ratio)]
+  if not len(ratio):
+    return float("nan"), float("nan")
+
+  alpha = (1 - confidence) / 2.0
+  low, high = np.quantile(ratio, [alpha, 1 - alpha])
+  return float(low), float(high)
+
+'''
+Compare the runtime samples of the previous and the current build. If the
+samples are too small to reach the significance level with the Mann-Whitney U
+test (e.g. 3 vs 3 samples or a previous build with a single runtime), a change
+is reported if all samples of one build are beyond the samples of the other
+build and the ratio of the medians exceeds the threshold.
+
+@param previous - The runtime samples of the previous build.
+@param current - The runtime samples of the current build.
+@param alpha - The significance level.
+@param threshold - The relative difference of the medians for small samples.
+@return Dictionary with the medians, the ratio of the medians, the U statistic,
+the p-value, the effect size (rank-biserial correlation, positive if the current
+build is slower), the confidence interval of the ratio of the means, the test
+('mann-whitney' or 'threshold') and the status ('regression', 'improvement',
+'unchanged' or 'unknown' if a build has no samples).
+'''
+def CompareSamples(previous, current, alpha=0.05, threshold=0.1):
+  result = { "previous" : Median(previous) if previous else None,
+             "current" : Median(current) if current else None,
+             "trials" : [len(previous), len(current)],
+             "ratio" : None,
+             "u" : None,
+             "p" : None,
+             "effect" : None,
+             "ci" : None,
+             "test" : None,
+             "status" : "unknown" }
+
+  if not previous or not current:
+    return result
+
+  if result["previous"] > 0:
+    result["ratio"] = result["current"] / result["previous"]
+
+  u, p = MannWhitneyU(previous, current)
+  result["u"] = u
+  result["p"] = p
+  result["effect"] = 2.0 * u / (len(previous) * len(current)) - 1
+
+  if len(previous) > 1 and len(current) > 1:
+    result["ci"] = list(BootstrapRatioCI(previous, current))
+
+  ratio = result["ratio"]
+  if result["ci"] and MinimumPValue(len(previous), len(current)) < alpha:
+    low, high = result["ci"]
+    result["test"] = "mann-whitney"
+    if p < alpha and low > 1:
+      result["status"] = "regression"
+    elif p < alpha and high < 1:
+      result["status"] = "improvement"
+    else:
+      result["status"] = "unchanged"
+  else:
+    # The test can't reach the significance level.
+    result["test"] = "threshold"
+    if ratio is not None and result["effect"] == 1 and ratio > 1 + threshold:
+      result["status"] = "regression"
+    elif (ratio is not None and result["effect"] == -1 and
+        ratio < 1 - threshold):
+      result["status"] = "improvement"
+    else:
+      result["status"] = "unchanged"
+
+  return result
+
+'''
+Create the summary of the compared results.
+
+@param results - List with the comparison of every method, options, library and
+dataset.
+@return Dictionary with the number of compared results, the number of
+regressions, improvements and unknown results and the results.
+'''
+def RegressionSummary(results):
+  status = [r["status"] for r in results]
+  return { "benchmarks" : len(results),
+           "regressions" : status.count("regression"),
+           "improvements" : status.count("improvement"),
+           "unknown" : status.count("unknown"),
+           "results" : results }
+
+'''
+Create the messages of the summary, one message for every regression and
+improvement and the total. Unknown results are not counted as passed.
+
+@param summary - The summary of the compared results.
+@return List of messages.
+'''
+def RegressionMessages(summary):
+  messages = []
+  for r in summary["results"]:
+    if r["status"] not in ["regression", "improvement", "unknown"]:
+      continue
+
+    message = r["method"]
+    if r["options"]:
+      message += " (" + r["options"] + ")"
+    message += " | " + r["library"] + " | " + r["dataset"]
+
+    if r["status"] == "unknown":
+      # A build without runtime samples, e.g. a timeout or a failure.
+      messages.append(message + " | unknown (no samples)")
+      continue
+
+    messages.append(message +
+        " | {0:.2f} (old) => {1:.2f} (new) | {2} ({3}, p={4:.3g}, "
+        "effect={5:.2f})".format(r["previous"], r["current"], r["status"],
+        r["test"], r["p"], r["effect"]))
+
+  unknown = summary.get("unknown", 0)
+  messages.append("Benchmarks " + str(summary["benchmarks"] -
+      summary["regressions"] - unknown) + " of " + str(summary["benchmarks"]) +
+      " passed" + (", " + str(unknown) + " unknown." if unknown else "."))
+  return messages
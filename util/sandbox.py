@@ -0,0 +1,87 @@
+'''
+  @file sandbox.py
+  @author Marcus Edel
+
+  Implementation of the job sandbox.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+import shutil
+import tempfile
+
+'''
+This class implements a temporary working directory for a single job. The
+benchmark scripts write their output files (e.g. neighbors.csv or gmon.out)
+into the current directory, so jobs that run at the same time would overwrite
+the files of each other. The directories and files of the benchmark directory
+(methods, datasets, config.yaml, ...) are linked into the sandbox, so the
+relative paths of the scripts, the datasets and the helper files stay valid.
+The output files are removed with the sandbox.
+'''
+class Sandbox(object):
+
+  '''
+  Create the sandbox instance.
+
+  @param root - The directory in which the sandbox is created, e.g. '/dev/shm'
+  for a tmpfs. Default the temporary directory of the system.
+  @param verbose - Collect and display the output files of the job.
+  '''
+  def __init__(self, root=None, verbose=False):
+    if root and not os.path.isdir(root):
+      Log.Warn("Sandbox directory " + str(root) + " doesn't exist, use " +
+          tempfile.gettempdir() + ".")
+      root = None
+
+    self.root = root
+    self.verbose = verbose
+    self.path = None
+    self.outputs = []
+
+  '''
+  Create the sandbox and change the working directory.
+  '''
+  def __enter__(self):
+    self.cwd = os.getcwd()
+    self.path = tempfile.mkdtemp(prefix="benchmark-", dir=self.root)
+
+    self.links = set()
+    for entry in os.listdir(self.cwd):
+      source = os.path.join(self.cwd, entry)
+      if os.path.isdir(source) or os.path.isfile(source):
+        os.symlink(source, os.path.join(self.path, entry))
+        self.links.add(entry)
+
+    os.chdir(self.path)
+    return self
+
+  '''
+  Restore the working directory and remove the sandbox. In the verbose mode the
+  output files are collected and displayed first.
+  '''
+  def __exit__(self, type, value, traceback):
+    os.chdir(self.cwd)
+
+    if self.verbose:
+      for top, directories, files in os.walk(self.path):
+        for f in files:
+          output = os.path.relpath(os.path.join(top, f), self.path)
+          if output not in self.links:
+            self.outputs.append(output)
+
+      if self.outputs:
+        Log.Debug("Sandbox outputs: " + ", ".join(sorted(self.outputs)))
+
+    shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,286 @@
+'''
+  @file scheduler.py
+  @author Marcus Edel
+
+  Implementation of the job scheduler.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+import collections
+import multiprocessing
+import multiprocessing.util
+
+try:
+  import queue
+except ImportError:
+  import Queue as queue
+
+'''
+Get the cpus the current process is allowed to run on.
+
+@return Sorted list of cpu ids or None if the platform doesn't support cpu
+affinity.
+'''
+def AvailableCPUs():
+  if hasattr(os, "sched_getaffinity"):
+    return sorted(os.sched_getaffinity(0))
+  return None
+
+'''
+Partition the given cpus into the specified number of disjoint sets. If there
+are more workers than cpus, the cpus are shared round-robin.
+
+@param cpus - List of cpu ids.
+@param workers - Number of cpu sets.
+@return List with a cpu set for every worker or a list of None values if the
+cpus are unknown.
+'''
+def PartitionCPUs(cpus, workers):
+  if not cpus:
+    return [None for x in range(workers)]
+
+  if workers >= len(cpus):
+    return [set([cpus[i % len(cpus)]]) for i in range(workers)]
+
+  size = len(cpus) // workers
+  return [set(cpus[i * size:(i + 1) * size]) for i in range(workers)]
+
+'''
+Run the jobs of the scheduler in the worker process until the scheduler stops
+the worker. The worker is pinned to its set of cpus and sends the result of
+every job back to the scheduler.
+
+@param tasks - Queue with the jobs of the worker.
+@param results - Queue to send the results.
+@param slot - The slot of the worker.
+@param cpus - Pin the worker to this set of cpus.
+'''
+def RunJobs(tasks, results, slot, cpus):
+  if cpus and hasattr(os, "sched_setaffinity"):
+    try:
+      os.sched_setaffinity(0, cpus)
+    except OSError as e:
+      Log.Warn("Could not set the cpu affinity: " + str(e))
+
+  while True:
+    job = tasks.get()
+    if job is None:
+      break
+
+    key, target, args = job
+    try:
+      result = target(*args)
+    except Exception as e:
+      Log.Fatal("Exception: " + str(e))
+      result = None
+
+    results.put((slot, key, result))
+
+'''
+This class implements a scheduler that runs independent jobs in a pool of
+persistent worker processes. Every worker is pinned to its own set of cpus. The
+workers are forked when the scheduler is created, so the scheduler has to be
+created before the process starts other threads (e.g. the write-behind thread
+of the database). A job is prepared (e.g. the datasets are converted and
+staged) in the scheduler process when a worker is free and released when the
+job has finished, so only the resources of the running jobs are held.
+'''
+class Scheduler(object):
+
+  '''
+  Create the scheduler instance and start the workers.
+
+  @param jobs - The number of jobs that run at the same time.
+  @param cpus - List of cpu ids to distribute over the workers. Default all
+  cpus the process is allowed to run on.
+  @param prepare - Function (key, args) called before the job is sent to a
+  worker, the function can modify the arguments of the job.
+  @param release - Function (key, args) called after the job has finished.
+  '''
+  def __init__(self, jobs=1, cpus=None, prepare=None, release=None):
+    self.jobs = max(1, int(jobs))
+    self.cpuSets = PartitionCPUs(cpus if cpus else AvailableCPUs(), self.jobs)
+    self.prepare = prepare
+    self.release = release
+
+    # The workers are forked, so they inherit the imported modules and the job
+    # functions are sent by reference.
+    self.context = multiprocessing.get_context("fork")
+    self.queue = self.context.Queue()
+
+    self.pending = collections.OrderedDict()
+    self.running = {}
+    self.results = {}
+
+    self.workers = {}
+    for slot in range(self.jobs):
+      tasks = self.context.SimpleQueue()
+      p = self.context.Process(target=RunJobs, args=(tasks, self.queue, slot,
+          self.cpuSets[slot]))
+      p.start()
+      self.workers[slot] = (p, tasks)
+
+    # Stop the workers before multiprocessing joins the child processes at
+    # exit.
+    multiprocessing.util.Finalize(self, self.Close, exitpriority=10)
+
+  '''
+  Add a new job to the scheduler.
+
+  @param key - The unique key of the job.
+  @param target - The module level function to call.
+  @param args - The arguments for the function.
+  '''
+  def Submit(self, key, target, *args):
+    self.pending[key] = (target, args)
+    self.Start()
+
+  '''
+  Prepare the pending jobs and send them to the free workers.
+  '''
+  def Start(self):
+    for slot in sorted(self.workers):
+      while self.pending and slot not in self.running:
+        key, (target, args) = self.pending.popitem(last=False)
+
+        try:
+          if self.prepare:
+            self.prepare(key, args)
+          self.workers[slot][1].put((key, target, args))
+        except Exception as e:
+          Log.Fatal("Could not start the job " + str(key) + ": " + str(e))
+          self.Finish(key, args, None)
+          continue
+
+        self.running[slot] = (key, args)
+
+  '''
+  Store the result of the job and release the job.
+
+  @param key - The key of the job.
+  @param args - The arguments of the job.
+  @param result - The result of the job.
+  '''
+  def Finish(self, key, args, result):
+    self.results[key] = result
+    if self.release:
+      try:
+        self.release(key, args)
+      except Exception as e:
+        Log.Warn("Could not release the job " + str(key) + ": " + str(e))
+
+  '''
+  Collect the result of a finished job.
+
+  @param timeout - The time to wait for a result.
+  @return True if a result was collected otherwise False.
+  '''
+  def Collect(self, timeout):
+    try:
+      slot, key, result = self.queue.get(timeout=timeout)
+    except queue.Empty:
+      return False
+
+    if slot in self.running and self.running[slot][0] == key:
+      self.Finish(key, self.running.pop(slot)[1], result)
+    return True
+
+  '''
+  Collect the results of the finished jobs and start the pending jobs.
+
+  @param timeout - The time to wait for a result.
+  '''
+  def Poll(self, timeout=1):
+    self.Collect(timeout)
+
+    # A worker that died (e.g. killed by the OOM killer) fails its job. The
+    # worker isn't replaced, since the scheduler process may run threads.
+    for slot, (p, tasks) in list(self.workers.items()):
+      if p.is_alive():
+        continue
+
+      # The result is in the pipe before the process exits, so drain the
+      # queue before we decide the job failed.
+      while self.Collect(0.1):
+        pass
+
+      if slot in self.running:
+        key, args = self.running.pop(slot)
+        Log.Fatal("Job " + str(key) + " exited without result.")
+        self.Finish(key, args, None)
+
+      p.join()
+      del self.workers[slot]
+
+    if not self.workers and self.pending:
+      Log.Fatal("No worker left, " + str(len(self.pending)) + " jobs failed.")
+      for key in self.pending:
+        self.results[key] = None
+      self.pending.clear()
+
+    self.Start()
+
+  '''
+  Cancel the specified job if it hasn't started yet. Running jobs aren't
+  terminated, since the benchmark scripts fork their own processes.
+
+  @param key - The key of the job.
+  @return True if the job was cancelled otherwise False.
+  '''
+  def Cancel(self, key):
+    return self.pending.pop(key, None) is not None
+
+  '''
+  Return the result of the specified job. Block until the job has finished.
+
+  @param key - The key of the job.
+  @return The return value of the job or None if the job failed.
+  '''
+  def Result(self, key):
+    while key not in self.results:
+      if key not in self.pending and not any(key == k for k, args in
+          self.running.values()):
+        return None
+      self.Poll()
+
+    return self.results[key]
+
+  '''
+  Wait until all submitted jobs have finished.
+  '''
+  def Wait(self):
+    while self.pending or self.running:
+      self.Poll()
+
+  '''
+  Cancel the pending jobs, wait for the running jobs and stop the workers.
+  '''
+  def Close(self):
+    self.pending.clear()
+    while self.running and self.workers:
+      self.Poll()
+
+    for p, tasks in self.workers.values():
+      try:
+        tasks.put(None)
+      except (EOFError, OSError):
+        pass
+
+    for p, tasks in self.workers.values():
+      p.join(3)
+      if p.is_alive():
+        p.terminate()
+        p.join()
+    self.workers.clear()
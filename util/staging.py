@@ -0,0 +1,210 @@
+'''
+  @file staging.py
+  @author Marcus Edel
+
+  Implementation of the dataset staging area.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+import shutil
+import hashlib
+import tempfile
+import collections
+
+'''
+Parse the given memory size.
+
+@param size - The size in bytes or with the unit 'K', 'M', 'G' or 'T', e.g.
+'4G'.
+@return The size in bytes.
+'''
+def ParseSize(size):
+  units = { "k" : 1 << 10, "m" : 1 << 20, "g" : 1 << 30, "t" : 1 << 40 }
+
+  size = str(size).strip().lower().rstrip("b")
+  if size and size[-1] in units:
+    return int(float(size[:-1]) * units[size[-1]])
+  return int(float(size))
+
+# The file next to a staged file that contains the location of the original
+# dataset file.
+sourceName = ".source"
+
+'''
+Get the location of the original dataset file of a staged file. The dataset
+cache and the catalog identify the datasets by the original file, so the
+staged copies share their entries.
+
+@param dataset - The location of the dataset file.
+@return The location of the original dataset file or the given location if
+the file isn't staged.
+'''
+def SourcePath(dataset):
+  marker = os.path.join(os.path.dirname(dataset), sourceName)
+  if not os.path.isfile(marker):
+    return dataset
+
+  try:
+    with open(marker, "r") as fid:
+      source = fid.read()
+  except (IOError, OSError):
+    return dataset
+  return source if os.path.isfile(source) else dataset
+
+'''
+This class implements a staging area for the dataset files in a RAM-backed
+directory (e.g. '/dev/shm'), so the timed runs don't pay the disk-read cost
+that varies with the state of the page cache. The staged files are reused by
+all jobs and trials of a dataset. If the staged files exceed the memory limit
+the least recently used files are evicted, files which are used by a job that
+hasn't finished are never evicted.
+'''
+class DatasetStage(object):
+
+  '''
+  Create the staging area.
+
+  @param root - The directory in which the staging area is created.
+  @param capacity - The maximum size of the staged files in bytes.
+  '''
+  def __init__(self, root, capacity):
+    if root and not os.path.isdir(root):
+      Log.Warn("Staging directory " + str(root) + " doesn't exist, use " +
+          tempfile.gettempdir() + ".")
+      root = None
+
+    self.path = tempfile.mkdtemp(prefix="benchmark-stage-", dir=root)
+    self.capacity = capacity
+    self.size = 0
+
+    # The staged files in the order of the last use, the least recently used
+    # file first.
+    self.entries = collections.OrderedDict()
+
+  '''
+  Stage the given dataset files.
+
+  @param dataset - A single dataset file or a list of dataset files.
+  @return The location of the staged dataset files, files that can't be staged
+  keep the original location.
+  '''
+  def Stage(self, dataset):
+    if isinstance(dataset, str):
+      return self.StageFile(dataset)
+    return [self.StageFile(f) for f in dataset]
+
+  '''
+  Release the given staged dataset files, so that they can be evicted.
+
+  @param dataset - The staged dataset files returned by Stage().
+  '''
+  def Release(self, dataset):
+    if isinstance(dataset, str):
+      dataset = [dataset]
+
+    for entry in self.entries.values():
+      if entry["path"] in dataset and entry["pins"] > 0:
+        entry["pins"] -= 1
+
+  '''
+  Stage a single dataset file. The file is hardlinked if it's on the same
+  filesystem otherwise the file is copied with the modification time of the
+  original file. Every dataset file is staged in a directory named by the hash
+  of the original location, so a dataset is staged at the same location again
+  after it was evicted.
+
+  @param dataset - The location of the dataset file.
+  @return The location of the staged file or the original location.
+  '''
+  def StageFile(self, dataset):
+    if not os.path.isfile(dataset):
+      return dataset
+
+    key = os.path.realpath(dataset)
+    stat = os.stat(key)
+
+    entry = self.entries.get(key)
+    if entry and entry["mtime"] == stat.st_mtime_ns:
+      self.entries.move_to_end(key)
+      entry["pins"] += 1
+      return entry["path"]
+    elif entry and not entry["pins"]:
+      # The dataset was modified since it was staged.
+      self.Evict(key)
+    elif entry:
+      return dataset
+
+    digest = hashlib.sha1(key.encode("UTF-8")).hexdigest()[:16]
+    directory = os.path.join(self.path, digest)
+    path = os.path.join(directory, os.path.basename(dataset))
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, sourceName), "w") as fid:
+      fid.write(key)
+
+    try:
+      # A hardlink shares the memory of the original file.
+      os.link(key, path)
+      size = 0
+    except OSError:
+      size = stat.st_size
+      if not self.Reserve(size):
+        Log.Warn("Could not stage " + dataset + ", the staging area is full.")
+        shutil.rmtree(directory, ignore_errors=True)
+        return dataset
+
+      shutil.copy2(key, path)
+
+    self.entries[key] = { "path" : path, "size" : size,
+        "mtime" : stat.st_mtime_ns, "pins" : 1 }
+    self.size += size
+    return path
+
+  '''
+  Evict the least recently used files until there is enough space for the
+  given number of bytes.
+
+  @param size - The number of bytes.
+  @return True if there is enough space otherwise False.
+  '''
+  def Reserve(self, size):
+    if size > self.capacity:
+      return False
+
+    for key in list(self.entries.keys()):
+      if self.size + size <= self.capacity:
+        break
+      if not self.entries[key]["pins"]:
+        self.Evict(key)
+
+    return self.size + size <= self.capacity
+
+  '''
+  Remove the staged file of the given dataset.
+
+  @param key - The real path of the dataset file.
+  '''
+  def Evict(self, key):
+    entry = self.entries.pop(key)
+    self.size -= entry["size"]
+    shutil.rmtree(os.path.dirname(entry["path"]), ignore_errors=True)
+
+  '''
+  Remove the staging area.
+  '''
+  def Close(self):
+    shutil.rmtree(self.path, ignore_errors=True)
+    self.entries.clear()
+    self.size = 0
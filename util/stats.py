@@ -0,0 +1,275 @@
+'''
+  @file stats.py
+  @author Marcus Edel
+
+  Functions to summarize the measurements of the trials.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+import math
+
+'''
+Calculate the arithmetic mean of the given values.
+
+@param values - List of numbers.
+@return The mean of the values.
+'''
+def Mean(values):
+  return math.fsum(values) / len(values)
+
+'''
+Calculate the median of the given values.
+
+@param values - List of numbers.
+@return The median of the values.
+'''
+def Median(values):
+  values = sorted(values)
+  n = len(values)
+  if n % 2:
+    return float(values[n // 2])
+  return (values[n // 2 - 1] + values[n // 2]) / 2.0
+
+'''
+Calculate the sample standard deviation of the given values.
+
+@param values - List of numbers.
+@return The standard deviation of the values or 0 for a single value.
+'''
+def StandardDeviation(values):
+  if len(values) < 2:
+    return 0.0
+
+  mean = Mean(values)
+  return math.sqrt(math.fsum((v - mean) ** 2 for v in values) /
+      (len(values) - 1))
+
+'''
+Calculate the median absolute deviation of the given values.
+
+@param values - List of numbers.
+@return The median absolute deviation of the values.
+'''
+def MedianAbsoluteDeviation(values):
+  median = Median(values)
+  return Median([abs(v - median) for v in values])
+
+# The two-sided 95% critical values of the t-distribution for the given degrees
+# of freedom, larger degrees of freedom use the next smaller entry.
+tTable = [(1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (5, 2.571),
+    (6, 2.447), (7, 2.365), (8, 2.306), (9, 2.262), (10, 2.228), (11, 2.201),
+    (12, 2.179), (13, 2.160), (14, 2.145), (15, 2.131), (16, 2.120),
+    (17, 2.110), (18, 2.101), (19, 2.093), (20, 2.086), (21, 2.080),
+    (22, 2.074), (23, 2.069), (24, 2.064), (25, 2.060), (26, 2.056),
+    (27, 2.052), (28, 2.048), (29, 2.045), (30, 2.042), (40, 2.021),
+    (60, 2.000), (120, 1.980)]
+
+'''
+Get the two-sided 95% critical value of the t-distribution.
+
+@param df - The degrees of freedom.
+@return The critical value.
+'''
+def TCriticalValue(df):
+  if df > tTable[-1][0]:
+    return 1.960
+
+  value = tTable[0][1]
+  for d, t in tTable:
+    if d > df:
+      break
+    value = t
+  return value
+
+'''
+Calculate the half-width of the 95% confidence interval of the mean relative
+to the mean.
+
+@param values - List of numbers.
+@return The relative half-width or infinity if there are less than two values.
+'''
+def RelativeHalfWidth(values):
+  if len(values) < 2:
+    return float("inf")
+
+  mean = Mean(values)
+  halfWidth = TCriticalValue(len(values) - 1) * StandardDeviation(values) / (
+      math.sqrt(len(values)))
+
+  if mean == 0:
+    return 0.0 if halfWidth == 0 else float("inf")
+  return halfWidth / abs(mean)
+
+'''
+Summarize the measurements of the trials.
+
+@param values - List of numbers.
+@return Dictionary with the number of trials, mean, median, standard deviation,
+variance, minimum and median absolute deviation of the values.
+'''
+def SampleStatistics(values):
+  std = StandardDeviation(values)
+  return { "trials" : len(values),
+           "mean" : Mean(values),
+           "median" : Median(values),
+           "std" : std,
+           "var" : std ** 2,
+           "min" : float(min(values)),
+           "mad" : MedianAbsoluteDeviation(values) }
+
+'''
+Collect the numeric measurements of the trials for every metric.
+
+@param metrics - List with the metrics dictionary of every trial.
+@return Dictionary with the list of measurements for every metric.
+'''
+def CollectSamples(metrics):
+  samples = {}
+  for metric in metrics:
+    for key, value in metric.items():
+      if isinstance(value, (int, float)) and not isinstance(value, bool):
+        samples.setdefault(key, []).append(value)
+
+  return samples
+
+'''
+Get the aggregator of the given metric.
+
+@param aggregate - The name of the aggregator or a dictionary with the name of
+the aggregator of every metric, the 'default' key is used for the other
+metrics.
+@param metric - The name of the metric.
+@return The name of the aggregator.
+'''
+def Aggregator(aggregate, metric):
+  if isinstance(aggregate, dict):
+    return aggregate.get(metric, aggregate.get("default", "mean"))
+  return aggregate
+
+'''
+Aggregate the measurements of the trials.
+
+  mean - The arithmetic mean of all values.
+  median - The median of all values.
+  trimmed - The mean without the lowest and highest 10% of the values.
+  mad - The mean of the values within three scaled median absolute deviations
+      of the median.
+
+@param values - List of numbers.
+@param aggregator - The name of the aggregator.
+@param proportion - The proportion of values cut off at both ends by the
+trimmed mean.
+@param threshold - The number of scaled median absolute deviations used by the
+mad aggregator.
+@return The aggregated value and a list with a flag for every value, the flag
+is True if the value was rejected.
+'''
+def Aggregate(values, aggregator="mean", proportion=0.1, threshold=3.0):
+  rejected = [False for v in values]
+
+  if aggregator == "median":
+    return Median(values), rejected
+  elif aggregator == "trimmed":
+    cut = int(len(values) * proportion)
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    for i in order[:cut] + order[len(values) - cut:]:
+      rejected[i] = True
+  elif aggregator == "mad":
+    # Scale the median absolute deviation so that it estimates the standard
+    # deviation of normal distributed values.
+    median = Median(values)
+    mad = 1.4826 * MedianAbsoluteDeviation(values)
+    if mad > 0:
+      rejected = [abs(v - median) > threshold * mad for v in values]
+
+  return Mean([v for v, r in zip(values, rejected) if not r]), rejected
+
+'''
+Draw the bootstrap resamples of the given number of values. The resamples are
+returned as index matrices, one row for every resample, the rows are split into
+blocks to limit the memory usage.
+
+@param n - The number of values.
+@param resamples - The number of bootstrap resamples.
+@param seed - The seed of the random number generator.
+@param blockSize - The maximum number of indices of a block.
+@return Generator of index matrices.
+'''
+def BootstrapIndexes(n, resamples, seed=0, blockSize=1 << 22):
+  import numpy as np
+
+  rng = np.random.default_rng(seed)
+  rows = max(1, blockSize // max(n, 1))
+  for start in range(0, resamples, rows):
+    yield rng.integers(0, n, (min(rows, resamples - start), n))
+
+'''
+Calculate the bootstrap percentile confidence interval of the mean.
+
+@param values - List of numbers.
+@param resamples - The number of bootstrap resamples.
+@param confidence - The confidence level of the interval.
+@param seed - The seed of the random number generator.
+@return List with the mean and the lower and upper bound of the interval.
+'''
+def BootstrapMean(values, resamples=1000, confidence=0.95, seed=0):
+  import numpy as np
+
+  values = np.asarray(values, dtype=np.float64)
+  means = np.concatenate([values[index].mean(axis=1) for index in
+      BootstrapIndexes(len(values), resamples, seed)])
+
+  alpha = (1 - confidence) / 2.0
+  low, high = np.quantile(means, [alpha, 1 - alpha])
+  return [float(values.mean()), float(low), float(high)]
+
+'''
+Calculate the bootstrap percentile confidence interval of the average accuracy
+(the mean of the recall of every class) by resampling the instances.
+
+@param truelabels - The true labels of the instances.
+@param predictions - The predicted labels of the instances.
+@param resamples - The number of bootstrap resamples.
+@param confidence - The confidence level of the interval.
+@param seed - The seed of the random number generator.
+@return List with the average accuracy and the lower and upper bound of the
+interval.
+'''
+def BootstrapAccuracy(truelabels, predictions, resamples=1000, confidence=0.95,
+    seed=0):
+  import numpy as np
+
+  truelabels = np.asarray(truelabels).ravel()
+  correct = truelabels == np.asarray(predictions).ravel()
+  classes, codes = np.unique(truelabels, return_inverse=True)
+  k = len(classes)
+
+  def AverageRecall(index):
+    # Count the instances and the correct predictions of every class in every
+    # resample at once, every resample uses its own range of bins.
+    bins = (np.arange(len(index))[:, np.newaxis] * k + codes[index]).ravel()
+    total = np.bincount(bins, minlength=len(index) * k).reshape(-1, k)
+    hits = np.bincount(bins, weights=correct[index].ravel(),
+        minlength=len(index) * k).reshape(-1, k)
+
+    # Classes which are missing in a resample are ignored.
+    with np.errstate(divide="ignore", invalid="ignore"):
+      return np.nanmean(np.where(total > 0, hits / total, np.nan), axis=1)
+
+  accuracies = np.concatenate([AverageRecall(index) for index in
+      BootstrapIndexes(len(truelabels), resamples, seed)])
+
+  alpha = (1 - confidence) / 2.0
+  low, high = np.quantile(accuracies, [alpha, 1 - alpha])
+  estimate = AverageRecall(np.arange(len(truelabels))[np.newaxis, :])[0]
+  return [float(estimate), float(low), float(high)]
@@ -20,10 +20,93 @@ if cmd_subfolder not in sys.path:
 from log import *
 
 import time
-from multiprocessing import Process, Queue
+import threading
+import multiprocessing
+
+try:
+  import queue
+except ImportError:
+  import Queue as queue
+
+try:
+  import resource
+except ImportError:
+  resource = None
+
+try:
+  from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+  shared_memory = None
+
+# The scripts pass closures to the timeout function, which can't be pickled. So
+# we have to fork the process. This also keeps the imported modules and the
+# datasets of the parent process warm.
+timeoutContext = multiprocessing.get_context("fork")
+
+# The processes of the worker pool (see pool.WorkerPool) are already isolated
+# from the benchmark process and the pool enforces the timeout, so the timeout
+# function runs the function in the current process.
+inlineTimeout = False
+
+# Linux reports the maximum resident set size in kilobytes, macOS in bytes.
+rssScale = float(1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+'''
+Get the resource usage of the current process and of the terminated child
+processes.
+
+@param who - resource.RUSAGE_SELF or resource.RUSAGE_CHILDREN.
+@return Dictionary with the user and system time in seconds, the maximum
+resident set size in MB, the page faults and the context switches or an empty
+dictionary if the platform doesn't support the resource module.
+'''
+def ResourceUsage(who):
+  if not resource:
+    return {}
+
+  usage = resource.getrusage(who)
+  return { "UserTime" : usage.ru_utime,
+           "SysTime" : usage.ru_stime,
+           "MaxRSS" : usage.ru_maxrss / rssScale,
+           "MajorFaults" : usage.ru_majflt,
+           "MinorFaults" : usage.ru_minflt,
+           "VoluntarySwitches" : usage.ru_nvcsw,
+           "InvoluntarySwitches" : usage.ru_nivcsw }
+
+# The maximum resident set size of the processes started by the timeout
+# function, see RecordPeak(). The peaks are kept per thread and cleared when the
+# outermost timer of the thread stops.
+childPeaks = threading.local()
+
+'''
+Get the state of the child process peaks of the current thread.
+
+@return Object with the list of the peaks in MB and the number of running
+timers.
+'''
+def ChildPeaks():
+  if not hasattr(childPeaks, "peaks"):
+    childPeaks.peaks = []
+    childPeaks.timers = 0
+  return childPeaks
 
 '''
-This class implements three functions to measure the time.
+Record the maximum resident set size of a child process for the running timers
+of the current thread.
+
+@param peak - The maximum resident set size in MB.
+'''
+def RecordPeak(peak):
+  state = ChildPeaks()
+  if state.timers:
+    state.peaks.append(peak)
+
+'''
+This class implements functions to measure the time and the resources of a
+code block. The wall time is measured with the monotonic high-resolution
+performance counter, the resources are the difference of the resource usage
+of the current process and of the child processes (e.g. the benchmark binaries
+or the timeout process) which terminated in the code block.
 '''
 class Timer(object):
 
@@ -31,19 +114,96 @@ class Timer(object):
   Start the timer.
   '''
   def __enter__(self):
-    self.__start = time.time()
+    state = ChildPeaks()
+    state.timers += 1
+    self.__firstPeak = len(state.peaks)
+
+    self.__startUsage = Timer.Usage()
+    self.__start = time.perf_counter_ns()
 
   '''
   Stop the timer.
   '''
   def __exit__(self, type, value, traceback):
-    self.__finish = time.time()
+    self.__finish = time.perf_counter_ns()
+    self.__finishUsage = Timer.Usage()
+
+    state = ChildPeaks()
+    self.__peaks = state.peaks[self.__firstPeak:]
+    state.timers -= 1
+    if not state.timers:
+      del state.peaks[:]
+
+  '''
+  Get the resource usage of the current process and of the child processes.
+
+  @return Tuple with the resource usage of the current process and of the
+  child processes or None if the platform doesn't support the resource module.
+  '''
+  @staticmethod
+  def Usage():
+    if not resource:
+      return None
+    return (ResourceUsage(resource.RUSAGE_SELF),
+        ResourceUsage(resource.RUSAGE_CHILDREN))
 
   '''
   Return the elapsed time of the timer.
   '''
   def ElapsedTime(self):
-    return self.__finish - self.__start
+    return (self.__finish - self.__start) / 1e9
+
+  '''
+  Return the measurements of the timer. The maximum resident set size is the
+  peak of the processes started by the timeout function, the maximum of
+  getrusage(RUSAGE_CHILDREN) if another child process terminated in the code
+  block or the maximum of the current process if no child process terminated.
+  The maximum of getrusage(RUSAGE_CHILDREN) covers all child processes since
+  the start of the process, so it's an upper bound if the child process didn't
+  exceed the peak of an earlier child process.
+
+  @return Dictionary with the wall time, user and system time in seconds, the
+  maximum resident set size in MB, the major and minor page faults and the
+  voluntary and involuntary context switches.
+  '''
+  def Measurements(self):
+    measurements = { "WallTime" : self.ElapsedTime() }
+    if not self.__startUsage:
+      return measurements
+
+    (selfStart, childrenStart) = self.__startUsage
+    (selfFinish, childrenFinish) = self.__finishUsage
+    for key in ["UserTime", "SysTime", "MajorFaults", "MinorFaults",
+        "VoluntarySwitches", "InvoluntarySwitches"]:
+      measurements[key] = (selfFinish[key] - selfStart[key] +
+          childrenFinish[key] - childrenStart[key])
+
+    # Every terminated process has minor page faults, so the counter shows if
+    # a child process terminated in the code block.
+    if self.__peaks:
+      measurements["MaxRSS"] = max(self.__peaks)
+    elif childrenFinish["MinorFaults"] > childrenStart["MinorFaults"]:
+      measurements["MaxRSS"] = childrenFinish["MaxRSS"]
+    else:
+      measurements["MaxRSS"] = selfFinish["MaxRSS"]
+
+    return measurements
+
+'''
+Run the given function in the timeout process and store the maximum resident
+set size of the process and of its child processes.
+
+@param fun - The function to run.
+@param q - The queue for the return value of the function.
+@param peak - Shared value for the maximum resident set size in MB.
+'''
+def RunTimed(fun, q, peak):
+  try:
+    fun(q)
+  finally:
+    usage = Timer.Usage()
+    if usage:
+      peak.value = max(usage[0]["MaxRSS"], usage[1]["MaxRSS"])
 
 '''
 This function implements a timeout for a function call.
@@ -53,21 +213,109 @@ This function implements a timeout for a function call.
 @return The return value of the process.
 '''
 def timeout(fun, timeout=9000):
-  q = Queue()
-  p = Process(target=fun, args=(q,))
+  if inlineTimeout:
+    q = queue.Queue()
+    try:
+      fun(q)
+      return q.get_nowait()
+    except Exception as e:
+      Log.Fatal("Exception: " + str(e))
+      return -1
+
+  # Start the resource tracker before we fork, so that the shared memory blocks
+  # of the process outlive the process.
+  if shared_memory:
+    resource_tracker.ensure_running()
+
+  q = timeoutContext.Queue()
+  peak = timeoutContext.Value("d", 0.0, lock=False)
+  p = timeoutContext.Process(target=RunTimed, args=(fun, q, peak))
   p.start()
   p.join(timeout)
 
   if p.is_alive():
-    # Terminate the process.
+    # Terminate the process, kill the process if it doesn't react.
     p.terminate()
-    p.join()
+    p.join(3)
+    if p.is_alive():
+      p.kill()
+      p.join()
 
     Log.Warn("Script timed out after " + str(timeout) + " seconds")
     return -2
   else:
+    if peak.value:
+      RecordPeak(peak.value)
+
     try:
       r = q.get(timeout=3)
     except Exception as e:
       r = -1
     return r
+
+'''
+This class implements a handle to an array that is passed from the timed
+process to the parent process. The array is copied into a shared memory block,
+so only the handle is sent through the queue.
+'''
+class SharedArray(object):
+
+  '''
+  Copy the given array into a new shared memory block.
+
+  @param array - The array to share.
+  '''
+  def __init__(self, array):
+    import numpy as np
+
+    array = np.asarray(array)
+    self.shape = array.shape
+    self.dtype = array.dtype
+    self.name = None
+    self.array = None
+
+    # Object arrays can't be stored in shared memory, so they are pickled.
+    if not shared_memory or array.dtype.hasobject or not array.nbytes:
+      self.array = array
+      return
+
+    shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)[...] = array
+    self.name = shm.name
+    shm.close()
+
+  '''
+  Copy the array out of the shared memory block and release the block.
+
+  @return The shared array.
+  '''
+  def Receive(self):
+    import numpy as np
+
+    if self.name is None:
+      return self.array
+
+    shm = shared_memory.SharedMemory(name=self.name)
+    try:
+      array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf).copy()
+    finally:
+      shm.close()
+      shm.unlink()
+    return array
+
+'''
+Split the return value of the timeout function into the value and the arrays
+returned by the timed process. The timed process returns the arrays with
+q.put((time, SharedArray(array), ...)).
+
+@param result - The return value of the timeout function.
+@return Tuple with the value and the array (or a list of arrays if the process
+returned more than one array). The array is None if the process returned no
+array.
+'''
+def ReceiveResult(result):
+  if not isinstance(result, tuple):
+    return (result, None)
+
+  arrays = [shared.Receive() for shared in result[1:]]
+  return (result[0], arrays[0] if len(arrays) == 1 else arrays)